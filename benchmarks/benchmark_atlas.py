@@ -0,0 +1,163 @@
+# benchmark_atlas.py
+
+"""
+This script compares sending the screenshots as separate images with sending one contact-sheet atlas.
+For the GPT and Claude vision requests of each variant it reports the request payload size, the
+upload time of that payload at a given uplink bandwidth, the estimated image input tokens, and the
+measured end-to-end latency of the request. The prompt is the combined evaluation prompt for the
+current scene. Image tokens are estimated with the providers' published rules: 85 tokens per
+low-detail GPT image, and width * height / 750 per Claude image after it is fit within 1568 px.
+
+Usage (Blender in background mode, with the model to evaluate in the .blend file):
+    blender scene.blend --background --python benchmarks/benchmark_atlas.py -- --runs 3
+    blender scene.blend --background --python benchmarks/benchmark_atlas.py -- --mock --latency 1
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import statistics
+from PIL import Image
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from llm_driven_modelling.core.evaluators_module import CombinedEvaluator
+from llm_driven_modelling.llm import claude_module, gpt_module
+from llm_driven_modelling.llm.response_cache import get_response_cache
+from llm_driven_modelling.llm.LLM_common_utils import (
+    get_screenshots,
+    get_scene_info,
+    format_scene_info,
+)
+from benchmarks.mock_llm_server import (
+    MockLLMServer,
+    load_rules,
+    use_mock_llm_server,
+)
+from llm_driven_modelling.utils.model_viewer_module import (
+    ATLAS_TILE_SIZE,
+    get_atlas_prompt_note,
+    get_screenshot_atlas,
+)
+
+GPT_LOW_DETAIL_TOKENS = 85
+CLAUDE_MAX_EDGE = 1568
+CLAUDE_PIXELS_PER_TOKEN = 750
+
+PROVIDERS = {
+    "gpt": (gpt_module.build_vision_request, gpt_module.analyze_screenshots_with_gpt4),
+    "claude": (
+        claude_module.build_vision_request,
+        claude_module.analyze_screenshots_with_claude,
+    ),
+}
+
+
+def estimate_image_tokens(provider, screenshots):
+    """Estimate the input tokens the images of a request cost."""
+    if provider == "gpt":
+        return GPT_LOW_DETAIL_TOKENS * len(screenshots)
+    tokens = 0
+    for path in screenshots:
+        with Image.open(path) as image:
+            width, height = image.size
+        scale = min(1.0, CLAUDE_MAX_EDGE / max(width, height))
+        tokens += round(width * scale) * round(height * scale) / CLAUDE_PIXELS_PER_TOKEN
+    return round(tokens)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--description",
+        default="A simple wooden table with four legs.",
+        help="Description of the model in the scene.",
+    )
+    parser.add_argument(
+        "--screenshots",
+        help="Directory of the screenshots to send. Defaults to get_screenshots().",
+    )
+    parser.add_argument("--tile-size", type=int, default=ATLAS_TILE_SIZE)
+    parser.add_argument(
+        "--uplink-mbps",
+        type=float,
+        default=10.0,
+        help="Upload bandwidth used to convert payload sizes into upload times.",
+    )
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="Answer every request with the mock LLM server instead of the real APIs.",
+    )
+    parser.add_argument(
+        "--rules", default=os.path.join(BENCHMARK_DIR, "mock_llm_rules.json")
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Every run must reach the API for its latency to count
+    get_response_cache().set_mode("off")
+
+    server = None
+    if args.mock:
+        server = use_mock_llm_server(
+            MockLLMServer(rules=load_rules(args.rules), latency=args.latency)
+        )
+
+    if args.screenshots:
+        screenshots = [
+            os.path.join(args.screenshots, f)
+            for f in sorted(os.listdir(args.screenshots))
+            if f.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))
+        ]
+    else:
+        screenshots = get_screenshots()
+    atlas = get_screenshot_atlas(screenshots, tile_size=args.tile_size)
+
+    prompt = CombinedEvaluator().get_prompt(
+        {
+            "obj": {"description": args.description},
+            "scene_info": format_scene_info(get_scene_info()),
+        }
+    )
+    variants = {
+        "separate": (prompt, screenshots),
+        "atlas": (prompt + get_atlas_prompt_note(len(screenshots)), [atlas]),
+    }
+
+    print(
+        f"{len(screenshots)} screenshots, atlas {os.path.getsize(atlas) / 1024:.0f} KiB "
+        f"at {args.tile_size} px per tile, {args.runs} runs"
+    )
+    print(
+        f"{'provider':<8} {'variant':<9} {'payload':>10} {'upload':>9} "
+        f"{'img tokens':>11} {'latency':>9} {'stdev':>8}"
+    )
+    for provider, (build_request, analyze) in PROVIDERS.items():
+        for variant, (variant_prompt, images) in variants.items():
+            payload = len(json.dumps(build_request(variant_prompt, images)).encode())
+            upload = payload * 8 / (args.uplink_mbps * 1e6)
+            times = []
+            for _ in range(args.runs):
+                start_time = time.perf_counter()
+                analyze(variant_prompt, images)
+                times.append(time.perf_counter() - start_time)
+            stdev = statistics.stdev(times) if args.runs > 1 else 0.0
+            print(
+                f"{provider:<8} {variant:<9} {payload / 1024:8.0f}KiB {upload:8.2f}s "
+                f"{estimate_image_tokens(provider, images):11d} "
+                f"{statistics.mean(times):8.2f}s {stdev:7.2f}s"
+            )
+
+    if server is not None:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# benchmark_evaluators.py
+
+"""
+This script compares the two evaluation modes of ModelEvaluator on the current scene.
+Each run evaluates the same screenshots once with the six separate evaluators and once with the
+single combined request, and reports the latency, the requests and tokens used, and how often the
+per-criterion and final verdicts of the two modes agree. Token counts are the rate limiter's
+estimates: prompt characters / 4, per-image tokens from the image size, and reply characters / 4.
+
+Usage (Blender in background mode, with the model to evaluate in the .blend file):
+    blender scene.blend --background --python benchmarks/benchmark_evaluators.py -- --runs 3
+    blender scene.blend --background --python benchmarks/benchmark_evaluators.py -- --mock
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from llm_driven_modelling.core.evaluators_module import (
+    COMBINED_CRITERIA,
+    EVALUATION_MODES,
+    ModelEvaluator,
+)
+from llm_driven_modelling.llm.LLM_common_utils import get_screenshots
+from llm_driven_modelling.llm.rate_limiter import get_rate_limiter
+from benchmarks.mock_llm_server import (
+    MockLLMServer,
+    load_rules,
+    use_mock_llm_server,
+)
+
+# Separate evaluators judging the same criterion as each combined result
+CRITERION_EVALUATORS = {
+    "OverallEvaluator": ("GPTOverallEvaluator", "ClaudeOverallEvaluator"),
+    "SizeEvaluator": ("SizeEvaluator",),
+    "ProportionEvaluator": ("ProportionEvaluator",),
+    "StructureEvaluator": ("StructureEvaluator",),
+    "UsabilityEvaluator": ("UsabilityEvaluator",),
+}
+
+
+def get_usage():
+    """Get the total requests and estimated tokens sent so far."""
+    stats = get_rate_limiter().stats().values()
+    usage = [entry for entry in stats if isinstance(entry, dict)]
+    return (
+        sum(entry["requests"] for entry in usage),
+        sum(entry["tokens"] for entry in usage),
+    )
+
+
+def run_evaluation(mode, screenshots, obj):
+    """
+    Evaluate the scene once.
+
+    Returns:
+        tuple: The per-evaluator results, the final status, the seconds taken,
+            the requests sent and the estimated tokens used.
+    """
+    evaluator = ModelEvaluator(mode=mode)
+    requests_before, tokens_before = get_usage()
+    start_time = time.perf_counter()
+    results = evaluator.evaluate(screenshots, {"obj": obj})
+    elapsed = time.perf_counter() - start_time
+    _, final_status, _, _ = evaluator.aggregate_results(results)
+    requests_after, tokens_after = get_usage()
+    return (
+        results,
+        final_status,
+        elapsed,
+        requests_after - requests_before,
+        tokens_after - tokens_before,
+    )
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--description",
+        default="A simple wooden table with four legs.",
+        help="Description of the model in the scene.",
+    )
+    parser.add_argument(
+        "--screenshots",
+        help="Directory of the screenshots to evaluate. Defaults to get_screenshots().",
+    )
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="Answer every request with the mock LLM server instead of the real APIs.",
+    )
+    parser.add_argument(
+        "--rules", default=os.path.join(BENCHMARK_DIR, "mock_llm_rules.json")
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server = None
+    if args.mock:
+        server = use_mock_llm_server(
+            MockLLMServer(rules=load_rules(args.rules), latency=args.latency)
+        )
+
+    if args.screenshots:
+        screenshots = [
+            os.path.join(args.screenshots, f)
+            for f in sorted(os.listdir(args.screenshots))
+            if f.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))
+        ]
+    else:
+        screenshots = get_screenshots()
+    obj = {"description": args.description}
+
+    times = {mode: [] for mode in EVALUATION_MODES}
+    requests = {mode: [] for mode in EVALUATION_MODES}
+    tokens = {mode: [] for mode in EVALUATION_MODES}
+    criterion_matches = 0
+    criterion_comparisons = 0
+    verdict_matches = 0
+    for run in range(args.runs):
+        outcomes = {}
+        for mode in EVALUATION_MODES:
+            results, final_status, elapsed, sent, used = run_evaluation(
+                mode, screenshots, obj
+            )
+            outcomes[mode] = (results, final_status)
+            times[mode].append(elapsed)
+            requests[mode].append(sent)
+            tokens[mode].append(used)
+
+        separate_results, separate_status = outcomes["separate"]
+        combined_results, combined_status = outcomes["combined"]
+        for name in COMBINED_CRITERIA.values():
+            for separate_name in CRITERION_EVALUATORS[name]:
+                criterion_comparisons += 1
+                if (
+                    combined_results[name].status
+                    == separate_results[separate_name].status
+                ):
+                    criterion_matches += 1
+        verdict_matches += separate_status == combined_status
+        print(
+            f"run {run + 1}: separate {separate_status.name} "
+            f"({times['separate'][-1]:.2f} s), combined {combined_status.name} "
+            f"({times['combined'][-1]:.2f} s)"
+        )
+
+    print(f"\n{args.runs} runs, {len(screenshots)} screenshots")
+    print(f"{'mode':<10} {'mean':>10} {'stdev':>10} {'requests':>10} {'tokens':>10}")
+    for mode in EVALUATION_MODES:
+        stdev = statistics.stdev(times[mode]) if args.runs > 1 else 0.0
+        print(
+            f"{mode:<10} {statistics.mean(times[mode]):9.2f}s {stdev:9.2f}s "
+            f"{statistics.mean(requests[mode]):10.1f} "
+            f"{statistics.mean(tokens[mode]):10.0f}"
+        )
+    print(
+        f"per-criterion agreement: {criterion_matches}/{criterion_comparisons} "
+        f"({criterion_matches / criterion_comparisons:.0%})"
+    )
+    print(
+        f"final verdict agreement: {verdict_matches}/{args.runs} "
+        f"({verdict_matches / args.runs:.0%})"
+    )
+
+    if server is not None:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
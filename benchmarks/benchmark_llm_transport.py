@@ -0,0 +1,165 @@
+# benchmark_llm_transport.py
+
+"""
+This script measures connection reuse of the shared LLM transport against a local stub server.
+The stub answers the OpenAI chat completions and Anthropic messages endpoints with a fixed reply
+and counts the TCP connections it accepts. Each connection can be given an artificial setup delay
+that stands in for the TLS handshake of the real APIs.
+
+Usage:
+    python benchmarks/benchmark_llm_transport.py --requests 50 --connect-delay 0.05
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import statistics
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from anthropic import Anthropic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_driven_modelling.llm.llm_transport import LLMTransport
+
+OPENAI_REPLY = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+ANTHROPIC_REPLY = {
+    "id": "msg_stub",
+    "type": "message",
+    "role": "assistant",
+    "model": "stub",
+    "content": [{"type": "text", "text": "ok"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering both APIs with a fixed reply."""
+
+    protocol_version = "HTTP/1.1"
+    # Send each response in one segment so delayed ACKs do not dominate the latency
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    connect_delay = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubHandler.lock:
+            StubHandler.connections += 1
+        time.sleep(self.connect_delay)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        reply = ANTHROPIC_REPLY if self.path.endswith("/messages") else OPENAI_REPLY
+        body = json.dumps(reply).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(name, count, call):
+    """Issue count requests, then print the mean latency and the connections opened."""
+    connections_before = StubHandler.connections
+    latencies = []
+    for _ in range(count):
+        start_time = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    print(
+        f"{name:<28} mean {statistics.mean(latencies):8.2f} ms   "
+        f"p50 {statistics.median(latencies):8.2f} ms   "
+        f"connections {StubHandler.connections - connections_before}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument(
+        "--connect-delay",
+        type=float,
+        default=0.05,
+        help="Seconds added to every new connection to model the TLS handshake.",
+    )
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    StubHandler.connect_delay = args.connect_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    messages = [{"role": "user", "content": "ping"}]
+    openai_payload = {"model": "stub", "messages": messages}
+
+    def fresh_anthropic():
+        client = Anthropic(api_key="stub", base_url=base_url)
+        client.messages.create(model="stub", max_tokens=16, messages=messages)
+        client.close()
+
+    def fresh_requests():
+        requests.post(
+            f"{base_url}/v1/chat/completions",
+            headers={"Authorization": "Bearer stub"},
+            json=openai_payload,
+        ).json()
+
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub")
+    transport = LLMTransport(
+        openai_base_url=f"{base_url}/v1", anthropic_base_url=base_url
+    )
+
+    def pooled_anthropic():
+        transport.anthropic_client.messages.create(
+            model="stub", max_tokens=16, messages=messages
+        )
+
+    def pooled_openai_sdk():
+        transport.openai_client.chat.completions.create(model="stub", messages=messages)
+
+    def pooled_requests():
+        transport.post_json("/chat/completions", openai_payload)
+
+    print(
+        f"{args.requests} requests, {args.connect_delay * 1000:.0f} ms per connection"
+    )
+    run("Anthropic, client per call", args.requests, fresh_anthropic)
+    run("Anthropic, shared transport", args.requests, pooled_anthropic)
+    run("requests.post, no session", args.requests, fresh_requests)
+    run("REST, shared session", args.requests, pooled_requests)
+    run("OpenAI SDK, shared transport", args.requests, pooled_openai_sdk)
+
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
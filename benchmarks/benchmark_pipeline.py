@@ -0,0 +1,148 @@
+# benchmark_pipeline.py
+
+"""
+This script benchmarks the scene generation pipeline end to end against the mock LLM server.
+Every LLM and embedding request is answered locally with the scripted replies in
+mock_llm_rules.json, so the measured time is the pipeline's own overhead plus the simulated
+latency. The time of each stage of MODEL_GENERATION_OT_generate is reported separately.
+
+Usage (Blender in background mode):
+    blender --background --python benchmarks/benchmark_pipeline.py -- --runs 3 --latency 0.5
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import functools
+import statistics
+from collections import defaultdict
+
+import bpy
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from llm_driven_modelling import main as addon
+from llm_driven_modelling.core import model_generation_main
+from benchmarks.mock_llm_server import (
+    MockLLMServer,
+    load_rules,
+    use_mock_llm_server,
+)
+
+# Functions called by the operator, in pipeline order
+STAGES = (
+    "rewrite_prompt",
+    "parse_scene_input",
+    "generate_3d_model",
+    "evaluate_and_optimize_model",
+    "arrange_scene",
+    "apply_materials",
+)
+
+stage_times = defaultdict(list)
+
+
+def timed(name, function):
+    """Wrap a function so the duration of every call is added to stage_times."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stage_times[name].append(time.perf_counter() - start_time)
+
+    return wrapper
+
+
+def instrument_pipeline():
+    """Time the pipeline stages and the final screenshot."""
+    for name in STAGES:
+        setattr(
+            model_generation_main,
+            name,
+            timed(name, getattr(model_generation_main, name)),
+        )
+    operator = model_generation_main.MODEL_GENERATION_OT_generate
+    operator.save_scene_screenshot = timed(
+        "save_scene_screenshot", operator.save_scene_screenshot
+    )
+
+
+def clear_scene():
+    """Remove every object so each run starts from an empty scene."""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--prompt", default="A simple wooden table with four legs.")
+    parser.add_argument(
+        "--rules", default=os.path.join(BENCHMARK_DIR, "mock_llm_rules.json")
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every reply."
+    )
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    server = use_mock_llm_server(
+        MockLLMServer(
+            rules=load_rules(args.rules),
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        )
+    )
+    addon.register()
+    instrument_pipeline()
+
+    run_times = []
+    latency_times = []
+    for run in range(args.runs):
+        clear_scene()
+        server.reset_stats()
+        bpy.context.scene.model_generation_tool.input_text = args.prompt
+        start_time = time.perf_counter()
+        bpy.ops.model_generation.generate()
+        run_times.append(time.perf_counter() - start_time)
+        stats = server.stats()
+        latency_times.append(stats["latency_total"])
+        print(
+            f"run {run + 1}: {run_times[-1]:.2f} s, "
+            f"{sum(stats['requests'].values())} requests, "
+            f"{stats['failures']} failures, {stats['unmatched']} unmatched prompts"
+        )
+
+    print(f"\n{args.runs} runs, {args.latency * 1000:.0f} ms latency per reply")
+    print(f"{'stage':<30} {'mean':>10} {'calls/run':>10}")
+    for name in STAGES + ("save_scene_screenshot",):
+        times = stage_times.get(name, [])
+        print(
+            f"{name:<30} {sum(times) / args.runs:9.3f}s "
+            f"{len(times) / args.runs:10.1f}"
+        )
+    print(f"{'total':<30} {statistics.mean(run_times):9.3f}s")
+    # Replies overlap when evaluators run concurrently, so this is a lower bound
+    print(
+        f"{'total minus simulated latency':<30} "
+        f"{statistics.mean(run_times) - statistics.mean(latency_times):9.3f}s"
+    )
+
+    addon.unregister()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
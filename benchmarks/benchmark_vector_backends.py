@@ -0,0 +1,124 @@
+# benchmark_vector_backends.py
+
+"""
+This script compares the query latency of the Chroma and NumPy vector backends.
+Both stores are filled with the same random embeddings, written to a temporary directory
+and reopened from disk, then answer the same top-k queries. No embedding API calls are made.
+
+Usage:
+    python benchmarks/benchmark_vector_backends.py --documents 50 --queries 500
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import numpy as np
+import chromadb
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+from llama_index.vector_stores.chroma import ChromaVectorStore
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_driven_modelling.llama_index_library.numpy_vector_store import (
+    NumpyVectorStore,
+)
+
+
+def make_nodes(count, dimension, rng):
+    """Create nodes with random unit-length embeddings."""
+    embeddings = rng.normal(size=(count, dimension)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return [
+        TextNode(
+            id_=f"node-{i}",
+            text=f"Document {i}",
+            metadata={"file_name": f"document_{i}.md"},
+            embedding=embedding.tolist(),
+        )
+        for i, embedding in enumerate(embeddings)
+    ]
+
+
+def time_queries(store, queries, top_k):
+    """Run every query against a store and return the latency of each in milliseconds."""
+    latencies = []
+    for query_embedding in queries:
+        query = VectorStoreQuery(
+            query_embedding=query_embedding, similarity_top_k=top_k
+        )
+        start_time = time.perf_counter()
+        store.query(query)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    """Print the latency summary of one backend."""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<8} mean {statistics.mean(latencies):8.3f} ms   "
+        f"p50 {statistics.median(latencies):8.3f} ms   p95 {p95:8.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    nodes = make_nodes(args.documents, args.dimension, rng)
+    queries = rng.normal(size=(args.queries, args.dimension)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    queries = queries.tolist()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        chroma_path = os.path.join(temp_dir, "chroma_db")
+        client = chromadb.PersistentClient(path=chroma_path)
+        ChromaVectorStore(
+            chroma_collection=client.get_or_create_collection("benchmark")
+        ).add(nodes)
+
+        # Reopen both stores from disk so neither benefits from write-time state
+        client = chromadb.PersistentClient(path=chroma_path)
+        chroma_store = ChromaVectorStore(
+            chroma_collection=client.get_collection("benchmark")
+        )
+        snapshot_path = os.path.join(temp_dir, "numpy", "benchmark")
+        NumpyVectorStore.from_chroma_collection(
+            client.get_collection("benchmark")
+        ).persist(snapshot_path)
+        numpy_store = NumpyVectorStore.from_persist_path(snapshot_path)
+
+        # Both backends must agree on the ranking before timing them
+        for query_embedding in queries[:10]:
+            query = VectorStoreQuery(
+                query_embedding=query_embedding, similarity_top_k=args.top_k
+            )
+            if chroma_store.query(query).ids != numpy_store.query(query).ids:
+                print("Warning: the backends returned different rankings.")
+                break
+
+        print(
+            f"{args.documents} documents, {args.queries} queries, "
+            f"dimension {args.dimension}, top {args.top_k}"
+        )
+        chroma_latencies = time_queries(chroma_store, queries, args.top_k)
+        numpy_latencies = time_queries(numpy_store, queries, args.top_k)
+        report("chroma", chroma_latencies)
+        report("numpy", numpy_latencies)
+        print(
+            f"speedup  {statistics.mean(chroma_latencies) / statistics.mean(numpy_latencies):.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,653 @@
+# mock_llm_server.py
+
+"""
+This module provides a local stand-in for the OpenAI and Anthropic APIs.
+The server speaks the chat completions, messages and embeddings wire formats used by
+gpt_module, claude_module and the document libraries, so the whole pipeline can run without
+network access. Replies are scripted by rules that map a regular expression on the prompt to a
+response text, and every request can be given an artificial latency or fail with an HTTP error.
+
+It is a benchmarking tool, not part of the add-on. It can be started in-process with
+use_mock_llm_server(), or standalone from the repository root:
+
+    python -m benchmarks.mock_llm_server --rules benchmarks/mock_llm_rules.json --port 8765
+
+in which case OPENAI_BASE_URL=http://127.0.0.1:8765/v1, OPENAI_API_BASE (same value) and
+ANTHROPIC_BASE_URL=http://127.0.0.1:8765 point Blender at it through the base-URL settings of
+llm_transport.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import struct
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from llm_driven_modelling.llm.llm_transport import configure_transport
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE = "OK"
+# Characters per event of a streamed reply
+DEFAULT_STREAM_CHUNK_SIZE = 16
+# Dimension of the embeddings returned, matching text-embedding-ada-002
+DEFAULT_EMBEDDING_DIMENSION = 1536
+
+
+class MockRule:
+    """A scripted reply for prompts matching a regular expression."""
+
+    def __init__(self, pattern, response, provider=None, latency=None):
+        """
+        Initialize the rule.
+
+        Args:
+            pattern (str): The regular expression searched for in the prompt text.
+            response (str): The reply text.
+            provider (str, optional): Restrict the rule to "openai" or "anthropic".
+            latency (float, optional): Seconds to wait before replying, instead of the server default.
+        """
+        self.pattern = pattern
+        self.regex = re.compile(pattern, re.DOTALL)
+        self.response = response
+        self.provider = provider
+        self.latency = latency
+        self.hits = 0
+
+    def matches(self, provider, prompt):
+        """
+        Check whether the rule applies to a request.
+
+        Args:
+            provider (str): The provider the request was sent to.
+            prompt (str): The text content of the request.
+
+        Returns:
+            bool: True if the rule applies.
+        """
+        if self.provider is not None and self.provider != provider:
+            return False
+        return self.regex.search(prompt) is not None
+
+
+def load_rules(path):
+    """
+    Load scripted replies from a JSON file.
+
+    The file contains a list of objects with the keys "pattern" and "response",
+    and optionally "provider" and "latency". A "response" given as a JSON object
+    or list is serialized, which keeps structured replies readable in the file.
+
+    Args:
+        path (str): The path to the JSON file.
+
+    Returns:
+        list: MockRule objects, in file order.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    rules = []
+    for entry in entries:
+        response = entry["response"]
+        if not isinstance(response, str):
+            response = json.dumps(response, ensure_ascii=False, indent=2)
+        rules.append(
+            MockRule(
+                entry["pattern"],
+                response,
+                provider=entry.get("provider"),
+                latency=entry.get("latency"),
+            )
+        )
+    return rules
+
+
+def get_prompt_text(payload):
+    """
+    Extract the text content of a chat completions or messages request.
+
+    Image parts are skipped, so rules only see the prompt text.
+
+    Args:
+        payload (dict): The decoded request body.
+
+    Returns:
+        str: The text of all messages, joined by newlines.
+    """
+    texts = []
+    system = payload.get("system")
+    if isinstance(system, str):
+        texts.append(system)
+    for message in payload.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            texts.append(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                texts.append(part.get("text", ""))
+    return "\n".join(texts)
+
+
+def make_embedding(text, dimension):
+    """
+    Build a deterministic unit vector for a text.
+
+    Args:
+        text (str): The embedded text.
+        dimension (int): The vector dimension.
+
+    Returns:
+        list: The embedding.
+    """
+    values = []
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    counter = 0
+    while len(values) < dimension:
+        block = hashlib.sha256(seed + counter.to_bytes(4, "little")).digest()
+        values.extend(v / 2**31 - 1.0 for v in struct.unpack("<8I", block))
+        counter += 1
+    values = values[:dimension]
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return [v / norm for v in values]
+
+
+class MockLLMServer:
+    """Local HTTP server answering OpenAI and Anthropic requests with scripted replies."""
+
+    def __init__(
+        self,
+        rules=None,
+        default_response=DEFAULT_RESPONSE,
+        latency=0.0,
+        latency_jitter=0.0,
+        failure_rate=0.0,
+        failure_status=500,
+        embedding_dimension=DEFAULT_EMBEDDING_DIMENSION,
+        stream_chunk_size=DEFAULT_STREAM_CHUNK_SIZE,
+        stream_interval=0.0,
+        host="127.0.0.1",
+        port=0,
+        seed=None,
+    ):
+        """
+        Initialize the server without starting it.
+
+        Args:
+            rules (list, optional): MockRule objects; the first matching rule answers a request.
+            default_response (str): The reply when no rule matches.
+            latency (float): Seconds every reply is delayed by.
+            latency_jitter (float): Up to this many seconds are randomly added to the latency.
+            failure_rate (float): Fraction of completion requests that fail.
+            failure_status (int): HTTP status of injected failures, e.g. 500 or 429.
+            embedding_dimension (int): The dimension of returned embeddings.
+            stream_chunk_size (int): Characters per event of a streamed reply.
+            stream_interval (float): Seconds between the events of a streamed reply.
+            host (str): The interface to listen on.
+            port (int): The port to listen on; 0 picks a free one.
+            seed (int, optional): Seed for latency jitter and failure injection.
+        """
+        self.rules = list(rules or [])
+        self.default_response = default_response
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.embedding_dimension = embedding_dimension
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_interval = stream_interval
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def add_rule(self, pattern, response, provider=None, latency=None):
+        """
+        Add a scripted reply after the existing rules.
+
+        Args:
+            pattern (str): The regular expression searched for in the prompt text.
+            response (str): The reply text.
+            provider (str, optional): Restrict the rule to "openai" or "anthropic".
+            latency (float, optional): Seconds to wait before replying.
+
+        Returns:
+            MockRule: The new rule.
+        """
+        rule = MockRule(pattern, response, provider=provider, latency=latency)
+        with self._lock:
+            self.rules.append(rule)
+        return rule
+
+    @property
+    def base_url(self):
+        """The root URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def openai_base_url(self):
+        """The base URL to use in place of the OpenAI API."""
+        return f"{self.base_url}/v1"
+
+    @property
+    def anthropic_base_url(self):
+        """The base URL to use in place of the Anthropic API."""
+        return self.base_url
+
+    def start(self):
+        """
+        Start serving in a background thread.
+
+        Returns:
+            MockLLMServer: The server itself.
+        """
+        if self._server is not None:
+            return self
+        self._server = MockHTTPServer((self.host, self.port), MockRequestHandler)
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-llm-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Mock LLM server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop the server and close its socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def reset_stats(self):
+        """Reset the request counters."""
+        with self._lock:
+            self.requests = {"openai": 0, "anthropic": 0, "embeddings": 0}
+            self.failures = 0
+            self.unmatched = 0
+            self.aborted_streams = 0
+            self.latency_total = 0.0
+            for rule in self.rules:
+                rule.hits = 0
+
+    def stats(self):
+        """
+        Get the request counters.
+
+        Returns:
+            dict: Requests per endpoint, injected failures, unmatched prompts, streams
+                closed early by the client, total simulated latency and the hits of every rule.
+        """
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "failures": self.failures,
+                "unmatched": self.unmatched,
+                "aborted_streams": self.aborted_streams,
+                "latency_total": self.latency_total,
+                "rules": {rule.pattern: rule.hits for rule in self.rules},
+            }
+
+    def _find_rule(self, provider, prompt):
+        with self._lock:
+            for rule in self.rules:
+                if rule.matches(provider, prompt):
+                    rule.hits += 1
+                    return rule
+            self.unmatched += 1
+            return None
+
+    def _wait(self, latency):
+        if latency is None:
+            latency = self.latency
+            if self.latency_jitter:
+                with self._lock:
+                    latency += self._random.uniform(0, self.latency_jitter)
+        if latency > 0:
+            time.sleep(latency)
+        with self._lock:
+            self.latency_total += latency
+
+    def handle(self, provider, payload):
+        """
+        Produce the reply to a request.
+
+        Args:
+            provider (str): "openai", "anthropic" or "embeddings".
+            payload (dict): The decoded request body.
+
+        Returns:
+            tuple: The HTTP status and the JSON reply, or a list of server-sent
+                events (name, data) for a streaming request.
+        """
+        with self._lock:
+            self.requests[provider] += 1
+        if provider == "embeddings":
+            return 200, self._embeddings_reply(payload)
+
+        prompt = get_prompt_text(payload)
+        rule = self._find_rule(provider, prompt)
+        self._wait(rule.latency if rule is not None else None)
+
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        if failed:
+            return self.failure_status, self._error_reply(provider)
+
+        text = rule.response if rule is not None else self.default_response
+        if payload.get("stream"):
+            return 200, self._stream_events(provider, payload, prompt, text)
+        if provider == "anthropic":
+            return 200, self._anthropic_reply(payload, prompt, text)
+        return 200, self._openai_reply(payload, prompt, text)
+
+    def _openai_reply(self, payload, prompt, text):
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(text) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _anthropic_reply(self, payload, prompt, text):
+        return {
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": payload.get("model", "mock"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(text) // 4,
+            },
+        }
+
+    def _stream_events(self, provider, payload, prompt, text):
+        size = max(1, self.stream_chunk_size)
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        model = payload.get("model", "mock")
+        if provider == "anthropic":
+            message = self._anthropic_reply(payload, prompt, "")
+            message["content"] = []
+            message["stop_reason"] = None
+            events = [
+                ("message_start", {"type": "message_start", "message": message}),
+                (
+                    "content_block_start",
+                    {
+                        "type": "content_block_start",
+                        "index": 0,
+                        "content_block": {"type": "text", "text": ""},
+                    },
+                ),
+            ]
+            events.extend(
+                (
+                    "content_block_delta",
+                    {
+                        "type": "content_block_delta",
+                        "index": 0,
+                        "delta": {"type": "text_delta", "text": chunk},
+                    },
+                )
+                for chunk in chunks
+            )
+            events.extend(
+                [
+                    (
+                        "content_block_stop",
+                        {"type": "content_block_stop", "index": 0},
+                    ),
+                    (
+                        "message_delta",
+                        {
+                            "type": "message_delta",
+                            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                            "usage": {"output_tokens": len(text) // 4},
+                        },
+                    ),
+                    ("message_stop", {"type": "message_stop"}),
+                ]
+            )
+            return events
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        def chunk_event(delta, finish_reason=None):
+            return (
+                None,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                },
+            )
+
+        events = [chunk_event({"role": "assistant", "content": ""})]
+        events.extend(chunk_event({"content": chunk}) for chunk in chunks)
+        events.append(chunk_event({}, "stop"))
+        events.append((None, "[DONE]"))
+        return events
+
+    def _stream_aborted(self):
+        with self._lock:
+            self.aborted_streams += 1
+
+    def _embeddings_reply(self, payload):
+        inputs = payload.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return {
+            "object": "list",
+            "model": payload.get("model", "mock"),
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": index,
+                    "embedding": make_embedding(str(text), self.embedding_dimension),
+                }
+                for index, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    def _error_reply(self, provider):
+        message = f"Injected failure ({self.failure_status})"
+        if provider == "anthropic":
+            return {
+                "type": "error",
+                "error": {"type": "api_error", "message": message},
+            }
+        return {"error": {"message": message, "type": "server_error", "code": None}}
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server that ignores clients closing their connection early."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Keep-alive request handler routing the API endpoints to the MockLLMServer."""
+
+    protocol_version = "HTTP/1.1"
+    # Send each reply in one segment so delayed ACKs do not add latency
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/chat/completions"):
+            provider = "openai"
+        elif self.path.endswith("/messages"):
+            provider = "anthropic"
+        elif self.path.endswith("/embeddings"):
+            provider = "embeddings"
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": {"message": f"Invalid JSON: {str(e)}"}})
+            return
+        status, reply = self.server.mock.handle(provider, payload)
+        if isinstance(reply, list):
+            self._send_events(reply)
+        else:
+            self._send_json(status, reply)
+
+    def _send_json(self, status, reply):
+        body = json.dumps(reply, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_events(self, events):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        interval = self.server.mock.stream_interval
+        try:
+            for name, data in events:
+                event = "" if name is None else f"event: {name}\n"
+                if not isinstance(data, str):
+                    data = json.dumps(data, ensure_ascii=False)
+                body = f"{event}data: {data}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(body):X}\r\n".encode("ascii") + body + b"\r\n")
+                self.wfile.flush()
+                if interval:
+                    time.sleep(interval)
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early
+            self.server.mock._stream_aborted()
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        logger.debug(f"Mock LLM server: {format % args}")
+
+
+def use_mock_llm_server(server):
+    """
+    Start a mock server and point the GPT, Claude and embedding clients at it.
+
+    The embedding model reads OPENAI_API_BASE when it is first created, so this
+    must be called before the document libraries are used.
+
+    Args:
+        server (MockLLMServer): The server to use.
+
+    Returns:
+        MockLLMServer: The started server.
+    """
+    server.start()
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "mock")
+    os.environ["OPENAI_API_BASE"] = server.openai_base_url
+    configure_transport(
+        openai_base_url=server.openai_base_url,
+        anthropic_base_url=server.anthropic_base_url,
+    )
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI/Anthropic server.")
+    parser.add_argument("--rules", help="JSON file with scripted replies.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-status", type=int, default=500)
+    parser.add_argument("--default-response", default=DEFAULT_RESPONSE)
+    parser.add_argument(
+        "--stream-chunk-size", type=int, default=DEFAULT_STREAM_CHUNK_SIZE
+    )
+    parser.add_argument("--stream-interval", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        rules=load_rules(args.rules) if args.rules else None,
+        default_response=args.default_response,
+        stream_chunk_size=args.stream_chunk_size,
+        stream_interval=args.stream_interval,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+    )
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Mock LLM server stats: {server.stats()}")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,16 +17,54 @@ from llm_driven_modelling.llm.LLM_common_utils import (
     get_scene_info,
     format_scene_info,
 )
+from llm_driven_modelling.llm.rate_limiter import on_admission
 from llm_driven_modelling.utils.logger_module import setup_logger, log_context
-from typing import List, Dict, Any, Tuple
+from llm_driven_modelling.utils.model_viewer_module import (
+    get_atlas_prompt_note,
+    get_screenshot_atlas,
+)
+from typing import List, Dict, Any, Tuple, Optional, Callable
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import json
 import re
 import os
+import time
+import threading
 
 # Set up logging
 logger = setup_logger("model_generation")
 
+# Default settings for concurrent evaluation
+DEFAULT_MAX_CONCURRENT_EVALUATORS = 6
+DEFAULT_EVALUATOR_TIMEOUT = 180.0
+# Seconds an evaluator may additionally wait, from submission, before the rate limiter admits it
+DEFAULT_ADMISSION_TIMEOUT = 120.0
+
+# Rejections and run times of each evaluator, used to order short-circuit evaluations
+EVALUATOR_HISTORY_PATH = "./database/evaluator_history.json"
+# Seconds assumed for an evaluator without recorded runs
+DEFAULT_EVALUATOR_COST = 30.0
+
+# "separate" asks one evaluator per criterion, "combined" asks for every criterion in one call
+EVALUATION_MODES = ("separate", "combined")
+DEFAULT_EVALUATION_MODE = os.getenv("EVALUATION_MODE", "separate")
+
+# Send one contact sheet of all views instead of the separate screenshots, e.g. EVALUATION_USE_ATLAS=1
+DEFAULT_USE_ATLAS = os.getenv("EVALUATION_USE_ATLAS", "0") == "1"
+
+# Stop at the first NOT_PASS instead of waiting for every verdict, e.g. EVALUATION_SHORT_CIRCUIT=1
+DEFAULT_SHORT_CIRCUIT = os.getenv("EVALUATION_SHORT_CIRCUIT", "0") == "1"
+
+# Criteria of the combined evaluation and the result name each one is reported under
+COMBINED_CRITERIA = {
+    "overall": "OverallEvaluator",
+    "size": "SizeEvaluator",
+    "proportion": "ProportionEvaluator",
+    "structure": "StructureEvaluator",
+    "usability": "UsabilityEvaluator",
+}
+
 
 class EvaluationStatus(Enum):
     """Enumeration for evaluation status."""
@@ -34,6 +72,8 @@ class EvaluationStatus(Enum):
     NOT_PASS = 0
     PASS = 1
     GOOD = 2
+    # The evaluator failed or timed out without a verdict
+    FAILED = 3
 
 
 class EvaluationResult:
@@ -86,6 +126,142 @@ def parse_json_response(
     }
 
 
+def failed_evaluation_result(message: str) -> EvaluationResult:
+    """
+    Build the result used when an evaluator fails or times out.
+
+    The FAILED status carries no verdict: aggregate_results leaves it out, so a
+    failed evaluator neither blocks nor passes the model.
+
+    Args:
+        message (str): Description of the failure.
+
+    Returns:
+        EvaluationResult: The fallback evaluation result.
+    """
+    return EvaluationResult(message, EvaluationStatus.FAILED, 0, [])
+
+
+class EvaluatorHistory:
+    """
+    Persistent record of how often each evaluator rejects a model and how long it takes.
+
+    The history only orders short-circuit evaluations. Run concurrently, the order
+    matters only when max_concurrency is smaller than the number of evaluators;
+    otherwise every evaluator starts at once.
+    """
+
+    def __init__(self, persist_path: Optional[str] = EVALUATOR_HISTORY_PATH):
+        """
+        Initialize the history. The file is read on first use.
+
+        Args:
+            persist_path (Optional[str]): The JSON file to persist the history to.
+                None keeps it for the current session only.
+        """
+        self.persist_path = persist_path
+        self._entries: Dict[str, Dict[str, float]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.persist_path is None or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                self._entries.update(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable evaluator history: {str(e)}")
+
+    def record(self, name: str, status: EvaluationStatus, seconds: float):
+        """
+        Record the outcome of one evaluator run.
+
+        A FAILED run, one that errored, timed out or was abandoned, has no verdict:
+        its time counts towards the evaluator's cost but not towards its rejection rate.
+
+        Args:
+            name (str): The evaluator name.
+            status (EvaluationStatus): The returned status.
+            seconds (float): How long the evaluator took, or ran before it was abandoned.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.setdefault(
+                name, {"runs": 0, "rejections": 0, "seconds": 0.0}
+            )
+            entry["runs"] += 1
+            entry["rejections"] += status == EvaluationStatus.NOT_PASS
+            entry["seconds"] += seconds
+            if status == EvaluationStatus.FAILED:
+                entry["unfinished"] = entry.get("unfinished", 0) + 1
+            self._dirty = True
+
+    def get_priority(self, name: str) -> float:
+        """
+        Get the expected rejections per second of an evaluator.
+
+        The rejection rate is smoothed towards 1/2, so an evaluator with few
+        recorded runs is neither always first nor always last.
+
+        Args:
+            name (str): The evaluator name.
+
+        Returns:
+            float: The priority; evaluators with a higher one should run first.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(name)
+            if not entry or not entry["runs"]:
+                return 0.5 / DEFAULT_EVALUATOR_COST
+            verdicts = entry["runs"] - entry.get("unfinished", 0)
+            rejection_rate = (entry["rejections"] + 1) / (verdicts + 2)
+            cost = max(entry["seconds"] / entry["runs"], 1e-3)
+            return rejection_rate / cost
+
+    def order(self, evaluators: List["BaseEvaluator"]) -> List["BaseEvaluator"]:
+        """
+        Sort evaluators so the ones most likely to reject the model quickly come first.
+
+        Only the start order changes, so with concurrent evaluation this has an effect
+        only when fewer workers than evaluators are available.
+
+        Args:
+            evaluators (List[BaseEvaluator]): The evaluators to sort.
+
+        Returns:
+            List[BaseEvaluator]: The evaluators in run order. Ties keep their original order.
+        """
+        return sorted(
+            evaluators, key=lambda e: -self.get_priority(e.__class__.__name__)
+        )
+
+    def save(self):
+        """Write the history to disk if it changed."""
+        with self._lock:
+            if self.persist_path is None or not self._dirty:
+                return
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.persist_path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, indent=2)
+                os.replace(temp_path, self.persist_path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save evaluator history: {str(e)}")
+
+
+evaluator_history = EvaluatorHistory()
+
+
 class BaseEvaluator(ABC):
     """Abstract base class for evaluators."""
 
@@ -112,7 +288,11 @@ class BaseEvaluator(ABC):
         Returns:
             EvaluationResult: The evaluation result.
         """
-        prompt = self.get_prompt(context)
+        prompt = (
+            self.get_prompt(context)
+            + context.get("screenshot_note", "")
+            + context.get("geometry_note", "")
+        )
         response = self.analyze_screenshots(prompt, screenshots)
         result = parse_json_response(response)
         return EvaluationResult(
@@ -500,10 +680,187 @@ class UsabilityEvaluator(BaseEvaluator):
         return analyze_screenshots_with_claude(prompt, screenshots)
 
 
+class CombinedEvaluator:
+    """Evaluator asking one model for every criterion in a single structured response."""
+
+    def get_prompt(self, context: Dict[str, Any]) -> str:
+        """Generate prompt for the combined evaluation."""
+        return f"""
+        Context:
+        You are an AI assistant specialized in evaluating 3D models against several criteria in a single pass. Analyze the provided multi-angle screenshots and scene information to assess the model's overall quality, size, proportions, structure, and usability.
+
+        Model description: {json.dumps(context['obj'], ensure_ascii=False, indent=2)}
+        Scene information: {context['scene_info']}
+
+        Objective:
+        Evaluate the 3D model separately for each of the criteria below, and provide detailed evaluation results and improvement suggestions for each one.
+        The following situations should be directly judged as not passing:
+        - Any point that does not meet user requirements, except for material-related requirements.
+        - A common problem is model floating, such as table legs not directly connected to the tabletop. This situation does not meet the requirements and should be judged as not passing.
+        - Another common problem is that the generated model has no thickness or is flat rather than 3D solid, which often occurs in board materials. This situation is completely unacceptable and must be supplemented with corresponding thickness.
+        - Obvious intersections, such as chair legs directly piercing through the chair cushion, are clearly unacceptable.
+
+        Criteria:
+        - overall: Are the main components complete, are the connections between parts reasonable, and does the overall shape meet expectations?
+        - size: Are the overall size and the absolute sizes of the parts reasonable, and are they coordinated with other objects in the scene?
+        - proportion: Are the size relationships between the parts harmonious, and do they conform to the model's expected use?
+        - structure: Is the structure stable, are the connections appropriate, and are there potential structural weaknesses?
+        - usability: Does the design conform to its intended use according to common sense, and are there safety hazards or usage obstacles?
+        For every criterion, also check whether the model conforms to the user's original input and rewritten requirements.
+
+        Style:
+        - Analytical: Carefully observe various aspects of the model
+        - Objective: Evaluate based on facts, without personal bias
+        - Independent: Judge each criterion on its own, without letting one criterion decide the others
+
+        Tone:
+        - Professional: Use professional terms related to 3D modeling and design
+        - Direct: Clearly point out problems and advantages
+
+        Audience:
+        3D model designers and developers
+
+        Response:
+        Please provide a JSON object with one entry per criterion ("overall", "size", "proportion", "structure", "usability"). Each entry contains:
+        1. analysis: Detailed analysis of the criterion, including strengths and issues
+        2. status: Evaluation status ("NOT_PASS", "PASS", or "GOOD")
+        3. score: Score (float from 0-10, for reference only, with 5 as the boundary, below 5 is not passing, above 7 is Good)
+        4. suggestions: List of improvement suggestions
+
+        Example:
+        {{
+            "overall": {{
+                "analysis": "This 3D model has a complete overall structure, with all main components included. However, the connections between some parts look unnatural, especially at [specific location].",
+                "status": "PASS",
+                "score": 7.5,
+                "suggestions": ["Improve the component connections at [specific location] to make them more natural and smooth"]
+            }},
+            "size": {{
+                "analysis": "The overall size is reasonable, but [a minor part] appears slightly too large.",
+                "status": "PASS",
+                "score": 7.0,
+                "suggestions": ["Reduce the size of [minor part] by about 10-15%"]
+            }},
+            "proportion": {{
+                "analysis": "The proportions between the main body and supporting structures are appropriate.",
+                "status": "GOOD",
+                "score": 8.5,
+                "suggestions": []
+            }},
+            "structure": {{
+                "analysis": "[Some legs] are not connected to [the top], so the structure is floating.",
+                "status": "NOT_PASS",
+                "score": 3.0,
+                "suggestions": ["Move [some legs] up so they touch the underside of [the top]"]
+            }},
+            "usability": {{
+                "analysis": "The height seems slightly higher than standard, which may affect comfortable use.",
+                "status": "PASS",
+                "score": 7.0,
+                "suggestions": ["Adjust the height to standard level (about 75 cm)"]
+            }}
+        }}
+        """
+
+    def analyze_screenshots(self, prompt: str, screenshots: List[str]) -> str:
+        """Analyze screenshots using Claude."""
+        return analyze_screenshots_with_claude(prompt, screenshots)
+
+    def evaluate(
+        self, screenshots: List[str], context: Dict[str, Any]
+    ) -> Dict[str, EvaluationResult]:
+        """
+        Evaluate the model for every criterion with a single request.
+
+        Args:
+            screenshots (List[str]): List of screenshot file paths.
+            context (Dict[str, Any]): Evaluation context.
+
+        Returns:
+            Dict[str, EvaluationResult]: Evaluation results for each criterion, keyed by
+                the names in COMBINED_CRITERIA.
+        """
+        prompt = (
+            self.get_prompt(context)
+            + context.get("screenshot_note", "")
+            + context.get("geometry_note", "")
+        )
+        response = self.analyze_screenshots(prompt, screenshots)
+        return self.split_results(parse_json_response(response))
+
+    @staticmethod
+    def split_results(result: Dict[str, Any]) -> Dict[str, EvaluationResult]:
+        """
+        Split a combined response into one evaluation result per criterion.
+
+        A criterion that is missing or malformed gets the fallback result of a
+        failed evaluator, so the other criteria are still used.
+
+        Args:
+            result (Dict[str, Any]): The parsed combined response.
+
+        Returns:
+            Dict[str, EvaluationResult]: Evaluation results keyed by the names in COMBINED_CRITERIA.
+        """
+        if not isinstance(result, dict):
+            result = {}
+        results = {}
+        for criterion, name in COMBINED_CRITERIA.items():
+            entry = result.get(criterion)
+            try:
+                results[name] = EvaluationResult(
+                    entry["analysis"],
+                    EvaluationStatus[entry["status"]],
+                    entry["score"],
+                    entry["suggestions"],
+                )
+            except (KeyError, TypeError) as e:
+                logger.error(f"Invalid {criterion} entry in combined evaluation: {e}")
+                results[name] = failed_evaluation_result(
+                    f"Combined evaluation returned no valid {criterion} result."
+                )
+        return results
+
+
 class ModelEvaluator:
     """Class for evaluating 3D models using multiple evaluators."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        concurrent: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_EVALUATORS,
+        evaluator_timeout: Optional[float] = DEFAULT_EVALUATOR_TIMEOUT,
+        admission_timeout: float = DEFAULT_ADMISSION_TIMEOUT,
+        mode: str = DEFAULT_EVALUATION_MODE,
+        short_circuit: bool = DEFAULT_SHORT_CIRCUIT,
+        use_atlas: bool = DEFAULT_USE_ATLAS,
+    ):
+        """
+        Initialize the model evaluator.
+
+        Args:
+            concurrent (bool): Run the evaluators on a thread pool instead of one after another.
+            max_concurrency (int): Maximum number of evaluators running at the same time.
+            evaluator_timeout (Optional[float]): Seconds a single evaluator may run before it is
+                abandoned. None disables the timeout.
+            admission_timeout (float): Seconds, on top of evaluator_timeout, an evaluator may
+                spend from submission until the rate limiter admits it, queued behind the
+                concurrency limit, building its request or throttled. Bounds the evaluation
+                even when an evaluator never reaches admission.
+            mode (str): "separate" to run one evaluator per criterion, or "combined" to
+                evaluate every criterion with a single request.
+            short_circuit (bool): Stop as soon as one evaluator returns NOT_PASS, which
+                decides the final status. Evaluators then start in order of their
+                historical rejection rate per second, which matters when they run
+                sequentially or max_concurrency is below the number of evaluators.
+                The results contain only the evaluators that finished.
+            use_atlas (bool): Send the screenshots tiled into one labeled image, with a
+                description of the grid added to each prompt.
+        """
+        if mode not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode: {mode}")
+        self.mode = mode
+        self.combined_evaluator = CombinedEvaluator()
         self.evaluators: List[BaseEvaluator] = [
             GPTOverallEvaluator(),
             ClaudeOverallEvaluator(),
@@ -512,6 +869,13 @@ class ModelEvaluator:
             StructureEvaluator(),
             UsabilityEvaluator(),
         ]
+        self.concurrent = concurrent
+        self.max_concurrency = max(1, max_concurrency)
+        self.evaluator_timeout = evaluator_timeout
+        self.admission_timeout = admission_timeout
+        self.short_circuit = short_circuit
+        self.use_atlas = use_atlas
+        self.history = evaluator_history
 
     def evaluate(
         self, screenshots: List[str], context: Dict[str, Any]
@@ -524,8 +888,10 @@ class ModelEvaluator:
             context (Dict[str, Any]): Evaluation context.
 
         Returns:
-            Dict[str, EvaluationResult]: Evaluation results for each evaluator.
+            Dict[str, EvaluationResult]: Evaluation results for each evaluator. With
+                short_circuit, evaluators skipped after a NOT_PASS are left out.
         """
+        # Scene information is read from bpy, so it must be collected on the calling thread
         scene_info = get_scene_info()
         formatted_scene_info = format_scene_info(scene_info)
         context["scene_info"] = formatted_scene_info
@@ -533,22 +899,227 @@ class ModelEvaluator:
         if "obj" in context and "model_description" not in context:
             context["model_description"] = context["obj"]
 
-        results = {}
-        for evaluator in self.evaluators:
-            result = evaluator.evaluate(screenshots, context)
-            results[evaluator.__class__.__name__] = result
+        context["screenshot_note"] = ""
+        if self.use_atlas:
+            context["screenshot_note"] = get_atlas_prompt_note(len(screenshots))
+            screenshots = [get_screenshot_atlas(screenshots)]
 
-            logger.info(f"\n--- {evaluator.__class__.__name__} Results ---")
-            logger.info(f"Analysis: {result.analysis}")
-            logger.info(f"Status: {result.status.name}")
-            logger.info(f"Score: {result.score}")
-            logger.info("Suggestions:")
-            for suggestion in result.suggestions:
-                logger.info(f"- {suggestion}")
-            logger.info("-----------------------------------")
+        if self.mode == "combined":
+            results = self._evaluate_combined(screenshots, context)
+        else:
+            evaluators = self.evaluators
+            if self.short_circuit:
+                evaluators = self.history.order(evaluators)
+            if self.concurrent and len(evaluators) > 1:
+                results = self._evaluate_concurrently(evaluators, screenshots, context)
+            else:
+                results = self._evaluate_sequentially(evaluators, screenshots, context)
+            self.history.save()
+
+            skipped = [
+                evaluator.__class__.__name__
+                for evaluator in evaluators
+                if evaluator.__class__.__name__ not in results
+            ]
+            if skipped:
+                logger.info(
+                    f"NOT_PASS decided early, skipped evaluators: {', '.join(skipped)}"
+                )
+
+        for name, result in results.items():
+            self._log_result(name, result)
+
+        return results
+
+    def _evaluate_combined(
+        self, screenshots: List[str], context: Dict[str, Any]
+    ) -> Dict[str, EvaluationResult]:
+        """Evaluate every criterion with a single request."""
+        try:
+            return self.combined_evaluator.evaluate(screenshots, context)
+        except Exception as e:
+            logger.error(f"Error in CombinedEvaluator: {str(e)}")
+            return {
+                name: failed_evaluation_result(f"CombinedEvaluator failed: {str(e)}")
+                for name in COMBINED_CRITERIA.values()
+            }
+
+    def _run_evaluator(
+        self,
+        evaluator: BaseEvaluator,
+        screenshots: List[str],
+        context: Dict[str, Any],
+        should_record: Callable[[], bool] = lambda: True,
+    ) -> EvaluationResult:
+        """
+        Run one evaluator and record its verdict and duration in the history.
 
+        An evaluator that raises is recorded as FAILED. should_record is checked when
+        the run ends, so a run that was already recorded as abandoned is not recorded twice.
+        """
+        start_time = time.monotonic()
+        status = EvaluationStatus.FAILED
+        try:
+            result = evaluator.evaluate(screenshots, context)
+            status = result.status
+            return result
+        finally:
+            if should_record():
+                self.history.record(
+                    evaluator.__class__.__name__, status, time.monotonic() - start_time
+                )
+
+    def _evaluate_sequentially(
+        self,
+        evaluators: List[BaseEvaluator],
+        screenshots: List[str],
+        context: Dict[str, Any],
+    ) -> Dict[str, EvaluationResult]:
+        """Run the evaluators one after another."""
+        results = {}
+        for evaluator in evaluators:
+            name = evaluator.__class__.__name__
+            try:
+                results[name] = self._run_evaluator(evaluator, screenshots, context)
+            except Exception as e:
+                logger.error(f"Error in {name}: {str(e)}")
+                results[name] = failed_evaluation_result(f"{name} failed: {str(e)}")
+            if self.short_circuit and results[name].status == EvaluationStatus.NOT_PASS:
+                break
         return results
 
+    def _evaluate_concurrently(
+        self,
+        evaluators: List[BaseEvaluator],
+        screenshots: List[str],
+        context: Dict[str, Any],
+    ) -> Dict[str, EvaluationResult]:
+        """
+        Run the evaluators on a thread pool.
+
+        Each evaluator gets its own timeout, measured from the moment the rate limiter
+        admits its request, so evaluators queued behind the concurrency limit or
+        throttled by the rate limiter are not penalized. Every evaluator also has an
+        absolute deadline of evaluator_timeout plus admission_timeout from submission,
+        so one that never reaches admission cannot stall the evaluation. A timed-out
+        evaluator gets a FAILED result. Results are returned in the same order as self.evaluators.
+        With short_circuit, the first
+        NOT_PASS cancels the queued evaluators and abandons the running ones.
+        Timed-out and abandoned evaluators are recorded in the history as FAILED, with
+        the time they ran, and their late results are discarded.
+        """
+        start_times: Dict[str, float] = {}
+        # Each admitted evaluator is recorded once, by itself or when it is abandoned
+        recorded = set()
+        abandoned = set()
+        record_lock = threading.Lock()
+
+        def run(evaluator: BaseEvaluator) -> EvaluationResult:
+            name = evaluator.__class__.__name__
+
+            def admitted():
+                # A retry restarts the clock: its backoff is spent waiting as well
+                start_times[name] = time.monotonic()
+
+            def should_record():
+                with record_lock:
+                    if name in abandoned:
+                        return False
+                    recorded.add(name)
+                    return True
+
+            with on_admission(admitted):
+                return self._run_evaluator(
+                    evaluator, screenshots, context, should_record
+                )
+
+        def abandon(name: str):
+            """Record an evaluator that was admitted but will not be waited for."""
+            started = start_times.get(name)
+            if started is None:
+                return
+            with record_lock:
+                if name in recorded:
+                    return
+                abandoned.add(name)
+            self.history.record(
+                name, EvaluationStatus.FAILED, time.monotonic() - started
+            )
+
+        completed: Dict[str, EvaluationResult] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(evaluators)),
+            thread_name_prefix="evaluator",
+        )
+        try:
+            submitted = time.monotonic()
+            pending = {
+                executor.submit(run, evaluator): evaluator.__class__.__name__
+                for evaluator in evaluators
+            }
+            while pending:
+                done, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        completed[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error in {name}: {str(e)}")
+                        completed[name] = failed_evaluation_result(
+                            f"{name} failed: {str(e)}"
+                        )
+
+                if self.short_circuit and any(
+                    result.status == EvaluationStatus.NOT_PASS
+                    for result in completed.values()
+                ):
+                    for future, name in pending.items():
+                        if not future.cancel():
+                            abandon(name)
+                    break
+
+                if self.evaluator_timeout is None:
+                    continue
+
+                now = time.monotonic()
+                deadline = submitted + self.evaluator_timeout + self.admission_timeout
+                for future, name in list(pending.items()):
+                    started = start_times.get(name)
+                    if started is not None and now - started > self.evaluator_timeout:
+                        message = f"{name} timed out after {self.evaluator_timeout:.0f} seconds"
+                    elif now > deadline:
+                        message = (
+                            f"{name} timed out after {now - submitted:.0f} seconds, "
+                            f"{'admitted' if started is not None else 'never admitted'}"
+                        )
+                    else:
+                        continue
+                    # A running thread cannot be interrupted; abandon its result instead
+                    future.cancel()
+                    pending.pop(future)
+                    abandon(name)
+                    logger.warning(message)
+                    completed[name] = failed_evaluation_result(f"{message}.")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {
+            evaluator.__class__.__name__: completed[evaluator.__class__.__name__]
+            for evaluator in self.evaluators
+            if evaluator.__class__.__name__ in completed
+        }
+
+    def _log_result(self, name: str, result: EvaluationResult):
+        """Log the result of a single evaluator."""
+        logger.info(f"\n--- {name} Results ---")
+        logger.info(f"Analysis: {result.analysis}")
+        logger.info(f"Status: {result.status.name}")
+        logger.info(f"Score: {result.score}")
+        logger.info("Suggestions:")
+        for suggestion in result.suggestions:
+            logger.info(f"- {suggestion}")
+        logger.info("-----------------------------------")
+
     def aggregate_results(
         self, results: Dict[str, EvaluationResult]
     ) -> Tuple[str, EvaluationStatus, float, List[str]]:
@@ -558,9 +1129,27 @@ class ModelEvaluator:
         Args:
             results (Dict[str, EvaluationResult]): Evaluation results from all evaluators.
 
+        Evaluators that FAILED have no verdict and are left out. If none has one,
+        the final status is FAILED.
+
         Returns:
             Tuple[str, EvaluationStatus, float, List[str]]: Aggregated analysis, status, score, and suggestions.
         """
+        failed = [
+            name
+            for name, result in results.items()
+            if result.status == EvaluationStatus.FAILED
+        ]
+        if failed:
+            logger.warning(f"Evaluators without a verdict: {', '.join(failed)}")
+        results = {
+            name: result
+            for name, result in results.items()
+            if result.status != EvaluationStatus.FAILED
+        }
+        if not results:
+            return "No evaluator returned a verdict.", EvaluationStatus.FAILED, 0.0, []
+
         statuses = [result.status for result in results.values()]
         average_score = sum(result.score for result in results.values()) / len(results)
 
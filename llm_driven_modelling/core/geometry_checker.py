@@ -0,0 +1,437 @@
+# geometry_checker.py
+
+"""
+This module provides deterministic geometry checks that run before the vision-based evaluation.
+Flat meshes without thickness and parts floating apart from the rest of the model can be
+detected exactly from the scene. An unambiguous failure, a mesh with no thickness at all
+across a large extent or a part floating far from everything else, decides the iteration
+without the GPT and Claude evaluators. Borderline findings may be intended, e.g. a thin sheet
+or a part hanging just apart, so they are passed to the evaluators as extra input instead.
+Candidate contacts are found with world-space bounding boxes and confirmed with BVH trees.
+"""
+
+import bpy
+import numpy as np
+from mathutils.bvhtree import BVHTree
+from typing import List, Dict, Any, Optional, Set, Tuple
+from llm_driven_modelling.core.evaluators_module import (
+    EvaluationResult,
+    EvaluationStatus,
+)
+from llm_driven_modelling.llm.LLM_common_utils import get_scene_info
+from llm_driven_modelling.utils.logger_module import setup_logger
+from llm_driven_modelling.utils.mesh_module import get_world_mesh
+
+# Set up logging
+logger = setup_logger("model_generation")
+
+# A mesh is flat if it is thinner than both of these, in meters and relative to its size
+MIN_THICKNESS = 0.001
+MIN_THICKNESS_RATIO = 0.002
+# A flat mesh is unambiguous if it is at most this thick and at least this wide, in meters
+FLAT_EPSILON = 1e-6
+MIN_FLAT_EXTENT = 0.05
+# Parts closer than both of these, in meters and relative to the model size, are touching
+CONTACT_TOLERANCE = 0.002
+CONTACT_TOLERANCE_RATIO = 0.005
+# A floating part is unambiguous if its gap is at least this many contact tolerances
+FLOATING_GAP_FACTOR = 10.0
+# Vertices of a part tested against the other part's BVH tree
+MAX_CONTACT_SAMPLES = 2000
+
+CHECK_PASS_SCORE = 10.0
+CHECK_FAIL_SCORE = 2.0
+
+
+class MeshPart:
+    """World-space geometry of one mesh object."""
+
+    def __init__(self, obj, depsgraph):
+        """
+        Read the evaluated mesh of an object, including its modifiers, in world space.
+
+        Args:
+            obj (bpy.types.Object): The mesh object.
+            depsgraph (bpy.types.Depsgraph): The evaluated dependency graph.
+        """
+        self.name = obj.name
+        self.vertices, self.triangles = get_world_mesh(obj, depsgraph)
+        self.min_corner = self.vertices.min(axis=0)
+        self.max_corner = self.vertices.max(axis=0)
+        self._bvh = None
+
+    @property
+    def bvh(self):
+        """The BVH tree of the part's triangles, built on first use."""
+        if self._bvh is None:
+            self._bvh = BVHTree.FromPolygons(
+                self.vertices.tolist(), self.triangles.tolist()
+            )
+        return self._bvh
+
+    def get_thickness(self):
+        """
+        Get the extent of the part along its thinnest and widest principal axes.
+
+        Returns:
+            tuple: The thickness and the largest extent, in meters.
+        """
+        centered = self.vertices - self.vertices.mean(axis=0)
+        _, axes = np.linalg.eigh(centered.T @ centered)
+        projected = centered @ axes
+        extents = projected.max(axis=0) - projected.min(axis=0)
+        return extents[0], extents[-1]
+
+    def get_samples(self):
+        """Get up to MAX_CONTACT_SAMPLES evenly spaced vertices."""
+        step = max(1, len(self.vertices) // MAX_CONTACT_SAMPLES)
+        return self.vertices[::step]
+
+    def get_box_distance(self, other):
+        """Get the distance between the bounding boxes of two parts."""
+        separation = np.maximum(
+            other.min_corner - self.max_corner, self.min_corner - other.max_corner
+        )
+        return float(np.linalg.norm(np.maximum(separation, 0.0)))
+
+    def contains_box(self, other):
+        """Check whether the other part's bounding box lies inside this one's."""
+        return bool(
+            np.all(self.min_corner <= other.min_corner)
+            and np.all(other.max_corner <= self.max_corner)
+        )
+
+    def get_distance(self, other, limit=None):
+        """
+        Get the distance from the sampled vertices of this part to the other part's surface.
+
+        Args:
+            other (MeshPart): The other part.
+            limit (float, optional): Stop at the first vertex closer than this.
+
+        Returns:
+            float: The smallest distance found, or infinity if there is none.
+        """
+        nearest = float("inf")
+        for co in self.get_samples():
+            location, _, _, distance = other.bvh.find_nearest(co)
+            if location is not None and distance < nearest:
+                nearest = distance
+                if limit is not None and nearest <= limit:
+                    break
+        return nearest
+
+
+class GeometryChecker:
+    """Deterministic checks for flat meshes and floating parts."""
+
+    def __init__(
+        self,
+        min_thickness: float = MIN_THICKNESS,
+        min_thickness_ratio: float = MIN_THICKNESS_RATIO,
+        contact_tolerance: float = CONTACT_TOLERANCE,
+        contact_tolerance_ratio: float = CONTACT_TOLERANCE_RATIO,
+        flat_epsilon: float = FLAT_EPSILON,
+        min_flat_extent: float = MIN_FLAT_EXTENT,
+        floating_gap_factor: float = FLOATING_GAP_FACTOR,
+    ):
+        """
+        Initialize the checker.
+
+        Args:
+            min_thickness (float): Meshes thinner than this many meters may be flat.
+            min_thickness_ratio (float): Meshes thinner than this fraction of their size may be flat.
+            contact_tolerance (float): Parts closer than this many meters may be touching.
+            contact_tolerance_ratio (float): Parts closer than this fraction of the model size
+                may be touching.
+            flat_epsilon (float): Meshes at most this many meters thick have no thickness at all.
+            min_flat_extent (float): Meshes without thickness are unambiguously flat from this
+                many meters across.
+            floating_gap_factor (float): Parts this many contact tolerances away from every
+                other part are unambiguously floating.
+        """
+        self.min_thickness = min_thickness
+        self.min_thickness_ratio = min_thickness_ratio
+        self.contact_tolerance = contact_tolerance
+        self.contact_tolerance_ratio = contact_tolerance_ratio
+        self.flat_epsilon = flat_epsilon
+        self.min_flat_extent = min_flat_extent
+        self.floating_gap_factor = floating_gap_factor
+
+    def check(
+        self,
+        scene_info: Optional[List[Dict[str, Any]]] = None,
+        exclude: Optional[Set[str]] = None,
+    ) -> Tuple[Dict[str, EvaluationResult], Dict[str, EvaluationResult]]:
+        """
+        Run every geometry check on the mesh objects of the scene.
+
+        Args:
+            scene_info (Optional[List[Dict[str, Any]]]): The result of get_scene_info.
+                Collected from the scene if not given.
+            exclude (Optional[Set[str]]): Names of objects that are not part of the model,
+                e.g. the objects of previously generated models.
+
+        Returns:
+            Tuple[Dict[str, EvaluationResult], Dict[str, EvaluationResult]]: The result of
+                each check, NOT_PASS only for unambiguous failures, and the borderline
+                findings of each check that found any.
+        """
+        if scene_info is None:
+            scene_info = get_scene_info()
+        exclude = exclude or set()
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        parts = []
+        for info in scene_info:
+            if info["type"] != "MESH" or info["name"] in exclude:
+                continue
+            if not info.get("vertex_count"):
+                continue
+            parts.append(MeshPart(bpy.data.objects[info["name"]], depsgraph))
+
+        results = {}
+        borderline = {}
+        for name, check in (
+            ("ThicknessCheck", self.check_thickness),
+            ("ConnectivityCheck", self.check_connectivity),
+        ):
+            results[name], finding = check(parts)
+            if finding is not None:
+                borderline[name] = finding
+        return results, borderline
+
+    def check_thickness(
+        self, parts: List[MeshPart]
+    ) -> Tuple[EvaluationResult, Optional[EvaluationResult]]:
+        """
+        Find meshes whose vertices all lie in one plane.
+
+        A mesh with no thickness at all across at least min_flat_extent is a failure;
+        one that is merely thin may be intended and is reported as borderline.
+
+        Args:
+            parts (List[MeshPart]): The parts of the model.
+
+        Returns:
+            Tuple[EvaluationResult, Optional[EvaluationResult]]: The result, NOT_PASS if
+                any part is unambiguously flat, and the borderline finding, if any.
+        """
+        flat_parts = []
+        thin_parts = []
+        for part in parts:
+            thickness, size = part.get_thickness()
+            if size > 0 and thickness < max(
+                self.min_thickness, self.min_thickness_ratio * size
+            ):
+                if thickness <= self.flat_epsilon and size >= self.min_flat_extent:
+                    flat_parts.append((part.name, thickness, size))
+                else:
+                    thin_parts.append((part.name, thickness, size))
+
+        borderline = self._thickness_result(thin_parts, "is very thin")
+        if not flat_parts:
+            return (
+                EvaluationResult(
+                    "Every mesh has a thickness.",
+                    EvaluationStatus.PASS,
+                    CHECK_PASS_SCORE,
+                    [],
+                ),
+                borderline,
+            )
+        return self._thickness_result(flat_parts, "is flat"), borderline
+
+    @staticmethod
+    def _thickness_result(parts, description):
+        if not parts:
+            return None
+        analysis = " ".join(
+            f"{name} {description}: {thickness:.4f} m thick across {size:.3f} m."
+            for name, thickness, size in parts
+        )
+        suggestions = [
+            f"Give {name} a real thickness, e.g. model it as a scaled cube instead of a plane"
+            for name, _, _ in parts
+        ]
+        return EvaluationResult(
+            analysis, EvaluationStatus.NOT_PASS, CHECK_FAIL_SCORE, suggestions
+        )
+
+    def check_connectivity(
+        self, parts: List[MeshPart]
+    ) -> Tuple[EvaluationResult, Optional[EvaluationResult]]:
+        """
+        Find parts that neither touch the rest of the model nor stand on the ground.
+
+        Touching parts are joined into connected components. A component whose lowest
+        point is at the model's lowest point stands on the ground, so several separate
+        items are accepted; any other component is floating. A component at least
+        floating_gap_factor contact tolerances from every other part is a failure;
+        one closer than that may be intended and is reported as borderline.
+
+        Args:
+            parts (List[MeshPart]): The parts of the model.
+
+        Returns:
+            Tuple[EvaluationResult, Optional[EvaluationResult]]: The result, NOT_PASS if
+                any component is unambiguously floating, and the borderline finding, if any.
+        """
+        if len(parts) < 2:
+            return (
+                EvaluationResult(
+                    "The model has a single part.",
+                    EvaluationStatus.PASS,
+                    CHECK_PASS_SCORE,
+                    [],
+                ),
+                None,
+            )
+
+        model_min = np.min([part.min_corner for part in parts], axis=0)
+        model_max = np.max([part.max_corner for part in parts], axis=0)
+        tolerance = max(
+            self.contact_tolerance,
+            self.contact_tolerance_ratio * float(np.max(model_max - model_min)),
+        )
+
+        parents = list(range(len(parts)))
+
+        def find(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        for i, part in enumerate(parts):
+            for j in range(i + 1, len(parts)):
+                if find(i) != find(j) and self._touching(part, parts[j], tolerance):
+                    parents[find(i)] = find(j)
+
+        components: Dict[int, List[MeshPart]] = {}
+        for index, part in enumerate(parts):
+            components.setdefault(find(index), []).append(part)
+        floating = [
+            component
+            for component in components.values()
+            if min(part.min_corner[2] for part in component) > model_min[2] + tolerance
+        ]
+
+        detached = []
+        near = []
+        for component in floating:
+            names = ", ".join(part.name for part in component)
+            others = [part for part in parts if part not in component]
+            gap, nearest = min(
+                (
+                    min(
+                        min(part.get_distance(other), other.get_distance(part))
+                        for part in component
+                    ),
+                    other.name,
+                )
+                for other in others
+            )
+            if gap >= self.floating_gap_factor * tolerance:
+                detached.append((names, gap, nearest))
+            else:
+                near.append((names, gap, nearest))
+
+        borderline = self._floating_result(near)
+        if not detached:
+            return (
+                EvaluationResult(
+                    f"All parts are connected or stand on the ground "
+                    f"({len(components)} connected components).",
+                    EvaluationStatus.PASS,
+                    CHECK_PASS_SCORE,
+                    [],
+                ),
+                borderline,
+            )
+        return self._floating_result(detached), borderline
+
+    @staticmethod
+    def _floating_result(components):
+        if not components:
+            return None
+        analysis = " ".join(
+            f"{names} floats {gap:.3f} m away from {nearest} without touching "
+            f"any other part."
+            for names, gap, nearest in components
+        )
+        suggestions = [
+            f"Move {names} by {gap:.3f} m so it is directly connected to {nearest}"
+            for names, gap, nearest in components
+        ]
+        return EvaluationResult(
+            analysis, EvaluationStatus.NOT_PASS, CHECK_FAIL_SCORE, suggestions
+        )
+
+    @staticmethod
+    def _touching(part: MeshPart, other: MeshPart, tolerance: float) -> bool:
+        """Check whether two parts intersect, touch, or one is inside the other."""
+        if part.get_box_distance(other) > tolerance:
+            return False
+        if part.contains_box(other) or other.contains_box(part):
+            return True
+        if part.bvh.overlap(other.bvh):
+            return True
+        return (
+            part.get_distance(other, limit=tolerance) <= tolerance
+            or other.get_distance(part, limit=tolerance) <= tolerance
+        )
+
+
+def check_model_geometry(
+    exclude: Optional[Set[str]] = None,
+) -> Tuple[Dict[str, EvaluationResult], Dict[str, EvaluationResult]]:
+    """
+    Run the geometry checks and return the failed ones and the borderline findings.
+
+    Args:
+        exclude (Optional[Set[str]]): Names of objects that are not part of the model.
+
+    Returns:
+        Tuple[Dict[str, EvaluationResult], Dict[str, EvaluationResult]]: The unambiguous
+            NOT_PASS results, which make the vision evaluation unnecessary, and the
+            borderline findings for the evaluators to verify. Both are empty if the
+            geometry is fine.
+    """
+    try:
+        results, borderline = GeometryChecker().check(exclude=exclude)
+    except Exception as e:
+        logger.error(f"Geometry check failed: {str(e)}")
+        return {}, {}
+    for name, result in results.items():
+        logger.info(f"{name}: {result.status.name}. {result.analysis}")
+    for name, result in borderline.items():
+        logger.info(f"{name} borderline: {result.analysis}")
+    failures = {
+        name: result
+        for name, result in results.items()
+        if result.status == EvaluationStatus.NOT_PASS
+    }
+    return failures, borderline
+
+
+def get_geometry_prompt_note(results: Dict[str, EvaluationResult]) -> str:
+    """
+    Describe borderline geometry findings for the evaluation prompts.
+
+    Args:
+        results (Dict[str, EvaluationResult]): The borderline findings, as returned by
+            check_model_geometry.
+
+    Returns:
+        str: Text to append to an evaluation prompt; empty if there are no findings.
+    """
+    if not results:
+        return ""
+    findings = "\n".join(f"- {result.analysis}" for result in results.values())
+    return (
+        "\n\nAutomated geometry checks reported the following borderline findings:\n"
+        f"{findings}\n"
+        "The checks cannot tell design intent from defects: a part may be thin or detached "
+        "on purpose. Use the screenshots and the model description to decide whether each "
+        "finding is a real problem, and only then reflect it in your status and suggestions."
+    )
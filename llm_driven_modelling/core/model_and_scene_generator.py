@@ -14,8 +14,8 @@ from llm_driven_modelling.utils.logger_module import setup_logger
 from llm_driven_modelling.llm.LLM_common_utils import get_scene_info, format_scene_info
 from llm_driven_modelling.core.model_generation_utils import update_blender_view
 from llm_driven_modelling.utils.model_viewer_module import (
-    save_screenshots,
-    save_screenshots_to_path,
+    SCREENSHOTS_PATH,
+    capture_screenshots,
 )
 from llm_driven_modelling.llm.LLM_common_utils import (
     initialize_conversation,
@@ -25,11 +25,12 @@ from llm_driven_modelling.llm.LLM_common_utils import (
     format_scene_info,
     execute_blender_command_with_error_handling,
 )
+from llm_driven_modelling.llm.code_stream_validator import StreamingCodeValidator
 from llm_driven_modelling.llama_index_library.llama_index_model_generation import (
     query_generation_documentation,
 )
 from llm_driven_modelling.llama_index_library.llama_index_component_library import (
-    query_component_documentation,
+    query_component_documentation_batch,
 )
 
 logger = setup_logger("model_generation")
@@ -39,23 +40,44 @@ def query_component_library(obj):
     """
     Query the component library for documentation on specified components.
 
+    All component names are retrieved in one batch, and documents matched by
+    several components are included once.
+
     Args:
         obj (dict): Object containing component information.
 
     Returns:
         str: Concatenated documentation for all queried components.
     """
-    component_docs = []
-    for component in obj.get("components", []):
-        component_name = component.get("name", "")
-        if component_name:
-            results = query_component_documentation(
-                bpy.types.Scene.component_query_engine, component_name
-            )
-            component_docs.extend(results)
+    component_names = [
+        component.get("name", "")
+        for component in obj.get("components", [])
+        if component.get("name", "")
+    ]
+    if not component_names:
+        return ""
+    component_docs = query_component_documentation_batch(
+        bpy.types.Scene.component_retriever, component_names
+    )
     return "\n\n".join(component_docs)
 
 
+def execute_validated_code(code, validator):
+    """
+    Execute generated code unless its validator already rejected it.
+
+    Args:
+        code (str): The generated Blender Python code.
+        validator (StreamingCodeValidator): The validator the code was streamed through.
+
+    Returns:
+        str or None: Error message if the code was rejected or failed, None if successful.
+    """
+    if validator.error:
+        return f"Generated code was rejected before execution: {validator.error}\n"
+    return execute_blender_command_with_error_handling(code)
+
+
 def generate_3d_model(context, models, obj, scene_context, log_dir):
     """
     Generate a 3D model based on the provided object description and scene context.
@@ -75,7 +97,7 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
 
     logger.info("Querying generation documentation")
     generation_docs = query_generation_documentation(
-        bpy.types.Scene.generation_query_engine, obj["object_type"]
+        bpy.types.Scene.generation_retriever, obj["object_type"]
     )
     logger.info(f"Generation documentation: {generation_docs}")
 
@@ -85,7 +107,7 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
     # Query style documentation
     style = obj["style"]
     style_docs = query_generation_documentation(
-        bpy.types.Scene.generation_query_engine, obj["style"]
+        bpy.types.Scene.generation_retriever, obj["style"]
     )
     logger.info(f"Style documentation: {style_docs}")
 
@@ -152,7 +174,10 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
     conversation_manager = context.scene.conversation_manager
     initialize_conversation(context)
     prompt_with_history = add_history_to_prompt(context, prompt)
-    response = generate_text_with_claude(prompt_with_history)
+    # The response is streamed and checked statement by statement, so malformed
+    # code goes to the correction request without waiting for the full response
+    validator = StreamingCodeValidator()
+    response = generate_text_with_claude(prompt_with_history, validator=validator)
 
     conversation_manager.add_message("user", prompt)
     conversation_manager.add_message("assistant", response)
@@ -166,7 +191,7 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
     ) as f:
         f.write(response)
 
-    error_message = execute_blender_command_with_error_handling(response)
+    error_message = execute_validated_code(response, validator)
     corrected_response = None
     if error_message:
         logger.error(f"Error executing Blender commands: {error_message}")
@@ -185,7 +210,10 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
             Please provide the corrected Blender Python code.
             """
 
-        corrected_response = generate_text_with_claude(error_prompt)
+        corrected_validator = StreamingCodeValidator()
+        corrected_response = generate_text_with_claude(
+            error_prompt, validator=corrected_validator
+        )
 
         logger.info(f"GPT Generated Corrected Commands:\n{corrected_response}")
 
@@ -198,7 +226,7 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
         ) as f:
             f.write(corrected_response)
 
-        error_message = execute_blender_command_with_error_handling(corrected_response)
+        error_message = execute_validated_code(corrected_response, corrected_validator)
         if error_message:
             logger.error(f"Error executing corrected Blender commands: {error_message}")
         else:
@@ -209,12 +237,11 @@ def generate_3d_model(context, models, obj, scene_context, log_dir):
     update_blender_view(context)
     bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
 
-    screenshots = save_screenshots()
     screenshot_dir = os.path.join(model_dir, "generation_screenshots")
-    save_screenshots_to_path(screenshot_dir)
+    screenshots = capture_screenshots(output_paths=[SCREENSHOTS_PATH, screenshot_dir])
     for screenshot in screenshots:
         logger.debug(
-            f"Generation screenshot saved for {obj['object_type']}: {screenshot}"
+            f"Generation screenshot queued for {obj['object_type']}: {screenshot.name}"
         )
 
     return corrected_response if corrected_response is not None else response
@@ -331,8 +358,7 @@ def arrange_scene(context, scene_description, generated_models, log_dir):
 
     update_blender_view(context)
 
-    screenshots = save_screenshots()
     screenshot_dir = os.path.join(log_dir, "scene_arrangement_screenshots")
-    save_screenshots_to_path(screenshot_dir)
+    screenshots = capture_screenshots(output_paths=[SCREENSHOTS_PATH, screenshot_dir])
     for screenshot in screenshots:
-        logger.debug(f"Scene arrangement screenshot saved: {screenshot}")
+        logger.debug(f"Scene arrangement screenshot queued: {screenshot.name}")
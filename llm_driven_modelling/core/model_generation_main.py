@@ -22,6 +22,9 @@ from llm_driven_modelling.core.model_material_generator import apply_materials
 from llm_driven_modelling.core.model_generation_optimizer import (
     evaluate_and_optimize_model,
 )
+from llm_driven_modelling.llama_index_library.retrieval_memo import retrieval_run
+from llm_driven_modelling.llm.response_cache import get_response_cache
+from llm_driven_modelling.llm.rate_limiter import get_rate_limiter
 
 # Create a dedicated logger
 logger = setup_logger("model_generation")
@@ -47,8 +50,10 @@ class MODEL_GENERATION_OT_generate(Operator):
     def execute(self, context):
         props = context.scene.model_generation_tool
         user_input = props.input_text
+        response_cache = get_response_cache()
+        response_cache.reset_stats()
 
-        with log_context(logger, user_input) as log_dir:
+        with log_context(logger, user_input) as log_dir, retrieval_run():
             try:
                 logger.info("Rewriting user input")
                 rewritten_input = rewrite_prompt(user_input)
@@ -86,6 +91,14 @@ class MODEL_GENERATION_OT_generate(Operator):
                 logger.error(f"An error occurred: {str(e)}")
                 self.report({"ERROR"}, f"An error occurred: {str(e)}")
 
+        if response_cache.mode != "off":
+            stats = response_cache.stats()
+            logger.info(
+                f"LLM response cache ({stats['mode']}): {stats['hits']} hits, "
+                f"{stats['misses']} misses, {stats['entries']} entries"
+            )
+        logger.info(f"LLM rate limiter: {get_rate_limiter().stats()}")
+
         return {"FINISHED"}
 
     def save_scene_description(self, log_dir, scene_description):
@@ -151,6 +164,8 @@ class MODEL_GENERATION_OT_generate(Operator):
         Returns:
             dict: A dictionary containing the original and optimized model information.
         """
+        previous_objects = set(bpy.data.objects.keys())
+
         # Generate initial model
         initial_model_code = generate_3d_model(
             context, models, obj, scene_context, log_dir
@@ -165,6 +180,7 @@ class MODEL_GENERATION_OT_generate(Operator):
             user_input,
             rewritten_input,
             log_dir,
+            previous_objects=previous_objects,
         )
 
         return {
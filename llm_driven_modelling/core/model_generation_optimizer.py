@@ -27,10 +27,20 @@ from llm_driven_modelling.llm.gpt_module import (
 from llm_driven_modelling.llama_index_library.llama_index_model_modification import (
     query_modification_documentation,
 )
-from llm_driven_modelling.core.evaluators_module import ModelEvaluator, EvaluationStatus
+from llm_driven_modelling.core.evaluators_module import (
+    DEFAULT_USE_ATLAS,
+    ModelEvaluator,
+    EvaluationStatus,
+)
+from llm_driven_modelling.core.geometry_checker import (
+    check_model_geometry,
+    get_geometry_prompt_note,
+)
 from llm_driven_modelling.utils.model_viewer_module import (
-    save_screenshots,
-    save_screenshots_to_path,
+    SCREENSHOTS_PATH,
+    capture_screenshots,
+    get_atlas_prompt_note,
+    get_screenshot_atlas,
 )
 from llm_driven_modelling.core.model_generation_utils import (
     sanitize_reference,
@@ -49,6 +59,7 @@ def evaluate_and_optimize_model(
     user_input,
     rewritten_input,
     log_dir,
+    previous_objects=None,
 ):
     """
     Evaluate and optimize a 3D model through multiple iterations.
@@ -61,6 +72,8 @@ def evaluate_and_optimize_model(
         user_input (str): Original user input.
         rewritten_input (str): Rewritten user input.
         log_dir (str): Directory for logging.
+        previous_objects (set, optional): Names of the objects that existed before the
+            model was generated; they are left out of the geometry checks.
 
     Returns:
         str: Optimized model code.
@@ -76,16 +89,30 @@ def evaluate_and_optimize_model(
         iteration_dir = os.path.join(optimization_dir, f"iteration_{iteration + 1}")
         os.makedirs(iteration_dir, exist_ok=True)
 
-        screenshots = get_screenshots()
+        # Evaluated from memory; the files are written in the background
+        screenshots = capture_screenshots(output_paths=[SCREENSHOTS_PATH])
         evaluator = ModelEvaluator()
 
+        # Flat meshes and floating parts are found exactly; unambiguous failures skip the
+        # vision calls, borderline findings are left for the evaluators to judge
+        geometry_failures, geometry_findings = check_model_geometry(
+            exclude=previous_objects
+        )
         evaluation_context = {
             "model_code": model_code,
             "obj": obj,
             "scene_context": scene_context,
+            "geometry_note": get_geometry_prompt_note(geometry_findings),
         }
 
-        results = evaluator.evaluate(screenshots, evaluation_context)
+        if geometry_failures:
+            logger.info(
+                f"Geometry checks failed ({', '.join(geometry_failures)}), "
+                f"skipping vision evaluation"
+            )
+            results = geometry_failures
+        else:
+            results = evaluator.evaluate(screenshots, evaluation_context)
         (
             combined_analysis,
             final_status,
@@ -94,7 +121,10 @@ def evaluate_and_optimize_model(
         ) = evaluator.aggregate_results(results)
 
         filtered_suggestions = filter_and_consolidate_suggestions(
-            suggestions, evaluation_context
+            suggestions,
+            evaluation_context,
+            use_atlas=evaluator.use_atlas,
+            screenshots=screenshots,
         )
         priority_suggestions = filtered_suggestions.get("priority_suggestions", [])
 
@@ -118,6 +148,9 @@ def evaluate_and_optimize_model(
 
         if final_status == EvaluationStatus.PASS or iteration == max_iterations - 1:
             break
+        if final_status == EvaluationStatus.FAILED:
+            logger.error("No evaluator returned a verdict, stopping the optimization")
+            break
 
         optimized_model_code = optimize_model(
             context,
@@ -135,18 +168,28 @@ def evaluate_and_optimize_model(
     return optimized_model_code
 
 
-def filter_and_consolidate_suggestions(suggestions, evaluation_context):
+def filter_and_consolidate_suggestions(
+    suggestions, evaluation_context, use_atlas=DEFAULT_USE_ATLAS, screenshots=None
+):
     """
     Filter and consolidate optimization suggestions using AI analysis.
 
     Args:
         suggestions (list): List of initial suggestions.
         evaluation_context (dict): Context for evaluation.
+        use_atlas (bool): Send the screenshots tiled into one labeled image.
+        screenshots (list, optional): The screenshot paths or in-memory screenshots.
+            Defaults to get_screenshots().
 
     Returns:
         dict: Filtered and consolidated suggestions.
     """
-    screenshots = get_screenshots()
+    if screenshots is None:
+        screenshots = get_screenshots()
+    screenshot_note = ""
+    if use_atlas:
+        screenshot_note = get_atlas_prompt_note(len(screenshots))
+        screenshots = [get_screenshot_atlas(screenshots)]
 
     prompt = f"""
         Context:
@@ -196,7 +239,7 @@ def filter_and_consolidate_suggestions(suggestions, evaluation_context):
                 "Suggestion 3"
             ],
         }}
-        """
+        """ + screenshot_note
 
     response = analyze_screenshots_with_claude(prompt, screenshots)
     response = sanitize_command(response)
@@ -219,7 +262,7 @@ def optimize_model(
         context: The Blender context.
         priority_suggestions (list): List of priority optimization suggestions.
         evaluation_context (dict): Context for evaluation.
-        screenshots (list): List of screenshot paths.
+        screenshots (list): List of screenshot paths or in-memory screenshots.
         iteration_dir (str): Directory for the current iteration.
         iteration (int): Current iteration number.
 
@@ -233,7 +276,7 @@ def optimize_model(
 
     for suggestion in priority_suggestions:
         modification_doc = query_modification_documentation(
-            bpy.types.Scene.modification_query_engine, suggestion
+            bpy.types.Scene.modification_retriever, suggestion
         )
         logger.info(f"Relevant optimization documentation: {modification_doc}")
 
@@ -429,13 +472,14 @@ def log_optimization_result(final_status, iteration, max_iterations):
 
 
 def save_final_screenshots(optimization_dir, obj):
-    """Save screenshots of the final optimized model."""
-    final_screenshots = save_screenshots()
+    """Save screenshots of the final optimized model in the background."""
     final_screenshot_dir = os.path.join(optimization_dir, "final_model_screenshots")
-    save_screenshots_to_path(final_screenshot_dir)
+    final_screenshots = capture_screenshots(
+        output_paths=[SCREENSHOTS_PATH, final_screenshot_dir]
+    )
     for screenshot in final_screenshots:
         logger.debug(
-            f"Final model screenshot saved for {obj['object_type']}: {screenshot}"
+            f"Final model screenshot queued for {obj['object_type']}: {screenshot.name}"
         )
 
 
@@ -484,11 +528,10 @@ def handle_optimization_error(error_message, optimization_code, iteration_dir):
 
 
 def save_iteration_screenshots(iteration_dir, iteration):
-    """Save screenshots for the current iteration."""
-    screenshots = save_screenshots()
+    """Save screenshots for the current iteration in the background."""
     screenshot_dir = os.path.join(iteration_dir, "evaluation_screenshots")
-    save_screenshots_to_path(screenshot_dir)
+    screenshots = capture_screenshots(output_paths=[SCREENSHOTS_PATH, screenshot_dir])
     for screenshot in screenshots:
         logger.debug(
-            f"Iteration {iteration + 1} evaluation screenshot saved: {screenshot}"
+            f"Iteration {iteration + 1} evaluation screenshot queued: {screenshot.name}"
         )
@@ -23,11 +23,11 @@ from llm_driven_modelling.llm.gpt_module import (
     analyze_screenshots_with_gpt4,
 )
 from llm_driven_modelling.utils.model_viewer_module import (
-    save_screenshots,
-    save_screenshots_to_path,
+    SCREENSHOTS_PATH,
+    capture_screenshots,
 )
 from llm_driven_modelling.llama_index_library.llama_index_material_library import (
-    query_material_documentation,
+    query_material_documentation_batch,
 )
 from llm_driven_modelling.core.model_generation_utils import update_blender_view
 
@@ -39,20 +39,20 @@ def query_material_docs(material_requirements):
     """
     Query material documentation based on material requirements.
 
+    The queries for all material types are retrieved in one batch.
+
     Args:
         material_requirements (dict): A dictionary of material types and their requirements.
 
     Returns:
         dict: A dictionary of material types and their corresponding documentation.
     """
-    material_docs = {}
-    for material_type in material_requirements.keys():
-        query = f"Material type: {material_type}"
-        results = query_material_documentation(
-            bpy.types.Scene.material_query_engine, query
-        )
-        material_docs[material_type] = results
-    return material_docs
+    material_types = list(material_requirements.keys())
+    queries = [f"Material type: {material_type}" for material_type in material_types]
+    results = query_material_documentation_batch(
+        bpy.types.Scene.material_retriever, queries
+    )
+    return dict(zip(material_types, results))
 
 
 def apply_materials(context, user_input, rewritten_input, scene_description, log_dir):
@@ -258,8 +258,7 @@ def generate_and_apply_materials(
     update_blender_view(context)
 
     # Save screenshots after applying materials
-    screenshots = save_screenshots()
     screenshot_dir = os.path.join(log_dir, "material_screenshots")
-    save_screenshots_to_path(screenshot_dir)
+    screenshots = capture_screenshots(output_paths=[SCREENSHOTS_PATH, screenshot_dir])
     for screenshot in screenshots:
-        logger.debug(f"Material application screenshot saved: {screenshot}")
+        logger.debug(f"Material application screenshot queued: {screenshot.name}")
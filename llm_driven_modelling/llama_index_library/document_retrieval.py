@@ -0,0 +1,373 @@
+# document_retrieval.py
+
+"""
+This module provides retrieval-only access to the Llama Index document libraries.
+It returns ranked nodes and the contents of their source files directly from a
+VectorIndexRetriever, without the LLM response synthesis step of a query engine.
+Several queries can be retrieved together: they are embedded in one request and searched
+with one batched query, by the NumPy store or by a single Chroma query call. Document contents are
+served from a size-bounded LRU cache that is invalidated when a file changes on disk.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from llama_index.core.retrievers import VectorIndexRetriever
+from llama_index.core.postprocessor import SimilarityPostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.vector_stores.chroma import ChromaVectorStore
+from llm_driven_modelling.llama_index_library.retrieval_memo import retrieval_memo
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+    query_chroma_batch,
+)
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Total number of characters kept by the document content cache
+DOCUMENT_CACHE_MAX_CHARS = 8 * 1024 * 1024
+
+
+class DocumentContentCache:
+    """Least-recently-used cache of document contents keyed by path and modification time."""
+
+    def __init__(self, max_chars=DOCUMENT_CACHE_MAX_CHARS):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_chars (int): The total number of characters to keep before evicting.
+        """
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        """
+        Get the contents of a file, reading it only if it is not cached or has changed.
+
+        Args:
+            file_path (str): The path to the document.
+
+        Returns:
+            str or None: The file contents, or None if the file does not exist.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self.invalidate(file_path)
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        with self._lock:
+            self._remove(file_path)
+            if len(content) <= self.max_chars:
+                self._entries[file_path] = (version, content)
+                self._size += len(content)
+                while self._size > self.max_chars:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return content
+
+    def _remove(self, file_path):
+        entry = self._entries.pop(file_path, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def invalidate(self, file_path=None):
+        """
+        Drop one cached file, or every cached file if no path is given.
+
+        Args:
+            file_path (str, optional): The path to drop.
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._size = 0
+            else:
+                self._remove(file_path)
+
+    def stats(self):
+        """
+        Get the cache hit and miss counters.
+
+        Returns:
+            dict: The number of hits, misses, cached files and cached characters.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "files": len(self._entries),
+                "chars": self._size,
+            }
+
+
+document_cache = DocumentContentCache()
+
+
+class DocumentRetriever:
+    """Ranked node retrieval over a vector index with a similarity cutoff."""
+
+    def __init__(
+        self, index, similarity_top_k=3, similarity_cutoff=0.65, library=None, memo=None
+    ):
+        """
+        Initialize the retriever.
+
+        Args:
+            index (VectorStoreIndex): The vector index to retrieve from.
+            similarity_top_k (int): The number of nodes to retrieve per query.
+            similarity_cutoff (float): Nodes scoring below this value are dropped.
+            library (str, optional): The library name; results are memoized if given.
+            memo (RetrievalMemo, optional): The memo to use instead of the shared one.
+        """
+        self.index = index
+        self.library = library
+        self.memo = memo if memo is not None else retrieval_memo
+        self.settings = (similarity_top_k, similarity_cutoff)
+        self.retriever = VectorIndexRetriever(
+            index=index, similarity_top_k=similarity_top_k
+        )
+        self.postprocessor = SimilarityPostprocessor(
+            similarity_cutoff=similarity_cutoff
+        )
+
+    def retrieve(self, query):
+        """
+        Retrieve the ranked nodes for a query.
+
+        Args:
+            query (str or QueryBundle): The query.
+
+        Returns:
+            list: NodeWithScore objects above the cutoff, best match first.
+        """
+        query_bundle = query if isinstance(query, QueryBundle) else QueryBundle(query)
+        if self.library is not None:
+            nodes = self.memo.get(self.library, query_bundle.query_str, self.settings)
+            if nodes is not None:
+                return nodes
+
+        nodes = self.retriever.retrieve(query_bundle)
+        nodes = self.postprocessor.postprocess_nodes(nodes, query_bundle=query_bundle)
+        if self.library is not None:
+            self.memo.put(self.library, query_bundle.query_str, self.settings, nodes)
+        return nodes
+
+    def embed_queries(self, queries):
+        """
+        Embed several queries, in a single request if the embedding model supports it.
+
+        Args:
+            queries (list): The query strings.
+
+        Returns:
+            list: One embedding per query, in the same order.
+        """
+        embed_model = get_vector_store_manager().embed_model
+        if hasattr(embed_model, "get_query_embedding_batch"):
+            return embed_model.get_query_embedding_batch(queries)
+        return [embed_model.get_query_embedding(query) for query in queries]
+
+    def retrieve_batch(self, queries):
+        """
+        Retrieve the ranked nodes for several queries at once.
+
+        Memoized queries are answered from the memo; only the others are embedded
+        and searched.
+
+        Args:
+            queries (list): The query strings.
+
+        Returns:
+            list: One list of NodeWithScore objects per query, best match first.
+        """
+        if self.library is None:
+            return self._search_batch(queries)
+
+        results = [
+            self.memo.get(self.library, query, self.settings) for query in queries
+        ]
+        missing = [i for i, nodes in enumerate(results) if nodes is None]
+        if missing:
+            # Search each distinct missing query only once
+            missing_queries = list(dict.fromkeys(queries[i] for i in missing))
+            searched = dict(zip(missing_queries, self._search_batch(missing_queries)))
+            for query, nodes in searched.items():
+                self.memo.put(self.library, query, self.settings, nodes)
+            for i in missing:
+                results[i] = searched[queries[i]]
+        return results
+
+    def _search_batch(self, queries):
+        if not queries:
+            return []
+        embeddings = self.embed_queries(queries)
+        query_bundles = [
+            QueryBundle(query, embedding=embedding)
+            for query, embedding in zip(queries, embeddings)
+        ]
+
+        vector_store = self.index.vector_store
+        top_k = self.retriever.similarity_top_k
+        query_results = None
+        if hasattr(vector_store, "query_batch"):
+            query_results = vector_store.query_batch(embeddings, top_k)
+        elif isinstance(vector_store, ChromaVectorStore):
+            query_results = query_chroma_batch(vector_store.client, embeddings, top_k)
+
+        if query_results is not None:
+            node_lists = [
+                self._build_nodes(query_result) for query_result in query_results
+            ]
+        else:
+            node_lists = [
+                self.retriever.retrieve(query_bundle) for query_bundle in query_bundles
+            ]
+
+        return [
+            self.postprocessor.postprocess_nodes(nodes, query_bundle=query_bundle)
+            for nodes, query_bundle in zip(node_lists, query_bundles)
+        ]
+
+    def _build_nodes(self, query_result):
+        """Pair the nodes of a vector store result with their similarity scores."""
+        nodes = query_result.nodes
+        if nodes is None:
+            # Stores that keep only embeddings return IDs into the index's docstore
+            nodes = self.index.docstore.get_nodes(query_result.ids)
+        similarities = query_result.similarities or [None] * len(nodes)
+        return [
+            NodeWithScore(node=node, score=score)
+            for node, score in zip(nodes, similarities)
+        ]
+
+
+def retrieve_nodes(source, query):
+    """
+    Retrieve ranked nodes from a DocumentRetriever or a RetrieverQueryEngine.
+
+    Both expose retrieve(QueryBundle), which runs retrieval and node postprocessing
+    without synthesizing a response.
+
+    Args:
+        source (DocumentRetriever or RetrieverQueryEngine): Where to retrieve from.
+        query (str): The query string.
+
+    Returns:
+        list: NodeWithScore objects above the cutoff, best match first.
+    """
+    return source.retrieve(QueryBundle(query))
+
+
+def retrieve_nodes_batch(source, queries):
+    """
+    Retrieve ranked nodes for several queries.
+
+    A DocumentRetriever embeds and searches the queries together; other sources
+    are queried one at a time.
+
+    Args:
+        source (DocumentRetriever or RetrieverQueryEngine): Where to retrieve from.
+        queries (list): The query strings.
+
+    Returns:
+        list: One list of NodeWithScore objects per query, best match first.
+    """
+    if hasattr(source, "retrieve_batch"):
+        return source.retrieve_batch(list(queries))
+    return [retrieve_nodes(source, query) for query in queries]
+
+
+def read_document(file_path):
+    """
+    Read the full contents of a document file, served from the shared cache.
+
+    Args:
+        file_path (str): The path to the document.
+
+    Returns:
+        str or None: The file contents, or None if the file does not exist.
+    """
+    if not file_path:
+        return None
+    return document_cache.get(file_path)
+
+
+def retrieve_file_contents(source, query, limit=None):
+    """
+    Retrieve the contents of the source files of the ranked nodes for a query.
+
+    Args:
+        source (DocumentRetriever or RetrieverQueryEngine): Where to retrieve from.
+        query (str): The query string.
+        limit (int, optional): The maximum number of files to return.
+
+    Returns:
+        list: The file contents, best match first.
+    """
+    nodes = retrieve_nodes(source, query)
+    if limit is not None:
+        nodes = nodes[:limit]
+
+    results = []
+    for node in nodes:
+        content = read_document(node.node.metadata.get("file_path"))
+        if content is not None:
+            results.append(content)
+    return results
+
+
+def retrieve_file_contents_batch(source, queries, limit=None, unique=True):
+    """
+    Retrieve the contents of the source files of the ranked nodes for several queries.
+
+    Args:
+        source (DocumentRetriever or RetrieverQueryEngine): Where to retrieve from.
+        queries (list): The query strings.
+        limit (int, optional): The maximum number of files to return per query.
+        unique (bool): Return each file only for the first query that retrieved it.
+
+    Returns:
+        list: One list of file contents per query, best match first.
+    """
+    contents_by_path = {}
+    returned_paths = set()
+    results = []
+    for nodes in retrieve_nodes_batch(source, queries):
+        if limit is not None:
+            nodes = nodes[:limit]
+
+        query_results = []
+        for node in nodes:
+            file_path = node.node.metadata.get("file_path")
+            if unique and file_path in returned_paths:
+                continue
+            if file_path not in contents_by_path:
+                contents_by_path[file_path] = read_document(file_path)
+            if contents_by_path[file_path] is not None:
+                query_results.append(contents_by_path[file_path])
+                returned_paths.add(file_path)
+        results.append(query_results)
+    return results
@@ -0,0 +1,287 @@
+# embedding_cache.py
+
+"""
+This module provides a persistent embedding cache shared by all document libraries.
+Embeddings are stored in SQLite, keyed by a hash of the embedding model name and the
+embedded text, so unchanged documents and repeated queries are never embedded twice.
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from array import array
+from typing import Any, List
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.embeddings.openai import OpenAIEmbedding
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(dotenv_path="D:/Tencent_Supernova/api/.env")
+api_key = os.getenv("OPENAI_API_KEY")
+
+EMBEDDING_CACHE_PATH = "./database/embedding_cache.sqlite3"
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+
+class EmbeddingCache:
+    """SQLite-backed store of embeddings keyed by content hash."""
+
+    def __init__(self, db_path=EMBEDDING_CACHE_PATH):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path (str): The path to the SQLite database file.
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(model_name, text):
+        """
+        Build the cache key for a piece of text.
+
+        Args:
+            model_name (str): The embedding model name.
+            text (str): The embedded text.
+
+        Returns:
+            str: The hex digest identifying the embedding.
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, model_name, texts):
+        """
+        Look up the embeddings for several texts.
+
+        Args:
+            model_name (str): The embedding model name.
+            texts (list): The texts to look up.
+
+        Returns:
+            list: One embedding (list of floats) or None per text.
+        """
+        keys = [self.make_key(model_name, text) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+
+            results = [found.get(key) for key in keys]
+            hit_count = sum(1 for result in results if result is not None)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, model_name, texts, embeddings):
+        """
+        Store the embeddings for several texts.
+
+        Args:
+            model_name (str): The embedding model name.
+            texts (list): The embedded texts.
+            embeddings (list): The embeddings, in the same order as texts.
+        """
+        rows = [
+            (
+                self.make_key(model_name, text),
+                model_name,
+                array("f", embedding).tobytes(),
+            )
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._connection.commit()
+
+    def stats(self):
+        """
+        Get the cache hit and miss counters.
+
+        Returns:
+            dict: The number of hits, misses and stored embeddings, and the hit rate.
+        """
+        with self._lock:
+            (size,) = self._connection.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": size,
+            }
+
+    def reset_stats(self):
+        """Reset the hit and miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+class CachedEmbedding(BaseEmbedding):
+    """Embedding model wrapper that serves repeated texts from an EmbeddingCache."""
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(
+        self, embed_model: BaseEmbedding, cache: EmbeddingCache, **kwargs: Any
+    ):
+        super().__init__(
+            model_name=embed_model.model_name,
+            embed_batch_size=embed_model.embed_batch_size,
+            **kwargs,
+        )
+        self._embed_model = embed_model
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        """The underlying embedding cache."""
+        return self._cache
+
+    def _embed_with_cache(self, texts: List[str], embed_misses) -> List[List[float]]:
+        embeddings = self._cache.get_many(self.model_name, texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            # Embed each distinct missing text only once
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+            new_embeddings = embed_misses(missing_texts)
+            self._cache.put_many(self.model_name, missing_texts, new_embeddings)
+            by_text = dict(zip(missing_texts, new_embeddings))
+            for i in missing:
+                embeddings[i] = by_text[texts[i]]
+        return embeddings
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed_with_cache(
+            [query],
+            lambda texts: [self._embed_model.get_query_embedding(t) for t in texts],
+        )[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def get_query_embedding_batch(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, sending all cache misses in a single batch request.
+
+        Args:
+            queries (list): The query strings.
+
+        Returns:
+            list: One embedding per query, in the same order.
+        """
+        # OpenAI embeds queries and documents with the same model for
+        # text-embedding-ada-002, so the batch text endpoint serves queries too
+        return self._embed_with_cache(
+            queries,
+            lambda texts: self._embed_model.get_text_embedding_batch(
+                texts, show_progress=False
+            ),
+        )
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed_with_cache(texts, self._embed_model.get_text_embedding_batch)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._get_text_embeddings(texts)
+
+
+_embedding_cache = None
+_embed_model = None
+_init_lock = threading.Lock()
+
+
+def get_embedding_cache():
+    """
+    Get the process-wide embedding cache.
+
+    Returns:
+        EmbeddingCache: The shared embedding cache.
+    """
+    global _embedding_cache
+    with _init_lock:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache()
+        return _embedding_cache
+
+
+def get_embed_model():
+    """
+    Get the shared, cached OpenAI embedding model used by all document libraries.
+
+    Returns:
+        CachedEmbedding: The cached embedding model.
+    """
+    global _embed_model
+    cache = get_embedding_cache()
+    with _init_lock:
+        if _embed_model is None:
+            _embed_model = CachedEmbedding(
+                OpenAIEmbedding(model=EMBEDDING_MODEL, api_key=api_key), cache
+            )
+        return _embed_model
+
+
+def get_embedding_cache_stats():
+    """
+    Get the hit and miss counters of the shared embedding cache.
+
+    Returns:
+        dict: The cache statistics.
+    """
+    stats = get_embedding_cache().stats()
+    logger.info(
+        f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['size']} stored embeddings"
+    )
+    return stats
@@ -0,0 +1,113 @@
+# lazy_resource.py
+
+"""
+This module provides a handle for resources that are expensive to create, such as the
+vector databases and their query engines. The resource is built on first use, or warmed
+in a background thread, and callers only block when they actually need it.
+"""
+
+import logging
+import threading
+import time
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+class LazyResource:
+    """
+    Lazily created resource that forwards attribute access to the created object.
+
+    Code that receives a LazyResource can use it like the resource itself, e.g.
+    handle.retrieve(query), and only waits if the resource is still being built.
+    """
+
+    def __init__(self, name, factory):
+        """
+        Initialize the handle without creating the resource.
+
+        Args:
+            name (str): A readable name used in log messages.
+            factory (callable): A function without arguments that creates the resource.
+        """
+        self._name = name
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._started = False
+        self._value = None
+        self._error = None
+
+    @property
+    def name(self):
+        """The readable name of the resource."""
+        return self._name
+
+    @property
+    def is_ready(self):
+        """Whether the resource has finished initializing (successfully or not)."""
+        return self._ready.is_set()
+
+    def _claim(self):
+        """Mark the resource as being built. Returns True for the caller that should build it."""
+        with self._lock:
+            if self._started:
+                return False
+            self._started = True
+            return True
+
+    def _load(self):
+        """Create the resource and record the outcome."""
+        start_time = time.perf_counter()
+        try:
+            self._value = self._factory()
+            logger.info(
+                f"{self._name} initialized in {time.perf_counter() - start_time:.2f}s."
+            )
+        except Exception as e:
+            self._error = e
+            logger.error(f"Error initializing {self._name}: {str(e)}")
+        finally:
+            self._ready.set()
+
+    def warm(self):
+        """Start creating the resource in a background thread, if not already started."""
+        if self._claim():
+            threading.Thread(
+                target=self._load, name=f"warm-{self._name}", daemon=True
+            ).start()
+
+    def get(self, timeout=None):
+        """
+        Get the resource, creating it on the calling thread if nobody has started yet.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a background initialization.
+
+        Returns:
+            object: The created resource.
+
+        Raises:
+            TimeoutError: If the resource is not ready within the timeout.
+            RuntimeError: If creating the resource failed.
+        """
+        if self._claim():
+            self._load()
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"{self._name} is not ready after {timeout} seconds")
+        if self._error is not None:
+            raise RuntimeError(f"{self._name} failed to initialize") from self._error
+        return self._value
+
+    def __getattr__(self, attribute):
+        # Only called for attributes not found on the handle itself
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+        return getattr(self.get(), attribute)
+
+    def __repr__(self):
+        state = "ready" if self.is_ready else "pending"
+        return f"<LazyResource {self._name} ({state})>"
@@ -11,16 +11,21 @@ import openai
 import bpy
 import os
 import logging
-import shutil
 import re
 from llama_index.core import Document, VectorStoreIndex, StorageContext
-from llama_index.vector_stores.chroma import ChromaVectorStore
-import chromadb
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.postprocessor import SimilarityPostprocessor
-from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.core.response_synthesizers import get_response_synthesizer
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
+from llm_driven_modelling.llama_index_library.lazy_resource import LazyResource
+from llm_driven_modelling.llama_index_library.document_retrieval import (
+    DocumentRetriever,
+    retrieve_file_contents,
+    retrieve_file_contents_batch,
+)
 from dotenv import load_dotenv
 from llm_driven_modelling.llm.LLM_common_utils import (
     execute_blender_command,
@@ -112,18 +117,13 @@ def create_component_index(documents):
     Returns:
         VectorStoreIndex: The created vector index.
     """
-    db_path = "./database/chroma_db_components"
-    if os.path.exists(db_path):
-        shutil.rmtree(db_path)
-        logger.info("Existing component database deleted.")
-
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("component_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+    manager = get_vector_store_manager()
+    manager.reset_collection("component")
+
+    vector_store = manager.get_vector_store("component")
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
-    embed_model = OpenAIEmbedding(model="text-embedding-ada-002", api_key=api_key)
     return VectorStoreIndex.from_documents(
-        documents, storage_context=storage_context, embed_model=embed_model
+        documents, storage_context=storage_context, embed_model=manager.embed_model
     )
 
 
@@ -148,24 +148,60 @@ def configure_component_query_engine(index):
     )
 
 
+def configure_component_retriever(index):
+    """
+    Configure the retrieval-only lookup for the component documentation.
+
+    Uses the same top-k and similarity cutoff as the query engine, but skips
+    response synthesis. Results are memoized in the shared retrieval memo.
+
+    Args:
+        index (VectorStoreIndex): The vector index for components.
+
+    Returns:
+        DocumentRetriever: The configured retriever.
+    """
+    return DocumentRetriever(
+        index, similarity_top_k=3, similarity_cutoff=0.65, library="component"
+    )
+
+
 def query_component_documentation(query_engine, query):
     """
-    Query the component documentation using the provided query engine.
+    Query the component documentation using the provided retriever or query engine.
+
+    Only retrieval and the similarity cutoff are run; no response is synthesized.
 
     Args:
-        query_engine (RetrieverQueryEngine): The query engine to use.
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
         query (str): The query string.
 
     Returns:
         list: A list of relevant component documentation.
     """
-    response = query_engine.query(query)
-    results = []
-    for node in response.source_nodes:
-        file_path = node.node.metadata.get("file_path")
-        if file_path and os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                results.append(f.read())
+    results = retrieve_file_contents(query_engine, query)
+    return results if results else ["No relevant component information found."]
+
+
+def query_component_documentation_batch(query_engine, queries):
+    """
+    Query the component documentation for several components at once.
+
+    The queries are embedded in one request and searched together, and a file
+    matched by several queries is returned only once.
+
+    Args:
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
+        queries (list): The query strings.
+
+    Returns:
+        list: The relevant component documentation, each file once.
+    """
+    results = [
+        content
+        for query_results in retrieve_file_contents_batch(query_engine, queries)
+        for content in query_results
+    ]
     return results if results else ["No relevant component information found."]
 
 
@@ -193,7 +229,7 @@ class COMPONENT_OT_query(Operator):
         props = context.scene.component_tool
         query = props.input_text
         results = query_component_documentation(
-            context.scene.component_query_engine, query
+            context.scene.component_retriever, query
         )
         for i, result in enumerate(results):
             print(f"Component Query Result {i+1}:", result)
@@ -215,7 +251,7 @@ class COMPONENT_OT_generate_component(Operator):
 
             # Query relevant documents using LlamaDB
             results = query_component_documentation(
-                context.scene.component_query_engine, query
+                context.scene.component_retriever, query
             )
             combined_results = "\n\n".join(results)
             logger.info(f"Component DB Query Results Length: {len(combined_results)}")
@@ -270,12 +306,28 @@ class COMPONENT_PT_panel(Panel):
         layout.operator("component.generate_component")
 
 
+def load_component_index():
+    """
+    Open the index that answers component queries, using the library's vector backend.
+
+    Returns:
+        VectorStoreIndex: The component vector index.
+    """
+    return get_vector_store_manager().get_search_index("component")
+
+
 def initialize_component_db():
-    """Initialize the component database and query engine."""
-    db_path = "./database/chroma_db_components"
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("component_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-    index = VectorStoreIndex.from_vector_store(vector_store)
-    bpy.types.Scene.component_query_engine = configure_component_query_engine(index)
-    logger.info("Component DB initialized successfully.")
+    """
+    Register lazy handles for the component retriever and query engine.
+
+    Nothing is opened here; the database is loaded on first use or when the
+    retriever is warmed with bpy.types.Scene.component_retriever.warm().
+    """
+    index = LazyResource("component index", load_component_index)
+    bpy.types.Scene.component_query_engine = LazyResource(
+        "component query engine", lambda: configure_component_query_engine(index.get())
+    )
+    bpy.types.Scene.component_retriever = LazyResource(
+        "component retriever", lambda: configure_component_retriever(index.get())
+    )
+    logger.info("Component DB registered for lazy initialization.")
@@ -11,16 +11,21 @@ import openai
 import bpy
 import os
 import logging
-import shutil
 import re
 from llama_index.core import Document, VectorStoreIndex, StorageContext
-from llama_index.vector_stores.chroma import ChromaVectorStore
-import chromadb
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.postprocessor import SimilarityPostprocessor
-from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.core.response_synthesizers import get_response_synthesizer
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
+from llm_driven_modelling.llama_index_library.lazy_resource import LazyResource
+from llm_driven_modelling.llama_index_library.document_retrieval import (
+    DocumentRetriever,
+    retrieve_file_contents,
+    retrieve_file_contents_batch,
+)
 from dotenv import load_dotenv
 from llm_driven_modelling.llm.LLM_common_utils import (
     execute_blender_command,
@@ -34,8 +39,8 @@ from llm_driven_modelling.llm.claude_module import generate_text_with_claude
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import StringProperty, PointerProperty, EnumProperty
 from llm_driven_modelling.utils.model_viewer_module import (
-    save_screenshots,
-    save_screenshots_to_path,
+    SCREENSHOTS_PATH,
+    capture_screenshots,
 )
 from llm_driven_modelling.utils.logger_module import setup_logger, log_context
 
@@ -116,18 +121,13 @@ def create_material_index(documents):
     Returns:
         VectorStoreIndex: The created vector index.
     """
-    db_path = "./database/chroma_db_materials"
-    if os.path.exists(db_path):
-        shutil.rmtree(db_path)
-        logger.info("Existing material database deleted.")
-
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("material_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+    manager = get_vector_store_manager()
+    manager.reset_collection("material")
+
+    vector_store = manager.get_vector_store("material")
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
-    embed_model = OpenAIEmbedding(model="text-embedding-ada-002", api_key=api_key)
     return VectorStoreIndex.from_documents(
-        documents, storage_context=storage_context, embed_model=embed_model
+        documents, storage_context=storage_context, embed_model=manager.embed_model
     )
 
 
@@ -152,27 +152,61 @@ def configure_material_query_engine(index):
     )
 
 
+def configure_material_retriever(index):
+    """
+    Configure the retrieval-only lookup for the material documentation.
+
+    Uses the same top-k and similarity cutoff as the query engine, but skips
+    response synthesis. Results are memoized in the shared retrieval memo.
+
+    Args:
+        index (VectorStoreIndex): The vector index for materials.
+
+    Returns:
+        DocumentRetriever: The configured retriever.
+    """
+    return DocumentRetriever(
+        index, similarity_top_k=3, similarity_cutoff=0.65, library="material"
+    )
+
+
 def query_material_documentation(query_engine, query):
     """
-    Query the material documentation using the provided query engine.
+    Query the material documentation using the provided retriever or query engine.
+
+    Only retrieval and the similarity cutoff are run; no response is synthesized.
 
     Args:
-        query_engine (RetrieverQueryEngine): The query engine to use.
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
         query (str): The query string.
 
     Returns:
         list: A list of relevant material documentation.
     """
-    response = query_engine.query(query)
-    results = []
-    for node in response.source_nodes:
-        file_path = node.node.metadata.get("file_path")
-        if file_path and os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                results.append(f.read())
+    results = retrieve_file_contents(query_engine, query)
     return results if results else ["No relevant material information found."]
 
 
+def query_material_documentation_batch(query_engine, queries):
+    """
+    Query the material documentation for several queries at once.
+
+    The queries are embedded in one request and searched together, and each
+    matched file is read only once.
+
+    Args:
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
+        queries (list): The query strings.
+
+    Returns:
+        list: One list of relevant material documentation per query.
+    """
+    return [
+        results if results else ["No relevant material information found."]
+        for results in retrieve_file_contents_batch(query_engine, queries, unique=False)
+    ]
+
+
 def sanitize_reference(response):
     """
     Extract JSON data from Claude's response, removing comments and non-JSON content.
@@ -218,9 +252,7 @@ class MATERIAL_OT_query(Operator):
     def execute(self, context):
         props = context.scene.material_tool
         query = props.input_text
-        results = query_material_documentation(
-            context.scene.material_query_engine, query
-        )
+        results = query_material_documentation(context.scene.material_retriever, query)
         for i, result in enumerate(results):
             print(f"Material Query Result {i+1}:", result)
             logger.info(f"Material Query Result {i+1} Length: {len(result)}")
@@ -321,7 +353,7 @@ class MATERIAL_OT_generate_material(Operator):
         for obj_name, material_type in material_requirements.items():
             query = f"Material type: {material_type}"
             results = query_material_documentation(
-                bpy.types.Scene.material_query_engine, query
+                bpy.types.Scene.material_retriever, query
             )
 
             # Filter and add only unique documents
@@ -433,11 +465,12 @@ class MATERIAL_OT_generate_material(Operator):
         self.update_blender_view(context)
 
         # Save screenshots after applying materials
-        screenshots = save_screenshots()
         screenshot_dir = os.path.join(log_dir, "material_screenshots")
-        save_screenshots_to_path(screenshot_dir)
+        screenshots = capture_screenshots(
+            output_paths=[SCREENSHOTS_PATH, screenshot_dir]
+        )
         for screenshot in screenshots:
-            logger.debug(f"Material application screenshot saved: {screenshot}")
+            logger.debug(f"Material application screenshot queued: {screenshot.name}")
 
     def update_blender_view(self, context):
         """
@@ -470,12 +503,28 @@ class MATERIAL_PT_panel(Panel):
         layout.operator("material.apply_materials")
 
 
+def load_material_index():
+    """
+    Open the index that answers material queries, using the library's vector backend.
+
+    Returns:
+        VectorStoreIndex: The material vector index.
+    """
+    return get_vector_store_manager().get_search_index("material")
+
+
 def initialize_material_db():
-    """Initialize the material database and query engine."""
-    db_path = "./database/chroma_db_materials"
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("material_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-    index = VectorStoreIndex.from_vector_store(vector_store)
-    bpy.types.Scene.material_query_engine = configure_material_query_engine(index)
-    logger.info("Material DB initialized successfully.")
+    """
+    Register lazy handles for the material retriever and query engine.
+
+    Nothing is opened here; the database is loaded on first use or when the
+    retriever is warmed with bpy.types.Scene.material_retriever.warm().
+    """
+    index = LazyResource("material index", load_material_index)
+    bpy.types.Scene.material_query_engine = LazyResource(
+        "material query engine", lambda: configure_material_query_engine(index.get())
+    )
+    bpy.types.Scene.material_retriever = LazyResource(
+        "material retriever", lambda: configure_material_retriever(index.get())
+    )
+    logger.info("Material DB registered for lazy initialization.")
@@ -13,19 +13,23 @@ import os
 import logging
 import requests
 import time
-import shutil
 import re
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import StringProperty, PointerProperty, EnumProperty
 from llama_index.core import Document, VectorStoreIndex, StorageContext
-from llama_index.vector_stores.chroma import ChromaVectorStore
-import chromadb
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.postprocessor import SimilarityPostprocessor
-from llama_index.embeddings.openai import OpenAIEmbedding
 from dotenv import load_dotenv
 from llama_index.core.response_synthesizers import get_response_synthesizer
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
+from llm_driven_modelling.llama_index_library.lazy_resource import LazyResource
+from llm_driven_modelling.llama_index_library.document_retrieval import (
+    DocumentRetriever,
+    retrieve_file_contents,
+)
 from llm_driven_modelling.llm.LLM_common_utils import (
     execute_blender_command,
     initialize_conversation,
@@ -123,18 +127,13 @@ def create_generation_index(documents):
     Returns:
         VectorStoreIndex: The created vector index.
     """
-    db_path = "./database/chroma_db_generation"
-    if os.path.exists(db_path):
-        shutil.rmtree(db_path)
-        logger.info("Existing generation database deleted.")
-
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("generation_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+    manager = get_vector_store_manager()
+    manager.reset_collection("generation")
+
+    vector_store = manager.get_vector_store("generation")
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
-    embed_model = OpenAIEmbedding(model="text-embedding-ada-002", api_key=api_key)
     return VectorStoreIndex.from_documents(
-        documents, storage_context=storage_context, embed_model=embed_model
+        documents, storage_context=storage_context, embed_model=manager.embed_model
     )
 
 
@@ -159,23 +158,40 @@ def configure_generation_query_engine(index):
     )
 
 
+def configure_generation_retriever(index):
+    """
+    Configure the retrieval-only lookup for the generation documentation.
+
+    Uses the same top-k and similarity cutoff as the query engine, but skips
+    response synthesis. Results are memoized in the shared retrieval memo.
+
+    Args:
+        index (VectorStoreIndex): The vector index for generation documents.
+
+    Returns:
+        DocumentRetriever: The configured retriever.
+    """
+    return DocumentRetriever(
+        index, similarity_top_k=1, similarity_cutoff=0.6, library="generation"
+    )
+
+
 def query_generation_documentation(query_engine, query):
     """
-    Query the generation documentation using the provided query engine.
+    Query the generation documentation using the provided retriever or query engine.
+
+    Only retrieval and the similarity cutoff are run; no response is synthesized.
 
     Args:
-        query_engine (RetrieverQueryEngine): The query engine to use.
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
         query (str): The query string.
 
     Returns:
         str: The relevant generation information or a default message if not found.
     """
-    response = query_engine.query(query)
-    if response.source_nodes:
-        file_path = response.source_nodes[0].node.metadata.get("file_path")
-        if file_path and os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+    results = retrieve_file_contents(query_engine, query, limit=1)
+    if results:
+        return results[0]
     return "No relevant generation information found."
 
 
@@ -203,7 +219,7 @@ class GENERATION_OT_query(Operator):
         props = context.scene.generation_tool
         query = props.input_text
         result = query_generation_documentation(
-            context.scene.generation_query_engine, query
+            context.scene.generation_retriever, query
         )
         print("Generation Query Result:", result)
         logger.info(f"Generation Query Result Length: {len(result)}")
@@ -224,7 +240,7 @@ class GENERATION_OT_generate_model(Operator):
 
             # Query relevant documents using LlamaDB
             result = query_generation_documentation(
-                context.scene.generation_query_engine, query
+                context.scene.generation_retriever, query
             )
             logger.info(f"Generation DB Query Result {result}")
             logger.info(f"Generation DB Query Result Length: {len(result)}")
@@ -279,12 +295,29 @@ class GENERATION_PT_panel(Panel):
         layout.operator("generation.generate_model")
 
 
+def load_generation_index():
+    """
+    Open the index that answers generation queries, using the library's vector backend.
+
+    Returns:
+        VectorStoreIndex: The generation vector index.
+    """
+    return get_vector_store_manager().get_search_index("generation")
+
+
 def initialize_generation_db():
-    """Initialize the generation database and query engine."""
-    db_path = "./database/chroma_db_generation"
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("generation_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-    index = VectorStoreIndex.from_vector_store(vector_store)
-    bpy.types.Scene.generation_query_engine = configure_generation_query_engine(index)
-    logger.info("Generation DB initialized successfully.")
+    """
+    Register lazy handles for the generation retriever and query engine.
+
+    Nothing is opened here; the database is loaded on first use or when the
+    retriever is warmed with bpy.types.Scene.generation_retriever.warm().
+    """
+    index = LazyResource("generation index", load_generation_index)
+    bpy.types.Scene.generation_query_engine = LazyResource(
+        "generation query engine",
+        lambda: configure_generation_query_engine(index.get()),
+    )
+    bpy.types.Scene.generation_retriever = LazyResource(
+        "generation retriever", lambda: configure_generation_retriever(index.get())
+    )
+    logger.info("Generation DB registered for lazy initialization.")
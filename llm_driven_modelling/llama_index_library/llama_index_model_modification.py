@@ -13,19 +13,23 @@ import os
 import logging
 import requests
 import time
-import shutil
 import re
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import StringProperty, PointerProperty, EnumProperty
 from llama_index.core import Document, VectorStoreIndex, StorageContext
-from llama_index.vector_stores.chroma import ChromaVectorStore
-import chromadb
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.postprocessor import SimilarityPostprocessor
-from llama_index.embeddings.openai import OpenAIEmbedding
 from dotenv import load_dotenv
 from llama_index.core.response_synthesizers import get_response_synthesizer
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
+from llm_driven_modelling.llama_index_library.lazy_resource import LazyResource
+from llm_driven_modelling.llama_index_library.document_retrieval import (
+    DocumentRetriever,
+    retrieve_file_contents,
+)
 from llm_driven_modelling.llm.LLM_common_utils import (
     execute_blender_command,
     initialize_conversation,
@@ -131,18 +135,13 @@ def create_modification_index(documents):
     Returns:
         VectorStoreIndex: The created vector index.
     """
-    db_path = "./database/chroma_db_modification"
-    if os.path.exists(db_path):
-        shutil.rmtree(db_path)
-        logger.info("Existing modification database deleted.")
-
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("modification_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+    manager = get_vector_store_manager()
+    manager.reset_collection("modification")
+
+    vector_store = manager.get_vector_store("modification")
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
-    embed_model = OpenAIEmbedding(model="text-embedding-ada-002", api_key=api_key)
     return VectorStoreIndex.from_documents(
-        documents, storage_context=storage_context, embed_model=embed_model
+        documents, storage_context=storage_context, embed_model=manager.embed_model
     )
 
 
@@ -167,24 +166,38 @@ def configure_modification_query_engine(index):
     )
 
 
+def configure_modification_retriever(index):
+    """
+    Configure the retrieval-only lookup for the modification documentation.
+
+    Uses the same top-k and similarity cutoff as the query engine, but skips
+    response synthesis. Results are memoized in the shared retrieval memo.
+
+    Args:
+        index (VectorStoreIndex): The vector index for modification documents.
+
+    Returns:
+        DocumentRetriever: The configured retriever.
+    """
+    return DocumentRetriever(
+        index, similarity_top_k=1, similarity_cutoff=0.6, library="modification"
+    )
+
+
 def query_modification_documentation(query_engine, query):
     """
-    Query the modification documentation using the provided query engine.
+    Query the modification documentation using the provided retriever or query engine.
+
+    Only retrieval and the similarity cutoff are run; no response is synthesized.
 
     Args:
-        query_engine (RetrieverQueryEngine): The query engine to use.
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
         query (str): The query string.
 
     Returns:
         list: A list of relevant modification information or a default message if not found.
     """
-    response = query_engine.query(query)
-    results = []
-    if response.source_nodes:
-        file_path = response.source_nodes[0].node.metadata.get("file_path")
-        if file_path and os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                results.append(f.read())
+    results = retrieve_file_contents(query_engine, query, limit=1)
     return results if results else ["No relevant modification information found."]
 
 
@@ -212,7 +225,7 @@ class MODIFICATION_OT_query(Operator):
         props = context.scene.modification_tool
         query = props.input_text
         result = query_modification_documentation(
-            context.scene.modification_query_engine, query
+            context.scene.modification_retriever, query
         )
         print("Modification Query Result:", result)
         logger.info(f"Modification Query Result Length: {len(result)}")
@@ -249,7 +262,7 @@ class MODIFICATION_OT_query_with_screenshots(Operator):
             logger.info(f"{model_choice} Response: {description}")
 
             result = query_modification_documentation(
-                context.scene.modification_query_engine, description
+                context.scene.modification_retriever, description
             )
             print("Query with Screenshots Result:", result)
             logger.info(f"Query with Screenshots Result Length: {len(result)}")
@@ -293,7 +306,7 @@ class MODIFICATION_OT_query_and_generate(Operator):
             logger.info(f"{model_choice} Image Analysis: {description}")
 
             result = query_modification_documentation(
-                context.scene.modification_query_engine, description
+                context.scene.modification_retriever, description
             )
             logger.info(f"Modification Query Result: {result}")
             logger.info(f"Modification Query Result Length: {len(result)}")
@@ -357,14 +370,29 @@ class MODIFICATION_PT_panel(Panel):
         layout.operator("modification.query_and_generate")
 
 
+def load_modification_index():
+    """
+    Open the index that answers modification queries, using the library's vector backend.
+
+    Returns:
+        VectorStoreIndex: The modification vector index.
+    """
+    return get_vector_store_manager().get_search_index("modification")
+
+
 def initialize_modification_db():
-    """Initialize the modification database and query engine."""
-    db_path = "./database/chroma_db_modification"
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("modification_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-    index = VectorStoreIndex.from_vector_store(vector_store)
-    bpy.types.Scene.modification_query_engine = configure_modification_query_engine(
-        index
+    """
+    Register lazy handles for the modification retriever and query engine.
+
+    Nothing is opened here; the database is loaded on first use or when the
+    retriever is warmed with bpy.types.Scene.modification_retriever.warm().
+    """
+    index = LazyResource("modification index", load_modification_index)
+    bpy.types.Scene.modification_query_engine = LazyResource(
+        "modification query engine",
+        lambda: configure_modification_query_engine(index.get()),
+    )
+    bpy.types.Scene.modification_retriever = LazyResource(
+        "modification retriever", lambda: configure_modification_retriever(index.get())
     )
-    logger.info("Modification DB initialized successfully.")
+    logger.info("Modification DB registered for lazy initialization.")
@@ -11,16 +11,20 @@ import openai
 import bpy
 import os
 import logging
-import shutil
 import re
 from llama_index.core import Document, VectorStoreIndex, StorageContext
-from llama_index.vector_stores.chroma import ChromaVectorStore
-import chromadb
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.postprocessor import SimilarityPostprocessor
-from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.core.response_synthesizers import get_response_synthesizer
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
+from llm_driven_modelling.llama_index_library.lazy_resource import LazyResource
+from llm_driven_modelling.llama_index_library.document_retrieval import (
+    DocumentRetriever,
+    retrieve_file_contents,
+)
 from dotenv import load_dotenv
 from llm_driven_modelling.llm.LLM_common_utils import (
     execute_blender_command,
@@ -34,8 +38,8 @@ from llm_driven_modelling.llm.claude_module import generate_text_with_claude
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import StringProperty, PointerProperty, EnumProperty
 from llm_driven_modelling.utils.model_viewer_module import (
-    save_screenshots,
-    save_screenshots_to_path,
+    SCREENSHOTS_PATH,
+    capture_screenshots,
 )
 from llm_driven_modelling.utils.logger_module import setup_logger, log_context
 
@@ -116,18 +120,13 @@ def create_style_index(documents):
     Returns:
         VectorStoreIndex: The created vector index.
     """
-    db_path = "./database/chroma_db_styles"
-    if os.path.exists(db_path):
-        shutil.rmtree(db_path)
-        logger.info("Existing style database deleted.")
-
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("style_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+    manager = get_vector_store_manager()
+    manager.reset_collection("style")
+
+    vector_store = manager.get_vector_store("style")
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
-    embed_model = OpenAIEmbedding(model="text-embedding-ada-002", api_key=api_key)
     return VectorStoreIndex.from_documents(
-        documents, storage_context=storage_context, embed_model=embed_model
+        documents, storage_context=storage_context, embed_model=manager.embed_model
     )
 
 
@@ -152,24 +151,38 @@ def configure_style_query_engine(index):
     )
 
 
+def configure_style_retriever(index):
+    """
+    Configure the retrieval-only lookup for the style documentation.
+
+    Uses the same top-k and similarity cutoff as the query engine, but skips
+    response synthesis. Results are memoized in the shared retrieval memo.
+
+    Args:
+        index (VectorStoreIndex): The vector index for styles.
+
+    Returns:
+        DocumentRetriever: The configured retriever.
+    """
+    return DocumentRetriever(
+        index, similarity_top_k=3, similarity_cutoff=0.65, library="style"
+    )
+
+
 def query_style_documentation(query_engine, query):
     """
-    Query the style documentation using the provided query engine.
+    Query the style documentation using the provided retriever or query engine.
+
+    Only retrieval and the similarity cutoff are run; no response is synthesized.
 
     Args:
-        query_engine (RetrieverQueryEngine): The query engine to use.
+        query_engine (DocumentRetriever or RetrieverQueryEngine): The retriever to use.
         query (str): The query string.
 
     Returns:
         list: A list of relevant style documentation.
     """
-    response = query_engine.query(query)
-    results = []
-    for node in response.source_nodes:
-        file_path = node.node.metadata.get("file_path")
-        if file_path and os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                results.append(f.read())
+    results = retrieve_file_contents(query_engine, query)
     return results if results else ["No relevant style information found."]
 
 
@@ -196,7 +209,7 @@ class STYLE_OT_query(Operator):
     def execute(self, context):
         props = context.scene.style_tool
         query = props.input_text
-        results = query_style_documentation(context.scene.style_query_engine, query)
+        results = query_style_documentation(context.scene.style_retriever, query)
         for i, result in enumerate(results):
             print(f"Style Query Result {i+1}:", result)
             logger.info(f"Style Query Result {i+1} Length: {len(result)}")
@@ -222,7 +235,7 @@ class STYLE_OT_apply_style(Operator):
 
                 # Query relevant style documentation
                 style_docs = query_style_documentation(
-                    context.scene.style_query_engine, query
+                    context.scene.style_retriever, query
                 )
 
                 # Generate and apply style
@@ -315,11 +328,12 @@ class STYLE_OT_apply_style(Operator):
         bpy.context.view_layer.update()
 
         # Save screenshots after applying style
-        screenshots = save_screenshots()
         screenshot_dir = os.path.join(log_dir, "style_screenshots")
-        save_screenshots_to_path(screenshot_dir)
+        screenshots = capture_screenshots(
+            output_paths=[SCREENSHOTS_PATH, screenshot_dir]
+        )
         for screenshot in screenshots:
-            logger.debug(f"Style application screenshot saved: {screenshot}")
+            logger.debug(f"Style application screenshot queued: {screenshot.name}")
 
 
 class STYLE_PT_panel(Panel):
@@ -341,12 +355,28 @@ class STYLE_PT_panel(Panel):
         layout.operator("style.apply_style")
 
 
+def load_style_index():
+    """
+    Open the index that answers style queries, using the library's vector backend.
+
+    Returns:
+        VectorStoreIndex: The style vector index.
+    """
+    return get_vector_store_manager().get_search_index("style")
+
+
 def initialize_style_db():
-    """Initialize the style database and query engine."""
-    db_path = "./database/chroma_db_styles"
-    db = chromadb.PersistentClient(path=db_path)
-    chroma_collection = db.get_or_create_collection("style_index")
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-    index = VectorStoreIndex.from_vector_store(vector_store)
-    bpy.types.Scene.style_query_engine = configure_style_query_engine(index)
-    logger.info("Style DB initialized successfully.")
+    """
+    Register lazy handles for the style retriever and query engine.
+
+    Nothing is opened here; the database is loaded on first use or when the
+    retriever is warmed with bpy.types.Scene.style_retriever.warm().
+    """
+    index = LazyResource("style index", load_style_index)
+    bpy.types.Scene.style_query_engine = LazyResource(
+        "style query engine", lambda: configure_style_query_engine(index.get())
+    )
+    bpy.types.Scene.style_retriever = LazyResource(
+        "style retriever", lambda: configure_style_retriever(index.get())
+    )
+    logger.info("Style DB registered for lazy initialization.")
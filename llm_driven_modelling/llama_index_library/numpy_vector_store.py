@@ -0,0 +1,318 @@
+# numpy_vector_store.py
+
+"""
+This module provides an in-memory vector store for the small document libraries.
+All embeddings of a library are kept in one contiguous float32 NumPy matrix, memory-mapped
+from disk, and top-k queries, one or a whole batch, are answered with a single vectorized
+matrix product.
+Scores are computed exactly as the Chroma store reports them, so the similarity cutoffs
+configured for the retrievers keep their meaning.
+"""
+
+import os
+import json
+import logging
+from typing import Any, List, Optional
+import numpy as np
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode, TextNode
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+from llama_index.core.vector_stores.utils import (
+    metadata_dict_to_node,
+    node_to_metadata_dict,
+)
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def build_node(node_id, text, metadata):
+    """
+    Rebuild a node from an entry as Chroma stores it.
+
+    Args:
+        node_id (str): The node ID.
+        text (str): The node text.
+        metadata (dict): The flat metadata dict, including the serialized node.
+
+    Returns:
+        BaseNode: The node.
+    """
+    try:
+        node = metadata_dict_to_node(metadata)
+        node.set_content(text)
+    except Exception:
+        node = TextNode(text=text, id_=node_id, metadata=metadata)
+    return node
+
+
+class NumpyVectorStore(BasePydanticVectorStore):
+    """
+    Vector store holding every embedding in a single float32 matrix.
+
+    Similarity is exp(-d), where d is the squared L2 distance between the query and
+    the stored embedding. This is the score Chroma's default "l2" space produces.
+    """
+
+    stores_text: bool = True
+    flat_metadata: bool = True
+
+    _ids: List[str] = PrivateAttr()
+    _texts: List[str] = PrivateAttr()
+    _metadatas: List[dict] = PrivateAttr()
+    _embeddings: Any = PrivateAttr()
+    _squared_norms: Any = PrivateAttr()
+    _source: Optional[dict] = PrivateAttr(default=None)
+
+    def __init__(
+        self, ids=None, texts=None, metadatas=None, embeddings=None, source=None
+    ):
+        """
+        Initialize the store from parallel lists of entries.
+
+        Args:
+            ids (list, optional): The node IDs.
+            texts (list, optional): The node texts.
+            metadatas (list, optional): The flat node metadata dicts, as stored by Chroma.
+            embeddings (array-like, optional): The embedding matrix, one row per node.
+            source (dict, optional): What the entries were exported from, stored with
+                the snapshot so a stale one can be detected.
+        """
+        super().__init__()
+        self._ids = list(ids or [])
+        self._texts = list(texts or [])
+        self._metadatas = list(metadatas or [])
+        self._source = source
+        self._set_embeddings(embeddings)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "NumpyVectorStore"
+
+    @property
+    def client(self) -> Any:
+        """The embedding matrix."""
+        return self._embeddings
+
+    @property
+    def source(self) -> Optional[dict]:
+        """What the entries were exported from, or None if unknown."""
+        return self._source
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _set_embeddings(self, embeddings):
+        if embeddings is None or len(embeddings) == 0:
+            self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        else:
+            self._embeddings = np.asarray(embeddings, dtype=np.float32)
+        # Row norms are computed once so each query needs a single product
+        self._squared_norms = np.einsum(
+            "ij,ij->i", self._embeddings, self._embeddings, dtype=np.float32
+        )
+
+    def _build_node(self, position):
+        return build_node(
+            self._ids[position], self._texts[position], self._metadatas[position]
+        )
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        """
+        Add nodes with embeddings to the store.
+
+        Args:
+            nodes (list): The nodes to add.
+
+        Returns:
+            list: The IDs of the added nodes.
+        """
+        if not nodes:
+            return []
+        new_embeddings = np.asarray(
+            [node.get_embedding() for node in nodes], dtype=np.float32
+        )
+        for node in nodes:
+            self._ids.append(node.node_id)
+            self._texts.append(node.get_content())
+            self._metadatas.append(
+                node_to_metadata_dict(
+                    node, remove_text=True, flat_metadata=self.flat_metadata
+                )
+            )
+        if len(self._embeddings) == 0:
+            self._set_embeddings(new_embeddings)
+        else:
+            self._set_embeddings(np.vstack([self._embeddings, new_embeddings]))
+        return [node.node_id for node in nodes]
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """
+        Delete all nodes of a source document.
+
+        Args:
+            ref_doc_id (str): The ID of the source document.
+        """
+        keep = [
+            i
+            for i, metadata in enumerate(self._metadatas)
+            if metadata.get("document_id") != ref_doc_id
+            and metadata.get("ref_doc_id") != ref_doc_id
+        ]
+        if len(keep) == len(self._ids):
+            return
+        self._ids = [self._ids[i] for i in keep]
+        self._texts = [self._texts[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._set_embeddings(self._embeddings[keep] if keep else None)
+
+    def clear(self) -> None:
+        """Remove every node from the store."""
+        self._ids, self._texts, self._metadatas = [], [], []
+        self._set_embeddings(None)
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """
+        Find the stored nodes closest to the query embedding.
+
+        Args:
+            query (VectorStoreQuery): The query with its embedding and similarity_top_k.
+
+        Returns:
+            VectorStoreQueryResult: The top nodes, their similarities and IDs, best first.
+        """
+        if query.filters is not None:
+            raise ValueError("Metadata filters are not supported by NumpyVectorStore")
+        if query.query_embedding is None:
+            raise ValueError("NumpyVectorStore requires a query embedding")
+        return self.query_batch([query.query_embedding], query.similarity_top_k)[0]
+
+    def query_batch(self, query_embeddings, similarity_top_k):
+        """
+        Find the closest stored nodes for several query embeddings with one matrix product.
+
+        Args:
+            query_embeddings (list): The query embeddings.
+            similarity_top_k (int): The number of nodes to return per query.
+
+        Returns:
+            list: One VectorStoreQueryResult per query, in the same order.
+        """
+        if len(self._ids) == 0:
+            return [
+                VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+                for _ in query_embeddings
+            ]
+
+        query_matrix = np.asarray(query_embeddings, dtype=np.float32)
+        # |q - v|^2 = |q|^2 + |v|^2 - 2 q.v for every query and stored row at once
+        distances = (
+            np.einsum("ij,ij->i", query_matrix, query_matrix)[:, None]
+            + self._squared_norms[None, :]
+            - 2.0 * (query_matrix @ self._embeddings.T)
+        )
+        np.maximum(distances, 0.0, out=distances)
+
+        top_k = min(similarity_top_k, len(self._ids))
+        if top_k < len(self._ids):
+            candidates = np.argpartition(distances, top_k - 1, axis=1)[:, :top_k]
+        else:
+            candidates = np.tile(np.arange(len(self._ids)), (len(query_matrix), 1))
+        candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1, kind="stable")
+        ranked = np.take_along_axis(candidates, order, axis=1)
+        similarities = np.exp(-np.take_along_axis(candidate_distances, order, axis=1))
+
+        return [
+            VectorStoreQueryResult(
+                nodes=[self._build_node(i) for i in row],
+                similarities=[float(score) for score in scores],
+                ids=[self._ids[i] for i in row],
+            )
+            for row, scores in zip(ranked, similarities)
+        ]
+
+    def persist(self, persist_path: str, fs: Optional[Any] = None) -> None:
+        """
+        Write the store to disk as a .npy matrix and a .json node sidecar.
+
+        Args:
+            persist_path (str): The snapshot path without extension.
+        """
+        directory = os.path.dirname(persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        matrix_path, sidecar_path = persist_path + ".npy", persist_path + ".json"
+
+        # Write to temporary files first so readers never see a half-written snapshot
+        with open(matrix_path + ".tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(self._embeddings, dtype=np.float32))
+        with open(sidecar_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ids": self._ids,
+                    "texts": self._texts,
+                    "metadatas": self._metadatas,
+                    "source": self._source,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(matrix_path + ".tmp", matrix_path)
+        os.replace(sidecar_path + ".tmp", sidecar_path)
+
+    @classmethod
+    def from_persist_path(cls, persist_path: str) -> "NumpyVectorStore":
+        """
+        Load a store written by persist, memory-mapping the embedding matrix.
+
+        Args:
+            persist_path (str): The snapshot path without extension.
+
+        Returns:
+            NumpyVectorStore: The loaded store.
+        """
+        matrix_path, sidecar_path = persist_path + ".npy", persist_path + ".json"
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        embeddings = np.load(matrix_path, mmap_mode="r")
+        if len(embeddings) != len(sidecar["ids"]):
+            raise ValueError(f"Snapshot {persist_path} is inconsistent")
+        return cls(
+            ids=sidecar["ids"],
+            texts=sidecar["texts"],
+            metadatas=sidecar["metadatas"],
+            embeddings=embeddings if len(embeddings) else None,
+            source=sidecar.get("source"),
+        )
+
+    @classmethod
+    def from_chroma_collection(cls, collection, source=None) -> "NumpyVectorStore":
+        """
+        Copy every entry of a Chroma collection into a new store.
+
+        Args:
+            collection (chromadb.Collection): The collection to copy.
+            source (dict, optional): What the entries were exported from.
+
+        Returns:
+            NumpyVectorStore: The store holding the same nodes and embeddings.
+        """
+        result = collection.get(include=["embeddings", "documents", "metadatas"])
+        embeddings = result["embeddings"]
+        return cls(
+            ids=result["ids"],
+            texts=result["documents"],
+            metadatas=result["metadatas"],
+            embeddings=(
+                embeddings if embeddings is not None and len(embeddings) else None
+            ),
+            source=source,
+        )
@@ -0,0 +1,249 @@
+# retrieval_memo.py
+
+"""
+This module provides a memo of retrieval results for the document libraries.
+Results are keyed by library, retrieval settings and normalized query, so an identical lookup
+skips both the embedding request and the vector search. Entries expire after a TTL and are
+discarded when the library's index changes. The memo can be kept on disk between runs.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from llama_index.core.schema import NodeWithScore, TextNode
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Seconds an entry stays valid
+RETRIEVAL_MEMO_TTL = 24 * 60 * 60
+# File the memo is persisted to between runs; None keeps it for a single run only
+RETRIEVAL_MEMO_PATH = "./database/retrieval_memo.json"
+
+
+def normalize_query(query):
+    """
+    Normalize a query so trivially different spellings share a memo entry.
+
+    Args:
+        query (str): The query string.
+
+    Returns:
+        str: The lower-cased query with collapsed whitespace.
+    """
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def get_index_version(library):
+    """
+    Get a version string for a library's index, taken from its update manifest.
+
+    The version is the hash of the manifest content, so it survives updates that
+    change nothing and changes whenever the indexed documents do.
+
+    Args:
+        library (str): The library name.
+
+    Returns:
+        str: The index version.
+    """
+    return get_vector_store_manager().get_manifest_hash(library) or "none"
+
+
+class RetrievalMemo:
+    """Memo of ranked retrieval results with TTL and index version invalidation."""
+
+    def __init__(self, ttl=RETRIEVAL_MEMO_TTL, persist_path=RETRIEVAL_MEMO_PATH):
+        """
+        Initialize the memo.
+
+        Args:
+            ttl (float): Seconds an entry stays valid.
+            persist_path (str, optional): The JSON file to persist the memo to.
+        """
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._versions = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(library, query, settings):
+        """
+        Build the memo key of a lookup.
+
+        Args:
+            library (str): The library name.
+            query (str): The query string.
+            settings (tuple): The retrieval settings that affect the result.
+
+        Returns:
+            str: The memo key.
+        """
+        return json.dumps([library, list(settings), normalize_query(query)])
+
+    def _get_version(self, library):
+        # Versions are looked up once per run, not on every retrieval
+        if library not in self._versions:
+            self._versions[library] = get_index_version(library)
+        return self._versions[library]
+
+    def get(self, library, query, settings):
+        """
+        Look up the memoized results of a retrieval.
+
+        Args:
+            library (str): The library name.
+            query (str): The query string.
+            settings (tuple): The retrieval settings that affect the result.
+
+        Returns:
+            list or None: NodeWithScore objects, best match first, or None on a miss.
+        """
+        key = self.make_key(library, query, settings)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is None
+                or entry["version"] != self._get_version(library)
+                or time.time() - entry["time"] > self.ttl
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [
+                NodeWithScore(
+                    node=TextNode(
+                        id_=result["id"],
+                        text=result["text"],
+                        metadata=result["metadata"],
+                    ),
+                    score=result["score"],
+                )
+                for result in entry["results"]
+            ]
+
+    def put(self, library, query, settings, nodes):
+        """
+        Memoize the results of a retrieval.
+
+        Args:
+            library (str): The library name.
+            query (str): The query string.
+            settings (tuple): The retrieval settings that affect the result.
+            nodes (list): NodeWithScore objects, best match first.
+        """
+        key = self.make_key(library, query, settings)
+        results = [
+            {
+                "id": node.node.node_id,
+                "text": node.node.get_content(),
+                "metadata": node.node.metadata,
+                "score": node.score,
+            }
+            for node in nodes
+        ]
+        with self._lock:
+            self._entries[key] = {
+                "version": self._get_version(library),
+                "time": time.time(),
+                "results": results,
+            }
+            self._dirty = True
+
+    def clear(self):
+        """Drop every memoized result."""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def start_run(self):
+        """
+        Prepare the memo for a generation run.
+
+        Index versions are refreshed, and the memo is loaded from disk if it is
+        persistent or emptied if it is not.
+        """
+        with self._lock:
+            self._versions.clear()
+            self.hits = 0
+            self.misses = 0
+            if self.persist_path is None:
+                self._entries.clear()
+            elif not self._loaded:
+                self._entries.update(self._load())
+                self._loaded = True
+
+    def end_run(self):
+        """Log the run's hit and miss counters and persist the memo if enabled."""
+        with self._lock:
+            logger.info(
+                f"Retrieval memo: {self.hits} hits, {self.misses} misses, "
+                f"{len(self._entries)} entries"
+            )
+            if self.persist_path is not None and self._dirty:
+                self._save()
+                self._dirty = False
+
+    def _load(self):
+        if not os.path.exists(self.persist_path):
+            return {}
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable retrieval memo: {str(e)}")
+            return {}
+        now = time.time()
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if now - entry.get("time", 0) <= self.ttl
+        }
+
+    def _save(self):
+        now = time.time()
+        entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if now - entry["time"] <= self.ttl
+        }
+        directory = os.path.dirname(self.persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.persist_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(temp_path, self.persist_path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not save retrieval memo: {str(e)}")
+
+
+retrieval_memo = RetrievalMemo()
+
+
+@contextmanager
+def retrieval_run():
+    """
+    Context manager scoping the retrieval memo to one generation run.
+    """
+    retrieval_memo.start_run()
+    try:
+        yield retrieval_memo
+    finally:
+        retrieval_memo.end_run()
@@ -3,10 +3,18 @@
 """
 This module provides functionality to update various databases used in the LLM-driven modeling system.
 It includes functions to update modification, generation, component, material, and style databases.
+Updates are incremental: a manifest of per-document content hashes is kept for each library
+collection, and only new, changed or removed documents touch the vector store. The hash covers
+the document text and its metadata, which may come from outside the document file (e.g. a
+library structure file), so file modification times alone cannot tell that nothing changed.
+Libraries queried through the NumPy backend get their snapshot re-exported after every change.
 """
 
 import os
-import shutil
+import sys
+import json
+import hashlib
+import argparse
 import logging
 from llm_driven_modelling.llama_index_library.llama_index_model_modification import (
     load_modification_data,
@@ -28,6 +36,12 @@ from llm_driven_modelling.llama_index_library.llama_index_style_library import (
     load_style_data,
     create_style_index,
 )
+from llm_driven_modelling.llama_index_library.embedding_cache import (
+    get_embedding_cache_stats,
+)
+from llm_driven_modelling.llama_index_library.vector_store_manager import (
+    get_vector_store_manager,
+)
 from dotenv import load_dotenv
 
 # Set up logging
@@ -40,111 +54,292 @@ logger = logging.getLogger(__name__)
 load_dotenv(dotenv_path="D:/Tencent_Supernova/api/.env")
 
 
-def update_modification_database():
+DATA_DIRECTORY = "./data"
+MANIFEST_VERSION = 1
+
+# Document loader and index builder of each library
+LIBRARIES = {
+    "modification": {
+        "load_data": load_modification_data,
+        "create_index": create_modification_index,
+    },
+    "generation": {
+        "load_data": load_generation_data,
+        "create_index": create_generation_index,
+    },
+    "component": {
+        "load_data": load_component_data,
+        "create_index": create_component_index,
+    },
+    "material": {
+        "load_data": load_material_data,
+        "create_index": create_material_index,
+    },
+    "style": {
+        "load_data": load_style_data,
+        "create_index": create_style_index,
+    },
+}
+
+
+def compute_document_hash(document):
     """
-    Update the modification database by loading new data and recreating the index.
+    Compute a hash of everything that goes into a document's embedding.
+
+    Args:
+        document (Document): The document to hash.
+
+    Returns:
+        str: The hex digest of the document text and metadata.
     """
-    try:
-        data_directory = "./data"
-        documents, _ = load_modification_data(data_directory)
+    digest = hashlib.sha256()
+    digest.update(document.text.encode("utf-8"))
+    digest.update(json.dumps(document.metadata, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
 
-        db_path = "./database/chroma_db_modification"
-        if os.path.exists(db_path):
-            shutil.rmtree(db_path)
-            logger.info("Existing modification database deleted.")
 
-        create_modification_index(documents)
-        logger.info("Modification database updated successfully.")
-    except Exception as e:
-        logger.error(f"Error updating modification database: {str(e)}")
+def assign_stable_ids(documents, data_directory):
+    """
+    Give each document an ID derived from its file path relative to the data directory,
+    so the same file maps to the same entries in the vector store across updates.
+
+    Args:
+        documents (list): A list of Document objects.
+        data_directory (str): The root data directory.
+    """
+    for document in documents:
+        relative_path = os.path.relpath(
+            document.metadata["file_path"], os.path.abspath(data_directory)
+        )
+        document.id_ = relative_path.replace(os.sep, "/")
+
 
+def build_manifest_entries(documents):
+    """
+    Build the manifest entries for the given documents.
+
+    Args:
+        documents (list): A list of Document objects with stable IDs.
 
-def update_generation_database():
+    Returns:
+        dict: Manifest entries keyed by document ID.
     """
-    Update the generation database by loading new data and recreating the index.
+    entries = {}
+    for document in documents:
+        entries[document.id_] = {
+            "file_path": document.metadata["file_path"],
+            "content_hash": compute_document_hash(document),
+        }
+    return entries
+
+
+def load_manifest(manifest_path):
+    """
+    Load the manifest of a library.
+
+    Args:
+        manifest_path (str): The path of the manifest file.
+
+    Returns:
+        dict or None: The manifest entries keyed by document ID, or None if there is no valid manifest.
     """
+    if not os.path.exists(manifest_path):
+        return None
     try:
-        data_directory = "./data"
-        documents, _ = load_generation_data(data_directory)
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_path}: {str(e)}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest.get("documents", {})
 
-        db_path = "./database/chroma_db_generation"
-        if os.path.exists(db_path):
-            shutil.rmtree(db_path)
-            logger.info("Existing generation database deleted.")
 
-        create_generation_index(documents)
-        logger.info("Generation database updated successfully.")
-    except Exception as e:
-        logger.error(f"Error updating generation database: {str(e)}")
+def save_manifest(manifest_path, entries):
+    """
+    Save the manifest of a library.
+
+    Args:
+        manifest_path (str): The path of the manifest file.
+        entries (dict): The manifest entries keyed by document ID.
+    """
+    directory = os.path.dirname(manifest_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "documents": entries},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    os.replace(temp_path, manifest_path)
 
 
-def update_component_database():
+def update_library(name, data_directory=DATA_DIRECTORY, rebuild=False):
     """
-    Update the component database by loading new data and recreating the index.
+    Bring a library's collection in line with its documents.
+
+    Only new or changed documents are embedded and upserted, and entries of removed
+    documents are deleted. The collection is rebuilt from scratch when requested, or
+    when it has no manifest to compare against.
+
+    Args:
+        name (str): The library name, a key of LIBRARIES.
+        data_directory (str): The root data directory.
+        rebuild (bool): Drop the collection and re-index every document.
+
+    Returns:
+        dict: The number of added, updated, removed and unchanged documents.
     """
-    try:
-        data_directory = "./data"
-        documents, _ = load_component_data(data_directory)
+    library = LIBRARIES[name]
+    manager = get_vector_store_manager()
+    manifest_path = manager.get_manifest_path(name)
+
+    documents, _ = library["load_data"](data_directory)
+    assign_stable_ids(documents, data_directory)
+    entries = build_manifest_entries(documents)
+
+    manifest = None if rebuild else load_manifest(manifest_path)
+    if manifest is None:
+        logger.info(f"Rebuilding {name} database from scratch.")
+        library["create_index"](documents)
+        save_manifest(manifest_path, entries)
+        if manager.get_backend(name) == "numpy":
+            manager.export_snapshot(name)
+        # The library now lives in the shared store, so its old directory is unused
+        manager.remove_legacy_store(name)
+        return {
+            "added": len(documents),
+            "updated": 0,
+            "removed": 0,
+            "unchanged": 0,
+        }
+
+    removed_ids = [doc_id for doc_id in manifest if doc_id not in entries]
+    new_documents = [doc for doc in documents if doc.id_ not in manifest]
+    changed_documents = [
+        doc
+        for doc in documents
+        if doc.id_ in manifest
+        and manifest[doc.id_]["content_hash"] != entries[doc.id_]["content_hash"]
+    ]
+    unchanged_count = len(documents) - len(new_documents) - len(changed_documents)
+
+    if removed_ids or new_documents or changed_documents:
+        index = manager.get_index(name)
+        for doc_id in removed_ids:
+            index.delete_ref_doc(doc_id)
+            logger.info(f"Removed {name} document: {doc_id}")
+        for document in changed_documents:
+            index.delete_ref_doc(document.id_)
+            index.insert(document)
+            logger.info(f"Updated {name} document: {document.id_}")
+        for document in new_documents:
+            # A run that failed before saving the manifest may have inserted it already
+            index.delete_ref_doc(document.id_)
+            index.insert(document)
+            logger.info(f"Added {name} document: {document.id_}")
+
+    # An unchanged manifest keeps its hash, and with it the memoized retrievals
+    if entries != manifest:
+        save_manifest(manifest_path, entries)
+    if manager.get_backend(name) == "numpy" and manager.load_snapshot(name) is None:
+        manager.export_snapshot(name)
+    return {
+        "added": len(new_documents),
+        "updated": len(changed_documents),
+        "removed": len(removed_ids),
+        "unchanged": unchanged_count,
+    }
 
-        db_path = "./database/chroma_db_components"
-        if os.path.exists(db_path):
-            shutil.rmtree(db_path)
-            logger.info("Existing component database deleted.")
 
-        create_component_index(documents)
-        logger.info("Component database updated successfully.")
+def _update_database(name, rebuild):
+    """Update one library and log the outcome."""
+    try:
+        counts = update_library(name, rebuild=rebuild)
+        logger.info(
+            f"{name.capitalize()} database updated successfully: "
+            f"{counts['added']} added, {counts['updated']} updated, "
+            f"{counts['removed']} removed, {counts['unchanged']} unchanged."
+        )
     except Exception as e:
-        logger.error(f"Error updating component database: {str(e)}")
+        logger.error(f"Error updating {name} database: {str(e)}")
 
 
-def update_material_database():
+def update_modification_database(rebuild=False):
     """
-    Update the material database by loading new data and recreating the index.
+    Update the modification database with new, changed and removed documents.
+
+    Args:
+        rebuild (bool): Drop the database and re-index every document.
     """
-    try:
-        data_directory = "./data"
-        documents, _ = load_material_data(data_directory)
+    _update_database("modification", rebuild)
 
-        db_path = "./database/chroma_db_materials"
-        if os.path.exists(db_path):
-            shutil.rmtree(db_path)
-            logger.info("Existing material database deleted.")
 
-        create_material_index(documents)
-        logger.info("Material database updated successfully.")
-    except Exception as e:
-        logger.error(f"Error updating material database: {str(e)}")
+def update_generation_database(rebuild=False):
+    """
+    Update the generation database with new, changed and removed documents.
+
+    Args:
+        rebuild (bool): Drop the database and re-index every document.
+    """
+    _update_database("generation", rebuild)
 
 
-def update_style_database():
+def update_component_database(rebuild=False):
     """
-    Update the style database by loading new data and recreating the index.
+    Update the component database with new, changed and removed documents.
+
+    Args:
+        rebuild (bool): Drop the database and re-index every document.
     """
-    try:
-        data_directory = "./data"
-        documents, _ = load_style_data(data_directory)
+    _update_database("component", rebuild)
 
-        db_path = "./database/chroma_db_styles"
-        if os.path.exists(db_path):
-            shutil.rmtree(db_path)
-            logger.info("Existing style database deleted.")
 
-        create_style_index(documents)
-        logger.info("Style database updated successfully.")
-    except Exception as e:
-        logger.error(f"Error updating style database: {str(e)}")
+def update_material_database(rebuild=False):
+    """
+    Update the material database with new, changed and removed documents.
+
+    Args:
+        rebuild (bool): Drop the database and re-index every document.
+    """
+    _update_database("material", rebuild)
 
 
-def update_all_databases():
+def update_style_database(rebuild=False):
+    """
+    Update the style database with new, changed and removed documents.
+
+    Args:
+        rebuild (bool): Drop the database and re-index every document.
+    """
+    _update_database("style", rebuild)
+
+
+def update_all_databases(rebuild=False):
     """
     Update all databases: modification, generation, component, material, and style.
+
+    Args:
+        rebuild (bool): Drop the databases and re-index every document.
     """
-    update_modification_database()
-    update_generation_database()
-    update_component_database()
-    update_material_database()
-    update_style_database()
+    update_modification_database(rebuild)
+    update_generation_database(rebuild)
+    update_component_database(rebuild)
+    update_material_database(rebuild)
+    update_style_database(rebuild)
+    get_embedding_cache_stats()
 
 
 if __name__ == "__main__":
-    update_all_databases()
+    parser = argparse.ArgumentParser(description="Update the document databases.")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop every database and re-index all documents from scratch.",
+    )
+    args = parser.parse_args(sys.argv[1:])
+    update_all_databases(rebuild=args.rebuild)
@@ -0,0 +1,409 @@
+# vector_store_manager.py
+
+"""
+This module provides a process-wide manager for the vector databases of the document libraries.
+A single Chroma client owns one persistent store, and each library (component, material,
+generation, modification, style) is a collection in it. All libraries share one embedding model.
+
+Chroma is always the store that updates are written to, and by default also the one queried.
+Libraries switched to the "numpy" backend, through VECTOR_BACKENDS or the VECTOR_BACKEND and
+VECTOR_BACKEND_<LIBRARY> environment variables, are queried from a NumPy snapshot of their
+collection instead, see numpy_vector_store.py. The snapshot records the entry count and the
+manifest hash it was exported at, and is exported again when either has changed.
+"""
+
+import os
+import math
+import shutil
+import hashlib
+import logging
+import threading
+import chromadb
+from llama_index.core import VectorStoreIndex
+from llama_index.core.vector_stores.types import VectorStoreQueryResult
+from llama_index.vector_stores.chroma import ChromaVectorStore
+from llm_driven_modelling.llama_index_library.embedding_cache import get_embed_model
+from llm_driven_modelling.llama_index_library.numpy_vector_store import (
+    NumpyVectorStore,
+    build_node,
+)
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+CHROMA_DB_PATH = "./database/chroma_db"
+
+# Collection name of each library in the shared store
+LIBRARY_COLLECTIONS = {
+    "component": "component_index",
+    "material": "material_index",
+    "generation": "generation_index",
+    "modification": "modification_index",
+    "style": "style_index",
+}
+
+# Per-library stores used before the libraries shared one; removed when a library is rebuilt
+LEGACY_DB_PATHS = {
+    "component": "./database/chroma_db_components",
+    "material": "./database/chroma_db_materials",
+    "generation": "./database/chroma_db_generation",
+    "modification": "./database/chroma_db_modification",
+    "style": "./database/chroma_db_styles",
+}
+
+VECTOR_BACKEND_NAMES = ("chroma", "numpy")
+
+# Backend used to answer queries for each library: "chroma" or "numpy".
+# VECTOR_BACKEND overrides all of them, VECTOR_BACKEND_<LIBRARY> a single library.
+VECTOR_BACKENDS = {
+    "component": "chroma",
+    "material": "chroma",
+    "generation": "chroma",
+    "modification": "chroma",
+    "style": "chroma",
+}
+
+
+def query_chroma_batch(collection, query_embeddings, similarity_top_k):
+    """
+    Answer several queries against a Chroma collection with a single query call.
+
+    Scores are exp(-d), as ChromaVectorStore reports them.
+
+    Args:
+        collection (chromadb.Collection): The collection to search.
+        query_embeddings (list): The query embeddings.
+        similarity_top_k (int): The number of nodes to return per query.
+
+    Returns:
+        list: One VectorStoreQueryResult per query, in the same order.
+    """
+    results = collection.query(
+        query_embeddings=[list(embedding) for embedding in query_embeddings],
+        n_results=similarity_top_k,
+        include=["documents", "metadatas", "distances"],
+    )
+    return [
+        VectorStoreQueryResult(
+            nodes=[
+                build_node(node_id, text, metadata)
+                for node_id, text, metadata in zip(ids, texts, metadatas)
+            ],
+            similarities=[math.exp(-distance) for distance in distances],
+            ids=list(ids),
+        )
+        for ids, texts, metadatas, distances in zip(
+            results["ids"],
+            results["documents"],
+            results["metadatas"],
+            results["distances"],
+        )
+    ]
+
+
+class VectorStoreManager:
+    """Owner of the shared Chroma client and the per-library collections."""
+
+    def __init__(self, db_path=CHROMA_DB_PATH):
+        """
+        Initialize the manager without opening the database.
+
+        Args:
+            db_path (str): The directory of the persistent Chroma store.
+        """
+        self.db_path = db_path
+        self._client = None
+        self._vector_stores = {}
+        self._indexes = {}
+        self._search_indexes = {}
+        self._lock = threading.RLock()
+
+    @property
+    def client(self):
+        """The shared Chroma client, opened on first use."""
+        with self._lock:
+            if self._client is None:
+                self._client = chromadb.PersistentClient(path=self.db_path)
+                logger.info(f"Opened shared Chroma store at {self.db_path}")
+            return self._client
+
+    @property
+    def embed_model(self):
+        """The embedding model shared by all libraries."""
+        return get_embed_model()
+
+    def get_collection_name(self, library):
+        """
+        Get the collection name of a library.
+
+        Args:
+            library (str): The library name, a key of LIBRARY_COLLECTIONS.
+
+        Returns:
+            str: The collection name.
+        """
+        if library not in LIBRARY_COLLECTIONS:
+            raise ValueError(f"Unknown document library: {library}")
+        return LIBRARY_COLLECTIONS[library]
+
+    def get_collection(self, library):
+        """
+        Get (or create) the Chroma collection of a library.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            chromadb.Collection: The collection.
+        """
+        return self.client.get_or_create_collection(self.get_collection_name(library))
+
+    def get_vector_store(self, library):
+        """
+        Get the vector store of a library.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            ChromaVectorStore: The vector store backed by the library's collection.
+        """
+        with self._lock:
+            if library not in self._vector_stores:
+                self._vector_stores[library] = ChromaVectorStore(
+                    chroma_collection=self.get_collection(library)
+                )
+            return self._vector_stores[library]
+
+    def get_index(self, library):
+        """
+        Get the vector index of a library.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            VectorStoreIndex: The index over the library's vector store.
+        """
+        with self._lock:
+            if library not in self._indexes:
+                self._indexes[library] = VectorStoreIndex.from_vector_store(
+                    self.get_vector_store(library), embed_model=self.embed_model
+                )
+            return self._indexes[library]
+
+    def get_backend(self, library):
+        """
+        Get the query backend of a library.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            str: "chroma" or "numpy".
+        """
+        backend = (
+            os.getenv(f"VECTOR_BACKEND_{library.upper()}")
+            or os.getenv("VECTOR_BACKEND")
+            or VECTOR_BACKENDS.get(library, "chroma")
+        ).lower()
+        if backend not in VECTOR_BACKEND_NAMES:
+            raise ValueError(f"Unknown vector backend for {library}: {backend}")
+        return backend
+
+    def get_snapshot_path(self, library):
+        """
+        Get the path of the NumPy snapshot of a library, without extension.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            str: The snapshot path.
+        """
+        return os.path.join(self.db_path, "numpy", self.get_collection_name(library))
+
+    def get_snapshot_source(self, library):
+        """
+        Describe the current state of a library's collection.
+
+        A snapshot exported at a different entry count or manifest is stale.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            dict: The collection's entry count and the SHA-256 of its manifest file.
+        """
+        return {
+            "count": self.get_collection(library).count(),
+            "manifest": self.get_manifest_hash(library),
+        }
+
+    def export_snapshot(self, library):
+        """
+        Write the NumPy snapshot of a library from its Chroma collection.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            NumpyVectorStore: The store holding the exported entries.
+        """
+        with self._lock:
+            store = NumpyVectorStore.from_chroma_collection(
+                self.get_collection(library), source=self.get_snapshot_source(library)
+            )
+            store.persist(self.get_snapshot_path(library))
+            self._search_indexes.pop(library, None)
+        logger.info(f"Exported {len(store)} {library} embeddings to NumPy snapshot.")
+        return store
+
+    def load_snapshot(self, library):
+        """
+        Load the NumPy snapshot of a library if it matches the current collection.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            NumpyVectorStore: The snapshot, or None if it is missing or out of date.
+        """
+        snapshot_path = self.get_snapshot_path(library)
+        if not (
+            os.path.exists(snapshot_path + ".npy")
+            and os.path.exists(snapshot_path + ".json")
+        ):
+            return None
+        store = NumpyVectorStore.from_persist_path(snapshot_path)
+        if store.source != self.get_snapshot_source(library):
+            logger.info(f"NumPy snapshot of {library} is out of date.")
+            return None
+        return store
+
+    def get_search_index(self, library):
+        """
+        Get the index that answers queries for a library, using its configured backend.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            VectorStoreIndex: The index over the Chroma collection or the NumPy snapshot.
+        """
+        if self.get_backend(library) == "chroma":
+            return self.get_index(library)
+
+        with self._lock:
+            if library not in self._search_indexes:
+                store = self.load_snapshot(library)
+                if store is None:
+                    store = self.export_snapshot(library)
+                self._search_indexes[library] = VectorStoreIndex.from_vector_store(
+                    store, embed_model=self.embed_model
+                )
+            return self._search_indexes[library]
+
+    def get_manifest_path(self, library):
+        """
+        Get the path of the update manifest of a library.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            str: The manifest file path.
+        """
+        return os.path.join(
+            self.db_path, f"{self.get_collection_name(library)}_manifest.json"
+        )
+
+    def get_manifest_hash(self, library):
+        """
+        Get the SHA-256 of a library's update manifest.
+
+        The manifest lists the content hash of every indexed document, so its own hash
+        changes exactly when the indexed documents do.
+
+        Args:
+            library (str): The library name.
+
+        Returns:
+            str: The hex digest, or None if the library has no manifest.
+        """
+        manifest_path = self.get_manifest_path(library)
+        try:
+            with open(manifest_path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def reset_collection(self, library):
+        """
+        Drop all entries of a library, leaving the other collections untouched.
+
+        Args:
+            library (str): The library name.
+        """
+        collection_name = self.get_collection_name(library)
+        with self._lock:
+            existing = [
+                getattr(collection, "name", collection)
+                for collection in self.client.list_collections()
+            ]
+            if collection_name in existing:
+                self.client.delete_collection(collection_name)
+                logger.info(f"Existing {library} collection deleted.")
+            self._vector_stores.pop(library, None)
+            self._indexes.pop(library, None)
+            self._search_indexes.pop(library, None)
+
+            snapshot_path = self.get_snapshot_path(library)
+            for path in (
+                self.get_manifest_path(library),
+                snapshot_path + ".npy",
+                snapshot_path + ".json",
+            ):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def remove_legacy_store(self, library):
+        """
+        Delete the per-library Chroma directory a library used before the shared store.
+
+        Args:
+            library (str): The library name.
+        """
+        legacy_path = LEGACY_DB_PATHS.get(library)
+        if legacy_path is None or not os.path.isdir(legacy_path):
+            return
+        if os.path.abspath(legacy_path) == os.path.abspath(self.db_path):
+            return
+        try:
+            shutil.rmtree(legacy_path)
+            logger.info(f"Removed old {library} store at {legacy_path}")
+        except OSError as e:
+            logger.warning(
+                f"Could not remove old {library} store at {legacy_path}: {str(e)}"
+            )
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_vector_store_manager():
+    """
+    Get the process-wide vector store manager.
+
+    Returns:
+        VectorStoreManager: The shared manager.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = VectorStoreManager()
+        return _manager
@@ -5,7 +5,6 @@ This module provides common utility functions for LLM-driven modeling in Blender
 It includes functions for handling conversations, processing commands, and managing scene information.
 """
 
-import base64
 import os
 import textwrap
 import logging
@@ -17,6 +16,8 @@ import sys
 import ast
 from bpy.props import StringProperty
 from bpy.types import PropertyGroup
+from llm_driven_modelling.llm.image_cache import get_image_cache
+from llm_driven_modelling.utils.screenshot_module import get_screenshot_writer
 
 # Set up logging
 logging.basicConfig(
@@ -65,9 +66,13 @@ def get_screenshots():
     """
     Get a list of screenshot file paths.
 
+    Waits for the background screenshot writer first, so the files of the latest
+    capture are complete before they are listed.
+
     Returns:
         list: A list of file paths to screenshots.
     """
+    get_screenshot_writer().wait()
     screenshots_path = r"D:\GPT_driven_modeling\resources\screenshots"
     return [
         os.path.join(screenshots_path, f)
@@ -90,18 +95,20 @@ def initialize_conversation(context):
         conversation_manager.add_message("system", GLOBAL_PROMPT.strip())
 
 
-def encode_image(image_path):
+def encode_image(image_path, max_edge=None, image_format=None):
     """
-    Encode an image file to base64.
+    Encode an image to base64. The result is cached until the file changes.
 
     Args:
-        image_path (str): The path to the image file.
+        image_path (str): The path to the image file, or an in-memory image such as a
+            screenshot_module.Screenshot.
+        max_edge (int, optional): Downscale so the longer edge is at most this many pixels.
+        image_format (str, optional): Recompress as "png", "jpeg" or "webp".
 
     Returns:
         str: The base64 encoded image string.
     """
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
+    return get_image_cache().get_payload(image_path, max_edge, image_format)[1]
 
 
 def is_valid_python(line):
@@ -0,0 +1,168 @@
+# async_runner.py
+
+"""
+This module provides a runner for the async LLM helpers.
+A single asyncio event loop runs in a background thread for the whole Blender session. Blocking
+code can submit coroutines to it and wait for the results, and Blender operators can hand over a
+coroutine and get a callback on the main thread when it finishes, so the UI never freezes on a
+network wait.
+"""
+
+import bpy
+import asyncio
+import logging
+import threading
+from llm_driven_modelling.llm.llm_transport import get_transport
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of a pending operator call
+DEFAULT_POLL_INTERVAL = 0.1
+
+
+class AsyncRunner:
+    """Background event loop that runs coroutines for blocking code and Blender operators."""
+
+    def __init__(self):
+        """Initialize the runner without starting the loop."""
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The runner's event loop, started on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="llm-async-runner", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coroutine):
+        """
+        Schedule a coroutine on the runner's loop.
+
+        Args:
+            coroutine (coroutine): The coroutine to run.
+
+        Returns:
+            concurrent.futures.Future: The future of the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine, timeout=None):
+        """
+        Run a coroutine on the runner's loop and wait for its result.
+
+        Args:
+            coroutine (coroutine): The coroutine to run.
+            timeout (float, optional): Seconds to wait for the result.
+
+        Returns:
+            object: The coroutine's result.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "AsyncRunner.run cannot be called from the runner's loop"
+            )
+        return self.submit(coroutine).result(timeout)
+
+    def gather(self, *coroutines, return_exceptions=False, timeout=None):
+        """
+        Run several coroutines concurrently and wait for all of their results.
+
+        Args:
+            *coroutines (coroutine): The coroutines to run.
+            return_exceptions (bool): Return exceptions as results instead of raising the first.
+            timeout (float, optional): Seconds to wait for all results.
+
+        Returns:
+            list: The results, in the order of the coroutines.
+        """
+
+        async def gather_all():
+            return await asyncio.gather(
+                *coroutines, return_exceptions=return_exceptions
+            )
+
+        return self.run(gather_all(), timeout)
+
+    def call_when_done(
+        self, coroutine, callback, error_callback=None, poll_interval=None
+    ):
+        """
+        Run a coroutine in the background and pass its result to a callback on Blender's main thread.
+
+        The callback is invoked from a bpy.app.timers function, so it may safely
+        modify the scene.
+
+        Args:
+            coroutine (coroutine): The coroutine to run.
+            callback (callable): Called with the result when the coroutine succeeds.
+            error_callback (callable, optional): Called with the exception if it fails.
+            poll_interval (float, optional): Seconds between checks of the result.
+
+        Returns:
+            concurrent.futures.Future: The future of the coroutine's result.
+        """
+        future = self.submit(coroutine)
+        interval = poll_interval or DEFAULT_POLL_INTERVAL
+
+        def poll():
+            if not future.done():
+                return interval
+            try:
+                result = future.result()
+            except Exception as e:
+                if error_callback is not None:
+                    error_callback(e)
+                else:
+                    logger.error(f"Error in background LLM call: {str(e)}")
+                return None
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"Error handling background LLM result: {str(e)}")
+            # Returning None unregisters the timer
+            return None
+
+        bpy.app.timers.register(poll, first_interval=interval)
+        return future
+
+    def shutdown(self):
+        """Stop the loop and its thread. A new loop is started on next use."""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+        # The transport's async clients were bound to the closed loop
+        get_transport().reset_async_clients()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_async_runner():
+    """
+    Get the process-wide async runner.
+
+    Returns:
+        AsyncRunner: The shared runner.
+    """
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = AsyncRunner()
+        return _runner
@@ -9,9 +9,19 @@ import bpy
 import os
 import logging
 from bpy.types import Operator, Panel
-from anthropic import Anthropic
 from dotenv import load_dotenv
 from .LLM_common_utils import *
+from .llm_transport import get_transport
+from .async_runner import get_async_runner
+from .response_cache import CacheMissError, get_response_cache
+from .code_stream_validator import CodeValidationError
+from .rate_limiter import get_rate_limiter
+from .image_cache import (
+    VISION_IMAGE_FORMAT,
+    VISION_IMAGE_MAX_EDGE,
+    get_image_cache,
+    get_image_name,
+)
 
 # Set up logging
 logging.basicConfig(
@@ -24,46 +34,118 @@ load_dotenv(dotenv_path="D:/Tencent_Supernova/api/.env")
 api_key = os.getenv("ANTHROPIC_API_KEY")
 
 
-def generate_text_with_claude(prompt):
+def build_text_request(prompt):
+    """
+    Build the message arguments for a text generation request.
+
+    Args:
+        prompt (str): The input prompt for text generation.
+
+    Returns:
+        dict: Keyword arguments for client.messages.create.
+    """
+    return {
+        "model": "claude-3-5-sonnet-20240620",
+        "max_tokens": 4096,
+        "temperature": 0.3,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def generate_text_with_claude(prompt, validator=None):
     """
     Generate text using Claude AI based on the given prompt.
 
+    With a validator, the response is streamed and each chunk is passed to it. The
+    stream is closed as soon as the validator rejects the code, and the partial
+    response is returned; validator.error tells the reason.
+
     Args:
         prompt (str): The input prompt for text generation.
+        validator (StreamingCodeValidator, optional): Validator for a code response.
 
     Returns:
         str: The generated text response.
     """
     try:
-        client = Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model="claude-3-5-sonnet-20240620",
-            max_tokens=4096,
-            temperature=0.3,
-            messages=[{"role": "user", "content": prompt}],
+        request = build_text_request(prompt)
+
+        def create():
+            client = get_transport().anthropic_client
+            if validator is None:
+                return client.messages.create(**request).content[0].text
+            # A retried request streams the response again from the start
+            validator.reset()
+            with client.messages.stream(**request) as stream:
+                for text in stream.text_stream:
+                    validator.feed(text)
+            validator.finish()
+            return validator.text
+
+        response = get_response_cache().get_or_call(
+            "anthropic",
+            request,
+            lambda: get_rate_limiter().call("anthropic", request, create),
         )
-        return message.content[0].text
+        if validator is not None and not validator.finished:
+            validator.validate(response)
+        return response
+    except CodeValidationError:
+        return validator.text
+    except CacheMissError:
+        raise
     except Exception as e:
         logger.error(f"Error generating text from Claude with context: {e}")
         return "Error generating response from Claude."
 
 
-def analyze_screenshots_with_claude(prompt, screenshots):
+async def generate_text_with_claude_async(prompt):
     """
-    Analyze screenshots using Claude AI vision capabilities.
+    Generate text using Claude AI based on the given prompt, without blocking the event loop.
+
+    Args:
+        prompt (str): The input prompt for text generation.
+
+    Returns:
+        str: The generated text response.
+    """
+    try:
+        request = build_text_request(prompt)
+
+        async def create():
+            client = get_transport().async_anthropic_client
+            message = await client.messages.create(**request)
+            return message.content[0].text
+
+        return await get_response_cache().get_or_call_async(
+            "anthropic",
+            request,
+            lambda: get_rate_limiter().call_async("anthropic", request, create),
+        )
+    except CacheMissError:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating text from Claude with context: {e}")
+        return "Error generating response from Claude."
+
+
+def build_vision_request(prompt, screenshots):
+    """
+    Build the message arguments for a screenshot analysis.
 
     Args:
         prompt (str): The text prompt for analysis.
-        screenshots (list): List of screenshot file paths.
+        screenshots (list): List of screenshot file paths or in-memory screenshots.
 
     Returns:
-        str: The analysis result from Claude AI.
+        dict: Keyword arguments for client.messages.create.
     """
-    client = Anthropic(api_key=api_key)
     content = []
     for screenshot in screenshots:
-        base64_image = encode_image(screenshot)
-        view_name = os.path.splitext(os.path.basename(screenshot))[0]
+        media_type, base64_image = get_image_cache().get_payload(
+            screenshot, VISION_IMAGE_MAX_EDGE, VISION_IMAGE_FORMAT
+        )
+        view_name = get_image_name(screenshot)
         content.extend(
             [
                 {"type": "text", "text": f"View angle: {view_name}"},
@@ -71,19 +153,67 @@ def analyze_screenshots_with_claude(prompt, screenshots):
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": media_type,
                         "data": base64_image,
                     },
                 },
             ]
         )
     content.append({"type": "text", "text": prompt})
-    message = client.messages.create(
-        model="claude-3-5-sonnet-20240620",
-        max_tokens=4096,
-        messages=[{"role": "user", "content": content}],
+    return {
+        "model": "claude-3-5-sonnet-20240620",
+        "max_tokens": 4096,
+        "messages": [{"role": "user", "content": content}],
+    }
+
+
+def analyze_screenshots_with_claude(prompt, screenshots):
+    """
+    Analyze screenshots using Claude AI vision capabilities.
+
+    Args:
+        prompt (str): The text prompt for analysis.
+        screenshots (list): List of screenshot file paths.
+
+    Returns:
+        str: The analysis result from Claude AI.
+    """
+    request = build_vision_request(prompt, screenshots)
+
+    def create():
+        client = get_transport().anthropic_client
+        return client.messages.create(**request).content[0].text
+
+    return get_response_cache().get_or_call(
+        "anthropic",
+        request,
+        lambda: get_rate_limiter().call("anthropic", request, create),
+    )
+
+
+async def analyze_screenshots_with_claude_async(prompt, screenshots):
+    """
+    Analyze screenshots using Claude AI vision capabilities, without blocking the event loop.
+
+    Args:
+        prompt (str): The text prompt for analysis.
+        screenshots (list): List of screenshot file paths.
+
+    Returns:
+        str: The analysis result from Claude AI.
+    """
+    request = build_vision_request(prompt, screenshots)
+
+    async def create():
+        client = get_transport().async_anthropic_client
+        message = await client.messages.create(**request)
+        return message.content[0].text
+
+    return await get_response_cache().get_or_call_async(
+        "anthropic",
+        request,
+        lambda: get_rate_limiter().call_async("anthropic", request, create),
     )
-    return message.content[0].text
 
 
 class OBJECT_OT_send_to_claude(Operator):
@@ -100,10 +230,19 @@ class OBJECT_OT_send_to_claude(Operator):
                 initialize_conversation(context)
                 conversation_manager.add_message("human", input_text)
                 prompt_with_history = add_history_to_prompt(context, input_text)
-                response_text = generate_text_with_claude(prompt_with_history)
-                logger.info(f"Claude Response: {response_text}")
-                conversation_manager.add_message("assistant", response_text)
-                execute_blender_command(response_text)
+
+                # Runs on the main thread once Claude has answered
+                def handle_response(response_text):
+                    logger.info(f"Claude Response: {response_text}")
+                    bpy.context.scene.conversation_manager.add_message(
+                        "assistant", response_text
+                    )
+                    execute_blender_command(response_text)
+
+                get_async_runner().call_when_done(
+                    generate_text_with_claude_async(prompt_with_history),
+                    handle_response,
+                )
             else:
                 logger.warning("No input text provided.")
         except Exception as e:
@@ -133,15 +272,20 @@ class OBJECT_OT_send_screenshots_to_claude(Operator):
             Please provide a comprehensive analysis, including the model's overall shape, details, proportions, and possible uses."""
             prompt_with_history = add_history_to_prompt(context, prompt)
             screenshots = get_screenshots()
-            output_text = analyze_screenshots_with_claude(
-                prompt_with_history, screenshots
-            )
-            logger.info(f"Claude Response: {output_text}")
-            conversation_manager.add_message(
-                "assistant",
-                f"Scene analysis based on multiple view screenshots:\n{output_text}",
+
+            # Runs on the main thread once Claude has answered
+            def handle_response(output_text):
+                logger.info(f"Claude Response: {output_text}")
+                bpy.context.scene.conversation_manager.add_message(
+                    "assistant",
+                    f"Scene analysis based on multiple view screenshots:\n{output_text}",
+                )
+                execute_blender_command(output_text)
+
+            get_async_runner().call_when_done(
+                analyze_screenshots_with_claude_async(prompt_with_history, screenshots),
+                handle_response,
             )
-            execute_blender_command(output_text)
             return {"FINISHED"}
         except Exception as e:
             self.report(
@@ -171,14 +315,18 @@ class OBJECT_OT_analyze_screenshots_claude(Operator):
             Please provide a comprehensive analysis, including the model's overall shape, details, proportions, and possible uses."""
             prompt_with_history = add_history_to_prompt(context, prompt)
             screenshots = get_screenshots()
-            analysis_result = analyze_screenshots_with_claude(
-                prompt_with_history, screenshots
-            )
-            logger.info(f"Screenshot Analysis Result: {analysis_result}")
-            conversation_manager = context.scene.conversation_manager
-            conversation_manager.add_message(
-                "assistant",
-                f"Scene analysis based on multiple view screenshots: {analysis_result}",
+
+            # Runs on the main thread once Claude has answered
+            def handle_response(analysis_result):
+                logger.info(f"Screenshot Analysis Result: {analysis_result}")
+                bpy.context.scene.conversation_manager.add_message(
+                    "assistant",
+                    f"Scene analysis based on multiple view screenshots: {analysis_result}",
+                )
+
+            get_async_runner().call_when_done(
+                analyze_screenshots_with_claude_async(prompt_with_history, screenshots),
+                handle_response,
             )
         except Exception as e:
             logger.error(f"Error in OBJECT_OT_analyze_screenshots_claude.execute: {e}")
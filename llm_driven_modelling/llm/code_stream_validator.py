@@ -0,0 +1,225 @@
+# code_stream_validator.py
+
+"""
+This module provides incremental validation of generated Blender Python code while it streams in.
+The received text is cut at top-level statement boundaries, and each complete prefix is sanitized
+and compiled exactly as execute_blender_command would. A syntax error that no later text can
+repair, or a forbidden call such as os.system, is reported as soon as the offending statement is
+complete, so the generation can be aborted without waiting for the full response.
+"""
+
+import ast
+import codeop
+import logging
+import textwrap
+import warnings
+from llm_driven_modelling.llm.LLM_common_utils import sanitize_command
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Calls that must never run inside Blender
+FORBIDDEN_CALLS = {
+    "os.system",
+    "os.popen",
+    "os.remove",
+    "os.unlink",
+    "os.rmdir",
+    "os.removedirs",
+    "shutil.rmtree",
+    "sys.exit",
+    "exit",
+    "quit",
+    "bpy.ops.wm.quit_blender",
+    "bpy.ops.wm.read_homefile",
+    "bpy.ops.wm.read_factory_settings",
+}
+# Modules that must not be imported
+FORBIDDEN_MODULES = {"subprocess"}
+
+# Lines starting with these continue the previous top-level statement
+CONTINUATION_PREFIXES = ("else", "elif", "except", "finally", ")", "]", "}")
+
+
+class CodeValidationError(Exception):
+    """Raised while streaming when the generated code cannot be executed."""
+
+
+def get_call_name(node):
+    """
+    Get the dotted name of a called function, e.g. "os.system".
+
+    Args:
+        node (ast.AST): The func node of an ast.Call.
+
+    Returns:
+        str or None: The dotted name, or None if the callee is not a plain name.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def find_forbidden_construct(tree):
+    """
+    Find the first forbidden call or import in a syntax tree.
+
+    Args:
+        tree (ast.AST): The parsed code.
+
+    Returns:
+        str or None: A description of the forbidden construct, or None if there is none.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            name = get_call_name(node.func)
+            if name in FORBIDDEN_CALLS:
+                return f"forbidden call {name}() on line {node.lineno}"
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split(".")[0] in FORBIDDEN_MODULES:
+                    return f"forbidden import {alias.name} on line {node.lineno}"
+        elif isinstance(node, ast.ImportFrom):
+            if (node.module or "").split(".")[0] in FORBIDDEN_MODULES:
+                return f"forbidden import {node.module} on line {node.lineno}"
+    return None
+
+
+def is_statement_start(line):
+    """
+    Check whether a line starts a new top-level statement.
+
+    Args:
+        line (str): A line of code.
+
+    Returns:
+        bool: True if the line is unindented code that does not continue the previous statement.
+    """
+    if not line or line[0].isspace() or line.startswith("#"):
+        return False
+    return not line.startswith(CONTINUATION_PREFIXES)
+
+
+class StreamingCodeValidator:
+    """Validator fed with the chunks of a streamed code response."""
+
+    def __init__(self):
+        """Initialize the validator with an empty response."""
+        self.text = ""
+        self.error = None
+        self.finished = False
+        self._lines = 0
+        self._checked_lines = 0
+
+    def reset(self):
+        """Forget the received text, e.g. before a failed request is retried."""
+        self.__init__()
+
+    def feed(self, chunk):
+        """
+        Add a chunk of the response and validate every newly completed top-level statement.
+
+        Only the statements completed since the last check are compiled, so the
+        cost of a check does not grow with the length of the response.
+
+        Args:
+            chunk (str): The next piece of the response text.
+
+        Raises:
+            CodeValidationError: If the code received so far can no longer become valid.
+        """
+        self.text += chunk
+        if "\n" not in chunk:
+            return
+        lines = self.text.split("\n")[:-1]
+        boundary = None
+        for index in range(max(self._lines, self._checked_lines + 1), len(lines)):
+            if is_statement_start(lines[index]):
+                boundary = index
+        self._lines = len(lines)
+        if boundary is None:
+            return
+        segment = "\n".join(lines[self._checked_lines : boundary])
+        try:
+            tree = self._parse(segment, self._checked_lines, allow_incomplete=True)
+        except (SyntaxError, ValueError) as e:
+            self._abort(f"syntax error: {e}")
+        if tree is None:
+            # The boundary was inside an open bracket or string; wait for more text
+            return
+        error = find_forbidden_construct(tree)
+        if error is not None:
+            self._abort(error)
+        self._checked_lines = boundary
+
+    def finish(self):
+        """
+        Validate the complete response once the stream has ended.
+
+        The statements checked while streaming are not compiled again; only the
+        final statement, which no later line has completed, is checked here.
+
+        Returns:
+            str or None: The reason the code cannot be executed, or None if it is valid.
+        """
+        self.finished = True
+        if self.error is None:
+            try:
+                tail = "\n".join(self.text.split("\n")[self._checked_lines :])
+                tree = self._parse(tail, self._checked_lines, allow_incomplete=False)
+                self.error = find_forbidden_construct(tree)
+            except (SyntaxError, ValueError) as e:
+                self.error = f"syntax error: {e}"
+        return self.error
+
+    def validate(self, text):
+        """
+        Validate a complete response that was not streamed, e.g. a cached one.
+
+        Args:
+            text (str): The complete response text.
+
+        Raises:
+            CodeValidationError: If a complete statement of the code is invalid.
+        """
+        for line in text.splitlines(keepends=True):
+            self.feed(line)
+        self.finish()
+
+    def _abort(self, error):
+        self.error = error
+        logger.warning(f"Aborting streamed code generation: {error}")
+        raise CodeValidationError(error)
+
+    @staticmethod
+    def _parse(code, first_line, allow_incomplete):
+        """
+        Sanitize and parse code the way execute_blender_command runs it.
+
+        Line numbers are shifted by first_line so they refer to the whole response.
+        Returns None instead of raising if allow_incomplete is set and the code
+        may still become valid with more text.
+        """
+        source = textwrap.dedent(sanitize_command(code))
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", SyntaxWarning)
+                if (
+                    allow_incomplete
+                    and codeop.compile_command(source, "<generated>", "exec") is None
+                ):
+                    return None
+                tree = ast.parse(source, "<generated>")
+        except SyntaxError as e:
+            if e.lineno is not None:
+                e.lineno += first_line
+            raise
+        return ast.increment_lineno(tree, first_line)
@@ -5,15 +5,13 @@ This module integrates GPT-4 functionality into a Blender addon.
 It provides capabilities for text generation, image analysis, and Blender scene manipulation.
 """
 
-import requests
+import bpy
 import os
 import logging
-from openai import OpenAI
 from dotenv import load_dotenv
 from bpy.types import Operator, Panel, PropertyGroup
 from bpy.props import StringProperty, PointerProperty
 from llm_driven_modelling.llm.LLM_common_utils import (
-    encode_image,
     initialize_conversation,
     add_history_to_prompt,
     get_scene_info,
@@ -21,6 +19,17 @@ from llm_driven_modelling.llm.LLM_common_utils import (
     get_screenshots,
     execute_blender_command,
 )
+from llm_driven_modelling.llm.llm_transport import get_transport
+from llm_driven_modelling.llm.async_runner import get_async_runner
+from llm_driven_modelling.llm.response_cache import CacheMissError, get_response_cache
+from llm_driven_modelling.llm.code_stream_validator import CodeValidationError
+from llm_driven_modelling.llm.rate_limiter import get_rate_limiter
+from llm_driven_modelling.llm.image_cache import (
+    VISION_IMAGE_FORMAT,
+    VISION_IMAGE_MAX_EDGE,
+    get_image_cache,
+    get_image_name,
+)
 
 # Set up logging
 logging.basicConfig(
@@ -31,30 +40,62 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv(dotenv_path="D:/Tencent_Supernova/api/.env")
 api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
 
 
-def generate_text_with_context(prompt):
+def build_text_request(prompt):
+    """
+    Build the chat completion arguments for a text generation request.
+
+    Args:
+        prompt (str): The input prompt for text generation.
+
+    Returns:
+        dict: Keyword arguments for client.chat.completions.create.
+    """
+    return {
+        "model": "o1-preview",
+        "messages": [{"role": "user", "content": prompt}],
+        # Additional parameters can be uncommented and adjusted as needed
+        # "max_tokens": 4096,
+        # "temperature": 0.8,
+        # "top_p": 1,
+        # "frequency_penalty": 0,
+        # "presence_penalty": 0,
+    }
+
+
+def generate_text_with_context(prompt, validator=None):
     """
     Generate text using GPT-4 based on the given prompt.
 
+    With a validator, the response is streamed and each chunk is passed to it. The
+    stream is closed as soon as the validator rejects the code, and the partial
+    response is returned; validator.error tells the reason.
+
     Args:
         prompt (str): The input prompt for text generation.
+        validator (StreamingCodeValidator, optional): Validator for a code response.
 
     Returns:
         str: The generated text response.
     """
     try:
-        response = client.chat.completions.create(
-            model="o1-preview",
-            messages=[{"role": "user", "content": prompt}],
-            # Additional parameters can be uncommented and adjusted as needed
-            # max_tokens=4096,
-            # temperature=0.8,
-            # top_p=1,
-            # frequency_penalty=0,
-            # presence_penalty=0
-        )
+        request = build_text_request(prompt)
+
+        def create():
+            client = get_transport().openai_client
+            if validator is None:
+                response = client.chat.completions.create(**request)
+                return response.choices[0].message.content
+            # A retried request streams the response again from the start
+            validator.reset()
+            with client.chat.completions.create(**request, stream=True) as stream:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        validator.feed(chunk.choices[0].delta.content)
+            validator.finish()
+            return validator.text
+
         # response = client.chat.completions.create(
         #     model="gpt-4o",
         #     messages=[{"role": "user", "content": prompt}],
@@ -65,36 +106,78 @@ def generate_text_with_context(prompt):
         #     frequency_penalty=0,
         #     presence_penalty=0
         # )
-        return response.choices[0].message.content
+        response = get_response_cache().get_or_call(
+            "openai",
+            request,
+            lambda: get_rate_limiter().call("openai", request, create),
+        )
+        if validator is not None and not validator.finished:
+            validator.validate(response)
+        return response
+    except CodeValidationError:
+        return validator.text
+    except CacheMissError:
+        # A replay run must not continue with an error message as the response
+        raise
     except Exception as e:
         logger.error(f"Error generating text from GPT-4 with context: {e}")
         return "Error generating response from GPT-4."
 
 
-def analyze_screenshots_with_gpt4(prompt, screenshots):
+async def generate_text_with_context_async(prompt):
     """
-    Analyze screenshots using GPT-4 vision capabilities.
+    Generate text using GPT-4 based on the given prompt, without blocking the event loop.
 
     Args:
-        prompt (str): The text prompt for analysis.
-        screenshots (list): List of screenshot file paths.
+        prompt (str): The input prompt for text generation.
 
     Returns:
-        str: The analysis result from GPT-4.
+        str: The generated text response.
+    """
+    try:
+        request = build_text_request(prompt)
+
+        async def create():
+            client = get_transport().async_openai_client
+            response = await client.chat.completions.create(**request)
+            return response.choices[0].message.content
+
+        return await get_response_cache().get_or_call_async(
+            "openai",
+            request,
+            lambda: get_rate_limiter().call_async("openai", request, create),
+        )
+    except CacheMissError:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating text from GPT-4 with context: {e}")
+        return "Error generating response from GPT-4."
+
+
+def build_vision_request(prompt, screenshots):
     """
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    Build the chat completion request for a screenshot analysis.
 
+    Args:
+        prompt (str): The text prompt for analysis.
+        screenshots (list): List of screenshot file paths or in-memory screenshots.
+
+    Returns:
+        dict: The JSON request body.
+    """
     image_messages = []
     for screenshot in screenshots:
-        base64_image = encode_image(screenshot)
-        view_name = os.path.splitext(os.path.basename(screenshot))[0]
+        media_type, base64_image = get_image_cache().get_payload(
+            screenshot, VISION_IMAGE_MAX_EDGE, VISION_IMAGE_FORMAT
+        )
+        view_name = get_image_name(screenshot)
         image_messages.extend(
             [
                 {"type": "text", "text": f"View angle: {view_name}"},
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{base64_image}",
+                        "url": f"data:{media_type};base64,{base64_image}",
                         "detail": "low",
                     },
                 },
@@ -103,7 +186,7 @@ def analyze_screenshots_with_gpt4(prompt, screenshots):
 
     text_message = {"type": "text", "text": prompt}
 
-    request_data = {
+    return {
         "model": "gpt-4o",
         "messages": [{"role": "user", "content": [text_message] + image_messages}],
         "max_tokens": 4096,
@@ -113,10 +196,55 @@ def analyze_screenshots_with_gpt4(prompt, screenshots):
         "presence_penalty": 0,
     }
 
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions", headers=headers, json=request_data
+
+def analyze_screenshots_with_gpt4(prompt, screenshots):
+    """
+    Analyze screenshots using GPT-4 vision capabilities.
+
+    Args:
+        prompt (str): The text prompt for analysis.
+        screenshots (list): List of screenshot file paths.
+
+    Returns:
+        str: The analysis result from GPT-4.
+    """
+    request_data = build_vision_request(prompt, screenshots)
+
+    def create():
+        response = get_transport().post_json("/chat/completions", request_data)
+        return response.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+    return get_response_cache().get_or_call(
+        "openai",
+        request_data,
+        lambda: get_rate_limiter().call("openai", request_data, create),
+    )
+
+
+async def analyze_screenshots_with_gpt4_async(prompt, screenshots):
+    """
+    Analyze screenshots using GPT-4 vision capabilities, without blocking the event loop.
+
+    Args:
+        prompt (str): The text prompt for analysis.
+        screenshots (list): List of screenshot file paths.
+
+    Returns:
+        str: The analysis result from GPT-4.
+    """
+    request_data = build_vision_request(prompt, screenshots)
+
+    async def create():
+        response = await get_transport().post_json_async(
+            "/chat/completions", request_data
+        )
+        return response.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+    return await get_response_cache().get_or_call_async(
+        "openai",
+        request_data,
+        lambda: get_rate_limiter().call_async("openai", request_data, create),
     )
-    return response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
 
 
 class OBJECT_OT_send_to_gpt(Operator):
@@ -134,10 +262,19 @@ class OBJECT_OT_send_to_gpt(Operator):
                 initialize_conversation(context)
                 conversation_manager.add_message("user", input_text)
                 prompt_with_history = add_history_to_prompt(context, input_text)
-                response_text = generate_text_with_context(prompt_with_history)
-                logger.info(f"GPT-4 Response: {response_text}")
-                conversation_manager.add_message("assistant", response_text)
-                execute_blender_command(response_text)
+
+                # Runs on the main thread once GPT-4 has answered
+                def handle_response(response_text):
+                    logger.info(f"GPT-4 Response: {response_text}")
+                    bpy.context.scene.conversation_manager.add_message(
+                        "assistant", response_text
+                    )
+                    execute_blender_command(response_text)
+
+                get_async_runner().call_when_done(
+                    generate_text_with_context_async(prompt_with_history),
+                    handle_response,
+                )
             else:
                 logger.warning("No input text provided.")
         except Exception as e:
@@ -166,15 +303,20 @@ class OBJECT_OT_send_screenshots_to_gpt(Operator):
 
             prompt_with_history = add_history_to_prompt(context, prompt)
             screenshots = get_screenshots()
-            output_text = analyze_screenshots_with_gpt4(
-                prompt_with_history, screenshots
-            )
-            logger.info(f"GPT-4 Response: {output_text}")
-            conversation_manager.add_message(
-                "assistant",
-                f"Scene analysis based on multiple view screenshots:\n{output_text}",
+
+            # Runs on the main thread once GPT-4 has answered
+            def handle_response(output_text):
+                logger.info(f"GPT-4 Response: {output_text}")
+                bpy.context.scene.conversation_manager.add_message(
+                    "assistant",
+                    f"Scene analysis based on multiple view screenshots:\n{output_text}",
+                )
+                execute_blender_command(output_text)
+
+            get_async_runner().call_when_done(
+                analyze_screenshots_with_gpt4_async(prompt_with_history, screenshots),
+                handle_response,
             )
-            execute_blender_command(output_text)
             return {"FINISHED"}
         except Exception as e:
             logger.error(f"Error in OBJECT_OT_send_screenshots_to_gpt.execute: {e}")
@@ -199,14 +341,18 @@ class OBJECT_OT_analyze_screenshots(Operator):
 
             prompt_with_history = add_history_to_prompt(context, prompt)
             screenshots = get_screenshots()
-            analysis_result = analyze_screenshots_with_gpt4(
-                prompt_with_history, screenshots
-            )
-            logger.info(f"Screenshot Analysis Result: {analysis_result}")
-            conversation_manager = context.scene.conversation_manager
-            conversation_manager.add_message(
-                "assistant",
-                f"Scene analysis based on multiple view screenshots: {analysis_result}",
+
+            # Runs on the main thread once GPT-4 has answered
+            def handle_response(analysis_result):
+                logger.info(f"Screenshot Analysis Result: {analysis_result}")
+                bpy.context.scene.conversation_manager.add_message(
+                    "assistant",
+                    f"Scene analysis based on multiple view screenshots: {analysis_result}",
+                )
+
+            get_async_runner().call_when_done(
+                analyze_screenshots_with_gpt4_async(prompt_with_history, screenshots),
+                handle_response,
             )
         except Exception as e:
             logger.error(f"Error in OBJECT_OT_analyze_screenshots.execute: {e}")
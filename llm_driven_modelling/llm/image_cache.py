@@ -0,0 +1,221 @@
+# image_cache.py
+
+"""
+This module provides an in-memory cache of the base64 payloads of images sent to vision models.
+One evaluation pass sends the same screenshots to every evaluator, so each image file is read and
+encoded once per render instead of once per request. Entries are keyed by the file path, its
+modification time and size; when a file is rewritten, its content hash decides whether the
+previous payload can still be used. Downscaled and recompressed variants (e.g. JPEG or WebP at a
+target edge length) are cached by content hash as well.
+Images captured in memory are accepted too: any object with name, media_type, data (the encoded
+image bytes) and digest (the SHA-256 of data) attributes, such as screenshot_module.Screenshot.
+"""
+
+import io
+import os
+import base64
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Total size of cached payloads before the least recently used ones are evicted
+IMAGE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+# Variant sent to the vision models, e.g. VISION_IMAGE_MAX_EDGE=768 and VISION_IMAGE_FORMAT=jpeg.
+# By default the original files are sent unchanged.
+VISION_IMAGE_MAX_EDGE = int(os.getenv("VISION_IMAGE_MAX_EDGE", "0")) or None
+VISION_IMAGE_FORMAT = os.getenv("VISION_IMAGE_FORMAT") or None
+VARIANT_QUALITY = 85
+
+MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+}
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "jpg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+}
+
+
+class ImagePayloadCache:
+    """LRU cache of base64 encoded images and their recompressed variants."""
+
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): The total payload size to keep before evicting.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._files = {}  # abspath -> (mtime_ns, size, content hash)
+        self._payloads = OrderedDict()  # (content hash, variant) -> (media type, data)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_payload(self, image_path, max_edge=None, image_format=None):
+        """
+        Get the media type and base64 data of an image, encoding it only if it changed.
+
+        Args:
+            image_path (str): The path to the image file, or an in-memory image.
+            max_edge (int, optional): Downscale so the longer edge is at most this many pixels.
+            image_format (str, optional): Recompress as "png", "jpeg" or "webp".
+
+        Returns:
+            tuple: The media type (e.g. "image/png") and the base64 encoded image string.
+        """
+        variant = (max_edge, image_format.lower() if image_format else None)
+        if not isinstance(image_path, (str, os.PathLike)):
+            return self._get_memory_payload(image_path, variant)
+        path = os.path.abspath(image_path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                payload = self._lookup((entry[2], variant))
+                if payload is not None:
+                    return payload
+            else:
+                self.misses += 1
+
+        # Read, hash and encode without holding the lock, so other images are not blocked
+        with open(path, "rb") as image_file:
+            data = image_file.read()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._files[path] = (stat.st_mtime_ns, stat.st_size, digest)
+            # A re-render with identical content keeps its payloads
+            payload = self._lookup((digest, variant), count=False)
+            if payload is not None:
+                return payload
+        media_type = MEDIA_TYPES.get(os.path.splitext(path)[1].lower(), "image/png")
+        return self._encode_and_store((digest, variant), media_type, data)
+
+    def _get_memory_payload(self, image, variant):
+        """Get the payload of an in-memory image, keyed by its content hash."""
+        # Encode outside the lock; the image encodes its data once
+        data = image.data
+        key = (image.digest, variant)
+        with self._lock:
+            payload = self._lookup(key)
+            if payload is not None:
+                return payload
+        return self._encode_and_store(key, image.media_type, data)
+
+    def _lookup(self, key, count=True):
+        """Get a cached payload, counting the hit or miss. Must hold the lock."""
+        payload = self._payloads.get(key)
+        if payload is None:
+            self.misses += count
+            return None
+        self.hits += count
+        self._payloads.move_to_end(key)
+        return payload
+
+    def _encode_and_store(self, key, media_type, data):
+        """Encode a payload outside the lock and cache it."""
+        payload = self._encode(media_type, data, *key[1])
+        with self._lock:
+            # Another thread may have encoded the same image meanwhile
+            existing = self._payloads.get(key)
+            if existing is not None:
+                self._payloads.move_to_end(key)
+                return existing
+            self._store(key, payload)
+        return payload
+
+    @staticmethod
+    def _encode(media_type, data, max_edge, image_format):
+        if max_edge is None and image_format is None:
+            return media_type, base64.b64encode(data).decode("utf-8")
+
+        from PIL import Image
+
+        pil_format, media_type = IMAGE_FORMATS[image_format or "png"]
+        with Image.open(io.BytesIO(data)) as image:
+            if max_edge is not None and max(image.size) > max_edge:
+                image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            if pil_format == "JPEG" and image.mode != "RGB":
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            if pil_format == "PNG":
+                image.save(buffer, format=pil_format, optimize=True)
+            else:
+                image.save(buffer, format=pil_format, quality=VARIANT_QUALITY)
+        return media_type, base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+    def _store(self, key, payload):
+        self._payloads[key] = payload
+        self._size += len(payload[1])
+        while self._size > self.max_bytes and len(self._payloads) > 1:
+            _, (_, data) = self._payloads.popitem(last=False)
+            self._size -= len(data)
+
+    def stats(self):
+        """
+        Get the cache hit and miss counters.
+
+        Returns:
+            dict: The number of hits, misses, cached payloads and bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._payloads),
+                "bytes": self._size,
+            }
+
+    def clear(self):
+        """Forget every cached payload."""
+        with self._lock:
+            self._files.clear()
+            self._payloads.clear()
+            self._size = 0
+
+
+def get_image_name(image):
+    """
+    Get the name of an image file without its extension, or the name of an in-memory image.
+
+    Args:
+        image (str): The path to the image file, or an in-memory image.
+
+    Returns:
+        str: The name, e.g. "Top View".
+    """
+    if isinstance(image, (str, os.PathLike)):
+        return os.path.splitext(os.path.basename(image))[0]
+    return image.name
+
+
+_image_cache = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    """
+    Get the process-wide image payload cache.
+
+    Returns:
+        ImagePayloadCache: The shared cache.
+    """
+    global _image_cache
+    with _image_cache_lock:
+        if _image_cache is None:
+            _image_cache = ImagePayloadCache()
+        return _image_cache
@@ -0,0 +1,299 @@
+# llm_transport.py
+
+"""
+This module provides the shared HTTP transport for the GPT and Claude modules.
+It keeps one OpenAI client, one Anthropic client and one requests session alive for the
+whole Blender session, so consecutive calls reuse pooled keep-alive connections instead of
+opening a new TLS connection for every request. Pool size, timeouts and API base URLs are
+configurable, which also allows pointing both modules at a local server. The SDK clients do
+not retry on their own; retries are handled by the rate limiter (see rate_limiter.py).
+
+The async clients are bound to the event loop of the async runner (see async_runner.py)
+and must only be awaited on that loop.
+"""
+
+import os
+import logging
+import threading
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from anthropic import Anthropic, AsyncAnthropic
+from openai import OpenAI, AsyncOpenAI
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(dotenv_path="D:/Tencent_Supernova/api/.env")
+
+# Number of keep-alive connections kept per host
+DEFAULT_POOL_SIZE = 10
+# Seconds to establish a connection
+DEFAULT_CONNECT_TIMEOUT = 10.0
+# Seconds to wait for a response; reasoning models can take several minutes
+DEFAULT_READ_TIMEOUT = 600.0
+# Seconds an idle connection is kept open
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+
+
+class LLMTransport:
+    """Owner of the pooled HTTP clients used to talk to the LLM APIs."""
+
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+        openai_base_url=None,
+        anthropic_base_url=None,
+    ):
+        """
+        Initialize the transport without opening any connection.
+
+        Args:
+            pool_size (int): The number of keep-alive connections kept per host.
+            connect_timeout (float): Seconds to establish a connection.
+            read_timeout (float): Seconds to wait for a response.
+            keepalive_expiry (float): Seconds an idle connection is kept open.
+            openai_base_url (str, optional): The OpenAI API base URL, e.g. of a local server.
+            anthropic_base_url (str, optional): The Anthropic API base URL.
+        """
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.openai_base_url = (
+            openai_base_url or os.getenv("OPENAI_BASE_URL") or DEFAULT_OPENAI_BASE_URL
+        )
+        self.anthropic_base_url = (
+            anthropic_base_url
+            or os.getenv("ANTHROPIC_BASE_URL")
+            or DEFAULT_ANTHROPIC_BASE_URL
+        )
+        self._session = None
+        self._openai_client = None
+        self._anthropic_client = None
+        self._async_http_client = None
+        self._async_openai_client = None
+        self._async_anthropic_client = None
+        self._lock = threading.Lock()
+
+    def _get_client_options(self):
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+        }
+
+    def _create_httpx_client(self):
+        return httpx.Client(**self._get_client_options())
+
+    def _get_openai_headers(self, headers=None):
+        request_headers = {
+            "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
+            "Content-Type": "application/json",
+        }
+        request_headers.update(headers or {})
+        return request_headers
+
+    @property
+    def session(self):
+        """The shared requests session for direct REST calls."""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    @property
+    def openai_client(self):
+        """The shared OpenAI client."""
+        with self._lock:
+            if self._openai_client is None:
+                self._openai_client = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    base_url=self.openai_base_url,
+                    http_client=self._create_httpx_client(),
+                    max_retries=0,
+                )
+            return self._openai_client
+
+    @property
+    def anthropic_client(self):
+        """The shared Anthropic client."""
+        with self._lock:
+            if self._anthropic_client is None:
+                self._anthropic_client = Anthropic(
+                    api_key=os.getenv("ANTHROPIC_API_KEY"),
+                    base_url=self.anthropic_base_url,
+                    http_client=self._create_httpx_client(),
+                    max_retries=0,
+                )
+            return self._anthropic_client
+
+    def post_json(self, path, payload, headers=None):
+        """
+        POST a JSON payload to the OpenAI API through the pooled session.
+
+        Args:
+            path (str): The endpoint path relative to the base URL, e.g. "/chat/completions".
+            payload (dict): The JSON request body.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            dict: The decoded JSON response.
+
+        Raises:
+            requests.HTTPError: If the API answers with an error status.
+        """
+        response = self.session.post(
+            self.openai_base_url.rstrip("/") + path,
+            headers=self._get_openai_headers(headers),
+            json=payload,
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @property
+    def async_http_client(self):
+        """The shared httpx.AsyncClient for direct REST calls."""
+        with self._lock:
+            if self._async_http_client is None:
+                self._async_http_client = httpx.AsyncClient(
+                    **self._get_client_options()
+                )
+            return self._async_http_client
+
+    @property
+    def async_openai_client(self):
+        """The shared AsyncOpenAI client."""
+        with self._lock:
+            if self._async_openai_client is None:
+                self._async_openai_client = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    base_url=self.openai_base_url,
+                    http_client=httpx.AsyncClient(**self._get_client_options()),
+                    max_retries=0,
+                )
+            return self._async_openai_client
+
+    @property
+    def async_anthropic_client(self):
+        """The shared AsyncAnthropic client."""
+        with self._lock:
+            if self._async_anthropic_client is None:
+                self._async_anthropic_client = AsyncAnthropic(
+                    api_key=os.getenv("ANTHROPIC_API_KEY"),
+                    base_url=self.anthropic_base_url,
+                    http_client=httpx.AsyncClient(**self._get_client_options()),
+                    max_retries=0,
+                )
+            return self._async_anthropic_client
+
+    async def post_json_async(self, path, payload, headers=None):
+        """
+        POST a JSON payload to the OpenAI API through the pooled async client.
+
+        Args:
+            path (str): The endpoint path relative to the base URL, e.g. "/chat/completions".
+            payload (dict): The JSON request body.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            dict: The decoded JSON response.
+
+        Raises:
+            httpx.HTTPStatusError: If the API answers with an error status.
+        """
+        response = await self.async_http_client.post(
+            self.openai_base_url.rstrip("/") + path,
+            headers=self._get_openai_headers(headers),
+            json=payload,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        """
+        Close every pooled connection of the blocking clients and drop the async ones.
+
+        Clients are recreated on next use. Async connections are released when their
+        event loop closes.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            if self._openai_client is not None:
+                self._openai_client.close()
+            if self._anthropic_client is not None:
+                self._anthropic_client.close()
+            self._session = None
+            self._openai_client = None
+            self._anthropic_client = None
+        self.reset_async_clients()
+
+    def reset_async_clients(self):
+        """Drop the async clients, e.g. after their event loop was closed."""
+        with self._lock:
+            self._async_http_client = None
+            self._async_openai_client = None
+            self._async_anthropic_client = None
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """
+    Get the process-wide LLM transport.
+
+    Returns:
+        LLMTransport: The shared transport.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = LLMTransport()
+        return _transport
+
+
+def configure_transport(**kwargs):
+    """
+    Replace the process-wide transport, closing the connections of the old one.
+
+    Args:
+        **kwargs: Keyword arguments for LLMTransport, e.g. pool_size or openai_base_url.
+
+    Returns:
+        LLMTransport: The new transport.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = LLMTransport(**kwargs)
+        logger.info(
+            f"LLM transport configured: pool size {_transport.pool_size}, "
+            f"OpenAI {_transport.openai_base_url}, "
+            f"Anthropic {_transport.anthropic_base_url}"
+        )
+        return _transport
@@ -0,0 +1,668 @@
+# rate_limiter.py
+
+"""
+This module provides client-side rate limiting for the LLM providers.
+Every API call made by gpt_module and claude_module passes through a shared RateLimiter, which
+keeps a requests-per-minute and, if a tier is configured, a tokens-per-minute token bucket for each
+provider and model, bounds the number of requests in flight per provider, and retries rate-limited (429) and
+server-side (5xx) failures with jittered exponential backoff. Callers therefore queue up instead
+of failing when many requests are issued in parallel.
+
+The limits are read from the environment when the limiter is created, e.g. ANTHROPIC_TPM=40000
+for a tier with 40k tokens per minute; LLM_MODEL_RATE_LIMITS takes per-model overrides as JSON,
+e.g. {"gpt-4o": {"rpm": 500, "tpm": 30000}}. Without a configured tpm no token bucket is kept.
+"""
+
+import io
+import os
+import json
+import math
+import time
+import base64
+import random
+import asyncio
+import logging
+import threading
+import contextlib
+import contextvars
+import httpx
+import requests
+import anthropic
+import openai
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Default requests and tokens per minute of each provider; a tpm of None keeps no token bucket.
+# Overridden by the <PROVIDER>_RPM and <PROVIDER>_TPM environment variables.
+RATE_LIMITS = {
+    "openai": {"rpm": 500, "tpm": None},
+    "anthropic": {"rpm": 50, "tpm": None},
+}
+# Requests of one provider allowed in flight at the same time
+MAX_IN_FLIGHT = {"openai": 8, "anthropic": 8}
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# Tokens assumed for an image whose size cannot be read and for a reply without max_tokens
+IMAGE_TOKEN_ESTIMATE = 1600
+DEFAULT_OUTPUT_TOKEN_ESTIMATE = 1000
+# Image token rules of the providers
+OPENAI_LOW_DETAIL_TOKENS = 85
+OPENAI_TILE_TOKENS = 170
+OPENAI_TILE_SIZE = 512
+OPENAI_MAX_EDGE = 2048
+OPENAI_SHORT_EDGE = 768
+ANTHROPIC_MAX_EDGE = 1568
+ANTHROPIC_PIXELS_PER_TOKEN = 750
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+# Called each time a request of the current thread or task is admitted and sent
+_admission_callback = contextvars.ContextVar("admission_callback", default=None)
+
+
+@contextlib.contextmanager
+def on_admission(callback):
+    """
+    Call a function whenever the rate limiter admits a request made within the block.
+
+    The callback runs after the throttling wait and the in-flight wait, right before the
+    request is sent, so callers can time the request itself, e.g. for a timeout.
+
+    Args:
+        callback (callable): A function without arguments.
+    """
+    token = _admission_callback.set(callback)
+    try:
+        yield
+    finally:
+        _admission_callback.reset(token)
+
+
+def notify_admission():
+    """Call the admission callback of the current thread or task, if any."""
+    callback = _admission_callback.get()
+    if callback is not None:
+        callback()
+
+
+def get_rate_limits():
+    """
+    Get the rate limits of each provider, with the environment's overrides applied.
+
+    Returns:
+        tuple: The per-provider limits and the per-model limits.
+    """
+    rate_limits = {}
+    for provider, defaults in RATE_LIMITS.items():
+        limits = dict(defaults)
+        for key in ("rpm", "tpm"):
+            value = os.getenv(f"{provider.upper()}_{key.upper()}")
+            if value:
+                limits[key] = float(value)
+        rate_limits[provider] = limits
+    model_rate_limits = json.loads(os.getenv("LLM_MODEL_RATE_LIMITS") or "{}")
+    return rate_limits, model_rate_limits
+
+
+def get_image_size(data):
+    """
+    Get the width and height of a base64 encoded image.
+
+    PNG dimensions are read from the first bytes; other formats are opened with Pillow.
+
+    Args:
+        data (str): The base64 encoded image.
+
+    Returns:
+        tuple or None: The width and height, or None if they cannot be read.
+    """
+    if not data:
+        return None
+    try:
+        # The signature, the IHDR chunk header, the width and the height
+        header = base64.b64decode(data[:32])
+        if header[:8] == PNG_SIGNATURE and header[12:16] == b"IHDR":
+            return int.from_bytes(header[16:20], "big"), int.from_bytes(
+                header[20:24], "big"
+            )
+        from PIL import Image
+
+        with Image.open(io.BytesIO(base64.b64decode(data))) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def estimate_image_tokens(part):
+    """
+    Estimate the input tokens of an image part from its dimensions.
+
+    Args:
+        part (dict): An OpenAI "image_url" or Anthropic "image" content part.
+
+    Returns:
+        int: The estimated tokens.
+    """
+    if part.get("type") == "image_url":
+        image_url = part.get("image_url", {})
+        if image_url.get("detail") == "low":
+            return OPENAI_LOW_DETAIL_TOKENS
+        url = image_url.get("url", "")
+        size = get_image_size(url.split(",", 1)[1] if url.startswith("data:") else None)
+        if size is None:
+            return IMAGE_TOKEN_ESTIMATE
+        width, height = size
+        scale = min(1.0, OPENAI_MAX_EDGE / max(width, height))
+        scale *= min(1.0, OPENAI_SHORT_EDGE / (min(width, height) * scale))
+        tiles = math.ceil(width * scale / OPENAI_TILE_SIZE) * math.ceil(
+            height * scale / OPENAI_TILE_SIZE
+        )
+        return OPENAI_LOW_DETAIL_TOKENS + OPENAI_TILE_TOKENS * tiles
+    source = part.get("source", {})
+    size = (
+        get_image_size(source.get("data")) if source.get("type") == "base64" else None
+    )
+    if size is None:
+        return IMAGE_TOKEN_ESTIMATE
+    width, height = size
+    scale = min(1.0, ANTHROPIC_MAX_EDGE / max(width, height))
+    return math.ceil(width * height * scale * scale / ANTHROPIC_PIXELS_PER_TOKEN)
+
+
+def estimate_request_tokens(request):
+    """
+    Estimate the tokens a request will consume, before it is sent.
+
+    Text is counted at four characters per token, images from their dimensions by
+    the provider's rules, and the reply at max_tokens if the request sets it.
+
+    Args:
+        request (dict): The chat completion or messages request.
+
+    Returns:
+        tuple: The estimated input tokens and output tokens.
+    """
+    characters = 0
+    image_tokens = 0
+    for message in request.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            characters += len(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                characters += len(part.get("text", ""))
+            else:
+                image_tokens += estimate_image_tokens(part)
+    input_tokens = characters // 4 + image_tokens
+    output_tokens = request.get("max_tokens") or DEFAULT_OUTPUT_TOKEN_ESTIMATE
+    return input_tokens, output_tokens
+
+
+def get_status_code(error):
+    """
+    Get the HTTP status code carried by an API error, if any.
+
+    Args:
+        error (Exception): An exception raised by an API call.
+
+    Returns:
+        int or None: The status code.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_retryable(error):
+    """
+    Check whether a failed API call is worth retrying.
+
+    Args:
+        error (Exception): An exception raised by an API call.
+
+    Returns:
+        bool: True for rate limits, server errors, timeouts and connection errors.
+    """
+    status = get_status_code(error)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    return isinstance(
+        error,
+        (
+            openai.APIConnectionError,
+            anthropic.APIConnectionError,
+            requests.ConnectionError,
+            requests.Timeout,
+            httpx.TransportError,
+        ),
+    )
+
+
+def get_retry_after(error):
+    """
+    Get the delay requested by the server's Retry-After header.
+
+    Args:
+        error (Exception): An exception raised by an API call.
+
+    Returns:
+        float or None: Seconds to wait, or None if the server gave none.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity."""
+
+    def __init__(self, capacity, per_minute):
+        """
+        Initialize a full bucket.
+
+        Args:
+            capacity (float): The maximum number of tokens.
+            per_minute (float): Tokens added per minute.
+        """
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount):
+        """
+        Take tokens from the bucket, possibly into debt.
+
+        Reserving instead of waiting for tokens keeps callers in arrival order:
+        each one waits until the debt created before it has been refilled.
+
+        Args:
+            amount (float): The tokens needed.
+
+        Returns:
+            float: Seconds the caller must wait before using the tokens.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount):
+        """
+        Return tokens that were reserved but not used.
+
+        Args:
+            amount (float): The tokens to return; negative to take more.
+        """
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ModelLimiter:
+    """Request and token buckets of one provider and model."""
+
+    def __init__(self, rpm, tpm):
+        """
+        Initialize the buckets.
+
+        Args:
+            rpm (float): Requests per minute.
+            tpm (float or None): Tokens per minute, or None to not limit tokens.
+        """
+        self.requests = TokenBucket(rpm, rpm)
+        self.tokens = TokenBucket(tpm, tpm) if tpm else None
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "throttled_seconds": 0.0,
+            "tokens": 0,
+        }
+
+    def reserve(self, tokens):
+        """
+        Reserve one request and the estimated tokens.
+
+        Args:
+            tokens (float): The estimated tokens of the request.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        wait = self.requests.reserve(1)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def refund(self, tokens):
+        """
+        Return reserved tokens that were not used.
+
+        Args:
+            tokens (float): The tokens to return; negative to take more.
+        """
+        if self.tokens is not None:
+            self.tokens.refund(tokens)
+
+
+def wake_waiter(waiter):
+    """Resolve the future of a waiting coroutine unless it was cancelled."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class InFlightLimit:
+    """Counter bounding the requests in flight, shared by threads and the async runner."""
+
+    def __init__(self, limit):
+        """
+        Initialize the counter.
+
+        Args:
+            limit (int): The number of requests allowed in flight.
+        """
+        self.limit = limit
+        self.count = 0
+        self.peak = 0
+        self._condition = threading.Condition()
+        # Futures of coroutines waiting for a slot, with their event loops
+        self._async_waiters = []
+
+    def try_acquire(self):
+        """Take a slot if one is free, without waiting."""
+        with self._condition:
+            if self.count >= self.limit:
+                return False
+            self.count += 1
+            self.peak = max(self.peak, self.count)
+            return True
+
+    def acquire(self):
+        """Take a slot, waiting until one is free."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.count < self.limit)
+            self.count += 1
+            self.peak = max(self.peak, self.count)
+
+    async def acquire_async(self):
+        """
+        Take a slot without blocking the event loop.
+
+        Slots are also freed by threads, so the waiting coroutine is woken through a
+        future set from its event loop rather than with an asyncio.Condition.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.count < self.limit:
+                    self.count += 1
+                    self.peak = max(self.peak, self.count)
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self):
+        """Free a slot, waking a waiting thread and the waiting coroutines."""
+        with self._condition:
+            self.count -= 1
+            self._condition.notify()
+            waiters, self._async_waiters = self._async_waiters, []
+        # Every woken coroutine checks for a free slot again
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(wake_waiter, waiter)
+
+
+class RateLimiter:
+    """Shared rate limiter and retry policy for all LLM calls."""
+
+    def __init__(
+        self,
+        rate_limits=None,
+        model_rate_limits=None,
+        max_in_flight=None,
+        max_retries=MAX_RETRIES,
+        backoff_base=BACKOFF_BASE,
+        backoff_max=BACKOFF_MAX,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate_limits (dict, optional): Requests and tokens per minute of each provider.
+                Defaults to RATE_LIMITS with the environment's overrides.
+            model_rate_limits (dict, optional): Per-model overrides of rate_limits.
+                Defaults to LLM_MODEL_RATE_LIMITS from the environment.
+            max_in_flight (dict, optional): Requests allowed in flight per provider.
+            max_retries (int): Retries of a failed call before giving up.
+            backoff_base (float): Seconds before the first retry.
+            backoff_max (float): The longest wait between retries.
+        """
+        env_rate_limits, env_model_rate_limits = get_rate_limits()
+        self.rate_limits = rate_limits or env_rate_limits
+        self.model_rate_limits = model_rate_limits or env_model_rate_limits
+        self.max_in_flight = max_in_flight or MAX_IN_FLIGHT
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limiters = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_limiter(self, provider, model):
+        """
+        Get the buckets of a provider and model.
+
+        Args:
+            provider (str): "openai" or "anthropic".
+            model (str): The model name.
+
+        Returns:
+            ModelLimiter: The limiter, created on first use.
+        """
+        with self._lock:
+            key = (provider, model)
+            if key not in self._limiters:
+                limits = self.model_rate_limits.get(model) or self.rate_limits.get(
+                    provider, {"rpm": 60, "tpm": None}
+                )
+                self._limiters[key] = ModelLimiter(limits["rpm"], limits.get("tpm"))
+            return self._limiters[key]
+
+    def get_in_flight(self, provider):
+        """
+        Get the in-flight bound of a provider.
+
+        Args:
+            provider (str): "openai" or "anthropic".
+
+        Returns:
+            InFlightLimit: The bound, created on first use.
+        """
+        with self._lock:
+            if provider not in self._in_flight:
+                self._in_flight[provider] = InFlightLimit(
+                    self.max_in_flight.get(provider, 4)
+                )
+            return self._in_flight[provider]
+
+    def get_backoff(self, attempt, error):
+        """
+        Get the wait before a retry: the server's Retry-After, or full-jitter exponential backoff.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting at 0.
+            error (Exception): The error of the failed attempt.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _start(self, limiter, input_tokens, output_tokens):
+        with self._lock:
+            limiter.stats["requests"] += 1
+        return limiter.reserve(input_tokens + output_tokens)
+
+    def _settle(self, limiter, input_tokens, output_tokens, result):
+        # The reply's length replaces the reserved output estimate
+        used = len(result) // 4 if isinstance(result, str) else output_tokens
+        limiter.refund(output_tokens - used)
+        with self._lock:
+            limiter.stats["tokens"] += input_tokens + used
+
+    def _should_retry(self, limiter, provider, model, attempt, error, tokens):
+        # A failed attempt did not use its tokens; a retry reserves them again
+        limiter.refund(tokens)
+        if attempt >= self.max_retries or not is_retryable(error):
+            with self._lock:
+                limiter.stats["failures"] += 1
+            return False
+        with self._lock:
+            limiter.stats["retries"] += 1
+        logger.warning(
+            f"{provider} {model} call failed (attempt {attempt + 1}, "
+            f"status {get_status_code(error)}), retrying: {str(error)}"
+        )
+        return True
+
+    def call(self, provider, request, call):
+        """
+        Make an API call within the rate limits, retrying transient failures.
+
+        Args:
+            provider (str): "openai" or "anthropic".
+            request (dict): The request, used to pick the model and estimate tokens.
+            call (callable): A function without arguments that sends the request.
+
+        Returns:
+            object: The result of call.
+        """
+        model = request.get("model")
+        limiter = self.get_limiter(provider, model)
+        in_flight = self.get_in_flight(provider)
+        input_tokens, output_tokens = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            wait = self._start(limiter, input_tokens, output_tokens)
+            if wait > 0:
+                with self._lock:
+                    limiter.stats["throttled_seconds"] += wait
+                time.sleep(wait)
+            in_flight.acquire()
+            notify_admission()
+            try:
+                result = call()
+            except Exception as e:
+                if not self._should_retry(
+                    limiter, provider, model, attempt, e, input_tokens + output_tokens
+                ):
+                    raise
+                delay = self.get_backoff(attempt, e)
+            else:
+                self._settle(limiter, input_tokens, output_tokens, result)
+                return result
+            finally:
+                in_flight.release()
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, provider, request, call):
+        """
+        Async counterpart of call.
+
+        Args:
+            provider (str): "openai" or "anthropic".
+            request (dict): The request, used to pick the model and estimate tokens.
+            call (callable): A function without arguments returning a coroutine.
+
+        Returns:
+            object: The result of the coroutine.
+        """
+        model = request.get("model")
+        limiter = self.get_limiter(provider, model)
+        in_flight = self.get_in_flight(provider)
+        input_tokens, output_tokens = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            wait = self._start(limiter, input_tokens, output_tokens)
+            if wait > 0:
+                with self._lock:
+                    limiter.stats["throttled_seconds"] += wait
+                await asyncio.sleep(wait)
+            await in_flight.acquire_async()
+            notify_admission()
+            try:
+                result = await call()
+            except Exception as e:
+                if not self._should_retry(
+                    limiter, provider, model, attempt, e, input_tokens + output_tokens
+                ):
+                    raise
+                delay = self.get_backoff(attempt, e)
+            else:
+                self._settle(limiter, input_tokens, output_tokens, result)
+                return result
+            finally:
+                in_flight.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        """
+        Get the usage counters.
+
+        Returns:
+            dict: Per "provider/model": requests, retries, failures, seconds spent
+                throttled and tokens used; per provider: the peak number in flight.
+        """
+        with self._lock:
+            stats = {
+                f"{provider}/{model}": dict(limiter.stats)
+                for (provider, model), limiter in self._limiters.items()
+            }
+            for provider, in_flight in self._in_flight.items():
+                stats[f"{provider}/peak_in_flight"] = in_flight.peak
+            return stats
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Get the process-wide rate limiter.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
@@ -0,0 +1,291 @@
+# response_cache.py
+
+"""
+This module provides a persistent, content-addressed cache of LLM responses.
+Each response is keyed by a hash of the provider and the complete request, i.e. the model name,
+the sampling parameters, the prompt text and any attached image bytes. The cache has three modes:
+
+    off     - every call goes to the API (default)
+    record  - cached responses are reused, new ones are stored
+    replay  - only cached responses are returned; a miss raises CacheMissError, so a run
+              is fully offline and deterministic
+
+The mode is read from the LLM_CACHE_MODE environment variable and can be changed at runtime.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(dotenv_path="D:/Tencent_Supernova/api/.env")
+
+RESPONSE_CACHE_PATH = "./database/llm_response_cache.sqlite3"
+# Total size of stored responses before the least recently used ones are evicted
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_MODES = ("off", "record", "replay")
+
+
+class CacheMissError(Exception):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class ResponseCache:
+    """SQLite-backed store of LLM responses keyed by request hash."""
+
+    def __init__(
+        self, db_path=RESPONSE_CACHE_PATH, max_bytes=RESPONSE_CACHE_MAX_BYTES, mode=None
+    ):
+        """
+        Initialize the cache. The database is opened on first use.
+
+        Args:
+            db_path (str): The path to the SQLite database file.
+            max_bytes (int): The total response size to keep before evicting.
+            mode (str, optional): "off", "record" or "replay". Defaults to LLM_CACHE_MODE.
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.mode = "off"
+        self.set_mode(mode or os.getenv("LLM_CACHE_MODE", "off"))
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def set_mode(self, mode):
+        """
+        Change the cache mode.
+
+        Args:
+            mode (str): "off", "record" or "replay".
+        """
+        mode = mode.lower()
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        if mode != self.mode:
+            logger.info(f"LLM response cache mode: {mode}")
+        self.mode = mode
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT NOT NULL, model TEXT, "
+                "response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    @staticmethod
+    def make_key(provider, request):
+        """
+        Build the cache key of a request.
+
+        Args:
+            provider (str): The API provider, e.g. "openai" or "anthropic".
+            request (dict): The complete request, including model, parameters and messages.
+
+        Returns:
+            str: The hex digest identifying the request.
+        """
+        payload = json.dumps(
+            [provider, request], sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a recorded response and mark it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str or None: The recorded response, or None on a miss.
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            connection.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            connection.commit()
+            return row[0]
+
+    def put(self, key, provider, model, response):
+        """
+        Record a response, evicting the least recently used ones if the cache is full.
+
+        Args:
+            key (str): The cache key.
+            provider (str): The API provider.
+            model (str): The model name.
+            response (str): The response text.
+        """
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, provider, model, response, size, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, size, now, now),
+            )
+            self._evict(connection)
+            connection.commit()
+
+    def _evict(self, connection):
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_used"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} cached LLM responses")
+
+    def _lookup(self, provider, request):
+        """Return the key and the recorded response (or None) of a request."""
+        key = self.make_key(provider, request)
+        response = self.get(key)
+        if response is None and self.mode == "replay":
+            raise CacheMissError(
+                f"No recorded {provider} response for model {request.get('model')}"
+            )
+        return key, response
+
+    def _record(self, key, provider, request, response):
+        # Empty responses are failures of the API call and are not recorded
+        if response:
+            self.put(key, provider, request.get("model"), response)
+
+    def get_or_call(self, provider, request, call):
+        """
+        Return the recorded response of a request, or make the call and record its response.
+
+        Args:
+            provider (str): The API provider.
+            request (dict): The complete request.
+            call (callable): A function without arguments that sends the request and returns the text.
+
+        Returns:
+            str: The response text.
+        """
+        if self.mode == "off":
+            return call()
+        key, response = self._lookup(provider, request)
+        if response is not None:
+            return response
+        response = call()
+        self._record(key, provider, request, response)
+        return response
+
+    async def get_or_call_async(self, provider, request, call):
+        """
+        Async counterpart of get_or_call.
+
+        Args:
+            provider (str): The API provider.
+            request (dict): The complete request.
+            call (callable): A function without arguments returning a coroutine of the text.
+
+        Returns:
+            str: The response text.
+        """
+        if self.mode == "off":
+            return await call()
+        key, response = self._lookup(provider, request)
+        if response is not None:
+            return response
+        response = await call()
+        self._record(key, provider, request, response)
+        return response
+
+    def stats(self):
+        """
+        Get the cache hit and miss counters.
+
+        Returns:
+            dict: The number of hits, misses, stored responses and bytes, and the hit rate.
+        """
+        with self._lock:
+            entries, size = (
+                self._connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")
+                .fetchone()
+            )
+            total = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    def reset_stats(self):
+        """Reset the hit and miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def clear(self):
+        """Delete every recorded response."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM responses")
+            connection.commit()
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Get the process-wide LLM response cache.
+
+    Returns:
+        ResponseCache: The shared cache.
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
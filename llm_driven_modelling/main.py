@@ -208,6 +208,23 @@ classes = (
 )
 
 
+def warm_up_databases():
+    """
+    Load the document retrievers in background threads.
+
+    Registration does not wait for them; an operator that needs a retriever
+    before it is ready blocks only on that one.
+    """
+    for retriever in (
+        bpy.types.Scene.modification_retriever,
+        bpy.types.Scene.generation_retriever,
+        bpy.types.Scene.component_retriever,
+        bpy.types.Scene.material_retriever,
+        bpy.types.Scene.style_retriever,
+    ):
+        retriever.warm()
+
+
 def register():
     try:
         for cls in classes:
@@ -248,6 +265,7 @@ def register():
         initialize_component_db()
         initialize_material_db()
         initialize_style_db()
+        warm_up_databases()
 
         logger.info("Registered all classes successfully.")
     except Exception as e:
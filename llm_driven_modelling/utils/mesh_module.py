@@ -0,0 +1,37 @@
+# mesh_module.py
+
+"""
+This module provides a vectorized read of evaluated mesh geometry.
+The geometry checks and the label visibility test both need an object's triangles in
+world space, including its modifiers; they share this single read through foreach_get.
+"""
+
+import numpy as np
+
+
+def get_world_mesh(obj, depsgraph):
+    """
+    Read the evaluated mesh of an object, including its modifiers, in world space.
+
+    Args:
+        obj (bpy.types.Object): The mesh object.
+        depsgraph (bpy.types.Depsgraph): The evaluated dependency graph.
+
+    Returns:
+        tuple: An (N, 3) float64 array of world-space vertices and an (M, 3) int32
+            array of triangle vertex indices.
+    """
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", vertices)
+        triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", triangles)
+    finally:
+        evaluated.to_mesh_clear()
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    vertices = vertices.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    return vertices, triangles.reshape(-1, 3)
@@ -6,13 +6,76 @@ It includes features for camera positioning, object labeling, screenshot capture
 """
 
 import bpy
+import gpu
 import os
 import math
+import hashlib
+import tempfile
+import logging
 import mathutils
+import numpy as np
 from bpy.types import Panel, Operator
 from bpy.props import FloatProperty, StringProperty
 from bpy_extras.object_utils import world_to_camera_view
-import bmesh
+from llm_driven_modelling.utils.visibility_module import VisibilityEngine
+from llm_driven_modelling.utils.screenshot_module import (
+    Screenshot,
+    get_screenshot_path,
+    get_screenshot_writer,
+)
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+SCREENSHOTS_PATH = r"D:\GPT_driven_modeling\resources\screenshots"
+SCREENSHOT_SIZE = 750
+
+# "overlay" draws the labels onto the captured images, "objects" adds text objects to the scene
+LABEL_MODES = ("overlay", "objects")
+DEFAULT_LABEL_MODE = "overlay" if Image is not None else "objects"
+# Label text height relative to the image height, and its colors
+LABEL_FONT_RATIO = 0.022
+LABEL_COLOR = (255, 0, 0)
+LABEL_OUTLINE_COLOR = (0, 0, 0)
+# Custom property marking the text objects added as labels
+LABEL_TAG = "screenshot_label"
+
+# Object types whose evaluated geometry is hashed into the scene fingerprint
+GEOMETRY_TYPES = ("MESH", "CURVE", "SURFACE", "META", "FONT")
+# Node properties that only change the node editor layout
+NODE_LAYOUT_PROPERTIES = {
+    "location",
+    "width",
+    "height",
+    "dimensions",
+    "select",
+    "show_options",
+    "show_preview",
+    "show_texture",
+    "hide",
+    "label",
+    "use_custom_color",
+    "color",
+}
+
+# Contact sheet of all views, saved to <screenshot directory>/atlas/atlas.png
+ATLAS_DIR_NAME = "atlas"
+ATLAS_FILE_NAME = "atlas.png"
+ATLAS_COLUMNS = 4
+ATLAS_TILE_SIZE = 512
+ATLAS_BACKGROUND = (255, 255, 255)
+ATLAS_CAPTION_COLOR = (0, 0, 0)
+ATLAS_PROMPT_NOTE = """
+        Screenshots:
+        The views are tiled into one image, a grid of {columns} columns and {rows} rows. Each tile shows one view angle, named in its top-left corner.
+        """
+
+logger = logging.getLogger(__name__)
+
+# Fingerprint of the scene at the last capture and the screenshots it produced
+_last_capture = None
 
 
 def ensure_camera():
@@ -98,7 +161,7 @@ def set_camera_position_and_rotation(camera, look_from, look_at):
     camera.location = look_from
 
 
-def add_label_to_object(obj, camera, scene_size, up_vector):
+def add_label_to_object(obj, camera, scene_size, up_vector, visibility=None):
     """
     Add a label to an object in the scene.
 
@@ -107,11 +170,13 @@ def add_label_to_object(obj, camera, scene_size, up_vector):
         camera (bpy.types.Object): The camera object.
         scene_size (float): The size of the scene.
         up_vector (mathutils.Vector): The up vector for orienting the label.
+        visibility (VisibilityEngine, optional): The engine shared by the views of a
+            screenshot pass.
 
     Returns:
         bpy.types.Object: The created text object, or None if the object is not visible.
     """
-    is_visible, visible_point = is_object_visible(obj, camera)
+    is_visible, visible_point = is_object_visible(obj, camera, visibility)
     if not is_visible:
         return None
 
@@ -121,6 +186,7 @@ def add_label_to_object(obj, camera, scene_size, up_vector):
     text_obj = bpy.context.active_object
 
     text_obj.data.body = obj.name
+    text_obj[LABEL_TAG] = True
     text_obj.data.align_x = "CENTER"
     text_obj.data.align_y = "CENTER"
 
@@ -135,17 +201,7 @@ def add_label_to_object(obj, camera, scene_size, up_vector):
     distance_to_camera = (text_position - camera.location).length
     text_obj.data.size = scene_size * 0.02 * (distance_to_camera / scene_size)
 
-    material = bpy.data.materials.new(name="Text_Material")
-    material.use_nodes = True
-    nodes = material.node_tree.nodes
-    nodes.clear()
-
-    node_emission = nodes.new(type="ShaderNodeEmission")
-    node_emission.inputs[0].default_value = (1, 0, 0, 1)  # Red color
-    node_emission.inputs[1].default_value = 2  # Emission strength
-    node_output = nodes.new(type="ShaderNodeOutputMaterial")
-    material.node_tree.links.new(node_emission.outputs[0], node_output.inputs[0])
-
+    material = get_label_material()
     if text_obj.data.materials:
         text_obj.data.materials[0] = material
     else:
@@ -172,90 +228,559 @@ def add_label_to_object(obj, camera, scene_size, up_vector):
     return text_obj
 
 
-def is_object_visible(obj, camera):
+def get_label_material():
+    """
+    Get the red emission material of the labels, creating it on first use.
+
+    Returns:
+        bpy.types.Material: The shared label material.
+    """
+    material = bpy.data.materials.get("Text_Material")
+    if material is not None:
+        return material
+
+    material = bpy.data.materials.new(name="Text_Material")
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    nodes.clear()
+
+    node_emission = nodes.new(type="ShaderNodeEmission")
+    node_emission.inputs[0].default_value = (1, 0, 0, 1)  # Red color
+    node_emission.inputs[1].default_value = 2  # Emission strength
+    node_output = nodes.new(type="ShaderNodeOutputMaterial")
+    material.node_tree.links.new(node_emission.outputs[0], node_output.inputs[0])
+    return material
+
+
+def get_label_anchors(objects, camera, visibility):
+    """
+    Project a visible point of every object into the camera view, without changing the scene.
+
+    Args:
+        objects (list): The objects to label.
+        camera (bpy.types.Object): The camera object.
+        visibility (VisibilityEngine): The engine shared by the views of a screenshot pass.
+
+    Returns:
+        list: (name, x, y) tuples for the visible objects, with x and y in normalized
+            camera coordinates (0 to 1, origin at the bottom left).
+    """
+    anchors = []
+    for obj in objects:
+        is_visible, visible_point = visibility.find_visible_point(obj, camera)
+        if is_visible:
+            co_ndc = world_to_camera_view(bpy.context.scene, camera, visible_point)
+            anchors.append((obj.name, co_ndc.x, co_ndc.y))
+    return anchors
+
+
+def get_label_font(size):
+    """Load the label font at a pixel size, falling back to Pillow's fixed-size font."""
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def draw_labels(image, anchors):
+    """
+    Draw object names centered on their anchors onto a captured image.
+
+    Args:
+        image (PIL.Image.Image): The captured view.
+        anchors (list): (name, x, y) tuples from get_label_anchors.
+    """
+    draw = ImageDraw.Draw(image)
+    font_size = max(10, round(image.height * LABEL_FONT_RATIO))
+    font = get_label_font(font_size)
+    for name, x, y in anchors:
+        draw.text(
+            (x * image.width, (1 - y) * image.height),
+            name,
+            fill=LABEL_COLOR,
+            font=font,
+            anchor="mm",
+            stroke_width=max(1, font_size // 8),
+            stroke_fill=LABEL_OUTLINE_COLOR,
+        )
+
+
+def is_object_visible(obj, camera, visibility=None):
     """
     Check if an object is visible from the camera's perspective.
 
     Args:
         obj (bpy.types.Object): The object to check.
         camera (bpy.types.Object): The camera object.
+        visibility (VisibilityEngine, optional): The engine shared by the views of a
+            screenshot pass. A new one is created if not given.
 
     Returns:
         tuple: A tuple containing a boolean (True if visible) and the visible point (or None).
     """
+    if visibility is None:
+        visibility = VisibilityEngine()
+    return visibility.find_visible_point(obj, camera)
+
+
+def remove_labels():
+    """Remove the text objects added as labels from the scene."""
+    for obj in list(bpy.data.objects):
+        if obj.type == "FONT" and is_label(obj):
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def get_atlas_path(output_path):
+    """
+    Get the path of the contact sheet of the screenshots in a directory.
+
+    Args:
+        output_path (str): The screenshot directory.
+
+    Returns:
+        str: The path of the atlas image.
+    """
+    return os.path.join(output_path, ATLAS_DIR_NAME, ATLAS_FILE_NAME)
+
+
+def get_atlas_prompt_note(view_count, columns=ATLAS_COLUMNS):
+    """
+    Describe the layout of an atlas for a vision prompt.
+
+    Args:
+        view_count (int): The number of tiled views.
+        columns (int): The number of tiles per row.
+
+    Returns:
+        str: The prompt text describing the atlas.
+    """
+    return ATLAS_PROMPT_NOTE.format(
+        columns=columns, rows=math.ceil(view_count / columns)
+    )
+
+
+def render_screenshot_atlas(
+    screenshots, columns=ATLAS_COLUMNS, tile_size=ATLAS_TILE_SIZE
+):
+    """
+    Tile screenshots into one contact-sheet image, each tile captioned with its view name.
+
+    Args:
+        screenshots (list): The screenshot paths or Screenshot objects, in tile order.
+        columns (int): The number of tiles per row.
+        tile_size (int): The edge length of each square tile in pixels.
+
+    Returns:
+        PIL.Image.Image: The atlas.
+    """
+    if Image is None:
+        raise ValueError("Creating a screenshot atlas requires Pillow")
+    rows = math.ceil(len(screenshots) / columns)
+    atlas = Image.new("RGB", (columns * tile_size, rows * tile_size), ATLAS_BACKGROUND)
+    draw = ImageDraw.Draw(atlas)
+    font_size = max(10, round(tile_size * LABEL_FONT_RATIO * 1.5))
+    font = get_label_font(font_size)
+    for index, screenshot in enumerate(screenshots):
+        left = (index % columns) * tile_size
+        top = (index // columns) * tile_size
+        if isinstance(screenshot, Screenshot):
+            name = screenshot.name
+            tile = screenshot.to_image().convert("RGB")
+        else:
+            name = os.path.splitext(os.path.basename(screenshot))[0]
+            with Image.open(screenshot) as image:
+                tile = image.convert("RGB")
+        tile.thumbnail((tile_size, tile_size), Image.LANCZOS)
+        atlas.paste(
+            tile,
+            (
+                left + (tile_size - tile.width) // 2,
+                top + (tile_size - tile.height) // 2,
+            ),
+        )
+        draw.rectangle(
+            (left, top, left + tile_size - 1, top + tile_size - 1),
+            outline=ATLAS_CAPTION_COLOR,
+        )
+        draw.text(
+            (left + font_size // 2, top + font_size // 2),
+            name,
+            fill=ATLAS_CAPTION_COLOR,
+            font=font,
+            stroke_width=max(1, font_size // 8),
+            stroke_fill=ATLAS_BACKGROUND,
+        )
+    return atlas
+
+
+def create_screenshot_atlas(
+    screenshots, atlas_path=None, columns=ATLAS_COLUMNS, tile_size=ATLAS_TILE_SIZE
+):
+    """
+    Tile screenshots into one contact-sheet image and save it.
+
+    Args:
+        screenshots (list): The screenshot paths or Screenshot objects, in tile order.
+        atlas_path (str, optional): Where to save the atlas. Defaults to the atlas
+            directory next to the first screenshot file.
+        columns (int): The number of tiles per row.
+        tile_size (int): The edge length of each square tile in pixels.
+
+    Returns:
+        str: The path of the saved atlas.
+    """
+    if atlas_path is None:
+        atlas_path = get_atlas_path(os.path.dirname(screenshots[0]))
+    atlas = render_screenshot_atlas(screenshots, columns, tile_size)
+    os.makedirs(os.path.dirname(atlas_path), exist_ok=True)
+    atlas.save(atlas_path, optimize=True)
+    return atlas_path
 
-    def check_point(point):
-        co_ndc = world_to_camera_view(bpy.context.scene, camera, point)
-        if 0 <= co_ndc.x <= 1 and 0 <= co_ndc.y <= 1 and 0 < co_ndc.z:
-            direction = point - camera.location
-            depsgraph = bpy.context.evaluated_depsgraph_get()
 
-            offsets = [
-                mathutils.Vector((0, 0, 0)),
-                mathutils.Vector((0.001, 0.001, 0.001)),
-                mathutils.Vector((-0.001, -0.001, -0.001)),
-            ]
+def get_screenshot_atlas(
+    screenshot_paths, columns=ATLAS_COLUMNS, tile_size=ATLAS_TILE_SIZE
+):
+    """
+    Get the atlas of a set of screenshots, creating it if it is missing or outdated.
 
-            for offset in offsets:
-                ray_origin = camera.location + offset
-                ray_cast_result = bpy.context.scene.ray_cast(
-                    depsgraph, ray_origin, direction.normalized()
+    The atlas of screenshot files is saved next to them and reused while it is newer;
+    the atlas of in-memory screenshots is returned as a Screenshot as well.
+
+    Args:
+        screenshot_paths (list): The screenshot paths or Screenshot objects, in tile order.
+        columns (int): The number of tiles per row.
+        tile_size (int): The edge length of each square tile in pixels.
+
+    Returns:
+        str or Screenshot: The path of the atlas, or the atlas itself.
+    """
+    if isinstance(screenshot_paths[0], Screenshot):
+        return Screenshot.from_image(
+            os.path.splitext(ATLAS_FILE_NAME)[0],
+            render_screenshot_atlas(screenshot_paths, columns, tile_size),
+        )
+    atlas_path = get_atlas_path(os.path.dirname(screenshot_paths[0]))
+    if Image is None:
+        raise ValueError("Creating a screenshot atlas requires Pillow")
+    try:
+        atlas_mtime = os.stat(atlas_path).st_mtime_ns
+        with Image.open(atlas_path) as atlas:
+            atlas_size = atlas.size
+    except OSError:
+        return create_screenshot_atlas(screenshot_paths, atlas_path, columns, tile_size)
+    rows = math.ceil(len(screenshot_paths) / columns)
+    if atlas_size != (columns * tile_size, rows * tile_size) or any(
+        os.stat(path).st_mtime_ns > atlas_mtime for path in screenshot_paths
+    ):
+        return create_screenshot_atlas(screenshot_paths, atlas_path, columns, tile_size)
+    return atlas_path
+
+
+def hash_rna_properties(struct, digest, skip=()):
+    """Add the values of the non-pointer RNA properties of a struct to a hash."""
+    for prop in struct.bl_rna.properties:
+        if (
+            prop.identifier == "rna_type"
+            or prop.identifier in skip
+            or prop.type in ("POINTER", "COLLECTION")
+        ):
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if getattr(prop, "is_array", False):
+            value = tuple(value)
+        digest.update(f"{prop.identifier}={value!r}".encode("utf-8"))
+
+
+def hash_image(image, digest):
+    """Add an image's source and, if it was changed in memory, its pixels to a hash."""
+    digest.update(
+        f"{image.name}:{image.source}:{image.filepath}:{tuple(image.size)}".encode(
+            "utf-8"
+        )
+    )
+    if image.is_dirty or image.source == "GENERATED" or image.packed_file:
+        pixels = np.empty(len(image.pixels), dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        digest.update(pixels.tobytes())
+        return
+    try:
+        stat = os.stat(bpy.path.abspath(image.filepath))
+        digest.update(f"{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+    except OSError:
+        pass
+
+
+def hash_node_tree(node_tree, digest):
+    """Add the nodes, their settings and inputs, and the links of a node tree to a hash."""
+    for node in node_tree.nodes:
+        digest.update(f"{node.bl_idname}:{node.name}".encode("utf-8"))
+        # Settings that are not sockets, e.g. a Math operation or a Mix blend type
+        hash_rna_properties(node, digest, skip=NODE_LAYOUT_PROPERTIES)
+        color_ramp = getattr(node, "color_ramp", None)
+        if color_ramp is not None:
+            digest.update(
+                f"{color_ramp.interpolation}:{color_ramp.color_mode}".encode("utf-8")
+            )
+            for element in color_ramp.elements:
+                digest.update(
+                    repr((element.position, tuple(element.color))).encode("utf-8")
                 )
-                if ray_cast_result[0] and ray_cast_result[4] == obj:
-                    return True
-        return False
+        image = getattr(node, "image", None)
+        if image is not None:
+            hash_image(image, digest)
+        for socket in node.inputs:
+            value = getattr(socket, "default_value", None)
+            if value is None:
+                continue
+            try:
+                value = tuple(value)
+            except TypeError:
+                pass
+            digest.update(repr(value).encode("utf-8"))
+    for link in node_tree.links:
+        digest.update(
+            f"{link.from_node.name}.{link.from_socket.identifier}>"
+            f"{link.to_node.name}.{link.to_socket.identifier}".encode("utf-8")
+        )
+
+
+def hash_material(material, digest):
+    """Add the settings of a material that affect its look to a hash."""
+    digest.update(material.name.encode("utf-8"))
+    digest.update(repr(tuple(material.diffuse_color)).encode("utf-8"))
+    if material.use_nodes and material.node_tree is not None:
+        hash_node_tree(material.node_tree, digest)
+
+
+def hash_geometry(obj, depsgraph, digest):
+    """
+    Add the evaluated geometry of an object, including modifiers and shading, to a hash.
 
-    center = obj.location
-    if check_point(center):
-        return True, center.copy()
+    Curves, surfaces, metaballs and text are hashed through the mesh they evaluate to.
+    """
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    if mesh is None:
+        return
+    try:
+        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", vertices)
+        loops = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loops)
+        material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", material_indices)
+        smooth = np.empty(len(mesh.polygons), dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+    finally:
+        evaluated.to_mesh_clear()
+    for array in (vertices, loops, material_indices, smooth):
+        digest.update(array.tobytes())
 
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.transform(obj.matrix_world)
 
-    result = False, None
+def is_label(obj):
+    """Check whether an object is a label added for the screenshots."""
+    return bool(obj.get(LABEL_TAG))
 
-    for v in bm.verts:
-        if check_point(v.co):
-            result = True, v.co.copy()
-            break
 
-    if not result[0]:
-        for e in bm.edges:
-            mid_point = (e.verts[0].co + e.verts[1].co) / 2
-            if check_point(mid_point):
-                result = True, mid_point.copy()
-                break
+def get_scene_fingerprint(*settings):
+    """
+    Compute a fingerprint of everything that shows up in the screenshots.
 
-    if not result[0]:
-        for f in bm.faces:
-            face_center = f.calc_center_median()
-            if check_point(face_center):
-                result = True, face_center.copy()
-                break
+    It covers the transforms, visibility and display settings of all objects except
+    cameras and labels, the evaluated geometry and shading of every renderable object,
+    the assigned materials including their node settings and images, and the world.
 
-    bm.free()
-    return result
+    Args:
+        *settings: Capture settings that also change the images.
 
+    Returns:
+        str: The hex digest of the scene.
+    """
+    digest = hashlib.blake2b(repr(settings).encode("utf-8"), digest_size=16)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    world = bpy.context.scene.world
+    digest.update((world.name if world else "").encode("utf-8"))
+    if world is not None and world.use_nodes and world.node_tree is not None:
+        hash_node_tree(world.node_tree, digest)
+    for obj in sorted(bpy.context.scene.objects, key=lambda o: o.name):
+        if obj.type == "CAMERA" or is_label(obj):
+            continue
+        digest.update(
+            f"{obj.name}:{obj.type}:{obj.visible_get()}:{obj.display_type}:"
+            f"{tuple(obj.color)}".encode("utf-8")
+        )
+        digest.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+        if obj.type in GEOMETRY_TYPES:
+            hash_geometry(obj, depsgraph, digest)
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                hash_material(slot.material, digest)
+    return digest.hexdigest()
+
+
+def find_view3d():
+    """
+    Find the first 3D viewport of the current screen.
 
-def remove_labels():
-    """Remove all text objects (labels) from the scene."""
-    for obj in bpy.data.objects:
-        if obj.type == "FONT":
-            bpy.data.objects.remove(obj, do_unlink=True)
+    Returns:
+        tuple or None: The area, its space and its window region, or None if there is none.
+    """
+    screen = bpy.context.screen
+    if screen is None:
+        return None
+    for area in screen.areas:
+        if area.type != "VIEW_3D":
+            continue
+        for region in area.regions:
+            if region.type == "WINDOW":
+                return area, area.spaces.active, region
+    return None
 
 
-def _save_screenshots_common(output_path, distance_factor=2.5):
+def render_view_offscreen(scene, space, region, width, height):
     """
-    Common function to save screenshots from multiple angles.
+    Draw the scene camera's view of a 3D viewport into an offscreen buffer.
+
+    Overlays are hidden while drawing, so the result matches bpy.ops.render.opengl.
+
+    Args:
+        scene (bpy.types.Scene): The scene, with the camera to render from.
+        space (bpy.types.SpaceView3D): The viewport whose shading is used.
+        region (bpy.types.Region): The window region of the viewport.
+        width (int): The image width in pixels.
+        height (int): The image height in pixels.
+
+    Returns:
+        numpy.ndarray: A (height, width, 4) uint8 RGBA array, top row first.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    view_matrix = scene.camera.matrix_world.inverted()
+    projection_matrix = scene.camera.calc_matrix_camera(depsgraph, x=width, y=height)
+    show_overlays = space.overlay.show_overlays
+    space.overlay.show_overlays = False
+    offscreen = gpu.types.GPUOffScreen(width, height)
+    try:
+        offscreen.draw_view3d(
+            scene,
+            bpy.context.view_layer,
+            space,
+            region,
+            view_matrix,
+            projection_matrix,
+            do_color_management=True,
+        )
+        with offscreen.bind():
+            framebuffer = gpu.state.active_framebuffer_get()
+            buffer = framebuffer.read_color(0, 0, width, height, 4, 0, "UBYTE")
+    finally:
+        offscreen.free()
+        space.overlay.show_overlays = show_overlays
+    buffer.dimensions = width * height * 4
+    pixels = np.asarray(buffer, dtype=np.uint8).reshape(height, width, 4)[::-1]
+    if not scene.render.film_transparent:
+        pixels[..., 3] = 255
+    return pixels
+
+
+def render_view_to_file(scene, width, height):
+    """
+    Render the scene camera's view with bpy.ops.render.opengl through a temporary file.
+
+    Args:
+        scene (bpy.types.Scene): The scene, with the camera to render from.
+        width (int): The image width in pixels.
+        height (int): The image height in pixels.
+
+    Returns:
+        numpy.ndarray: A (height, width, 4) uint8 RGBA array, top row first.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "view.png")
+        scene.render.filepath = path
+        scene.render.image_settings.file_format = "PNG"
+        bpy.ops.render.opengl(write_still=True)
+        image = bpy.data.images.load(path)
+        try:
+            width, height = image.size
+            pixels = np.empty(width * height * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+        finally:
+            bpy.data.images.remove(image)
+    pixels = pixels.reshape(height, width, 4)[::-1]
+    return np.round(pixels * 255).astype(np.uint8)
+
+
+def render_view(scene, width, height):
+    """
+    Render the scene camera's view with the viewport renderer into memory.
+
+    The view is drawn offscreen in the first 3D viewport. Without a viewport or a
+    GPU context, e.g. in background mode, it is rendered through a temporary file.
+
+    Args:
+        scene (bpy.types.Scene): The scene, with the camera to render from.
+        width (int): The image width in pixels.
+        height (int): The image height in pixels.
+
+    Returns:
+        numpy.ndarray: A (height, width, 4) uint8 RGBA array, top row first.
+    """
+    view = find_view3d()
+    if view is not None:
+        try:
+            return render_view_offscreen(scene, view[1], view[2], width, height)
+        except Exception as e:
+            logger.warning(f"Offscreen rendering failed, rendering to a file: {str(e)}")
+    return render_view_to_file(scene, width, height)
+
+
+def capture_screenshots(
+    distance_factor=2.5,
+    label_mode=DEFAULT_LABEL_MODE,
+    reuse_unchanged=True,
+    output_paths=(),
+):
+    """
+    Capture the scene from multiple angles into memory.
 
     Args:
-        output_path (str): The directory to save the screenshots.
         distance_factor (float): Factor to determine camera distance from the scene center.
+        label_mode (str): "overlay" to draw the object names onto the captured images,
+            or "objects" to render them as text objects added to the scene.
+        reuse_unchanged (bool): Return the screenshots of the previous capture instead of
+            rendering if the scene has not changed since.
+        output_paths (iterable): Directories the screenshots are written to in the
+            background; the capture does not wait for the files.
 
     Returns:
-        list: A list of paths to the saved screenshots.
+        list: The Screenshot objects, one per view.
     """
+    global _last_capture
+    if label_mode not in LABEL_MODES:
+        raise ValueError(f"Unknown label mode: {label_mode}")
+    if label_mode == "overlay" and Image is None:
+        raise ValueError("The overlay label mode requires Pillow")
+
+    fingerprint = None
+    screenshots = None
+    if reuse_unchanged:
+        fingerprint = get_scene_fingerprint(distance_factor, label_mode)
+        if _last_capture is not None and _last_capture["fingerprint"] == fingerprint:
+            logger.info("Scene unchanged, reusing the previous screenshots")
+            screenshots = _last_capture["screenshots"]
+    if screenshots is None:
+        screenshots = _capture_views(distance_factor, label_mode)
+        if fingerprint is not None:
+            _last_capture = {"fingerprint": fingerprint, "screenshots": screenshots}
+
+    writer = get_screenshot_writer()
+    for output_path in output_paths:
+        writer.submit(screenshots, output_path)
+    return screenshots
+
+
+def _capture_views(distance_factor, label_mode):
+    """Render every view angle of the scene into memory."""
     scene = bpy.context.scene
 
     original_resolution_x = scene.render.resolution_x
@@ -276,8 +801,8 @@ def _save_screenshots_common(output_path, distance_factor=2.5):
                     }
                     break
 
-    scene.render.resolution_x = 750
-    scene.render.resolution_y = 750
+    scene.render.resolution_x = SCREENSHOT_SIZE
+    scene.render.resolution_y = SCREENSHOT_SIZE
     scene.render.resolution_percentage = 100
 
     mesh_objects = [obj for obj in bpy.context.scene.objects if obj.type == "MESH"]
@@ -286,11 +811,10 @@ def _save_screenshots_common(output_path, distance_factor=2.5):
         print("No mesh objects found in the scene")
         return []
 
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-
     camera = ensure_camera()
     center, size = calculate_scene_center_and_size(mesh_objects)
+    # Mesh geometry is read once and shared by all camera angles
+    visibility = VisibilityEngine(mesh_objects)
 
     camera.data.angle = math.radians(50)
     camera_distance = size * distance_factor
@@ -306,7 +830,7 @@ def _save_screenshots_common(output_path, distance_factor=2.5):
         ((1, 1, -1), "Bottom-Right-Back View", (0, 0, 1)),
     ]
 
-    screenshot_paths = []
+    screenshots = []
 
     try:
         for direction, view_name, up_vector in angles:
@@ -323,10 +847,15 @@ def _save_screenshots_common(output_path, distance_factor=2.5):
             bpy.context.view_layer.objects.active = camera
             scene.camera = camera
 
-            text_objects = [
-                add_label_to_object(obj, camera, size, mathutils.Vector(up_vector))
-                for obj in mesh_objects
-            ]
+            if label_mode == "objects":
+                text_objects = [
+                    add_label_to_object(
+                        obj, camera, size, mathutils.Vector(up_vector), visibility
+                    )
+                    for obj in mesh_objects
+                ]
+            else:
+                anchors = get_label_anchors(mesh_objects, camera, visibility)
 
             for area in bpy.context.screen.areas:
                 if area.type == "VIEW_3D":
@@ -337,14 +866,15 @@ def _save_screenshots_common(output_path, distance_factor=2.5):
             bpy.ops.object.select_all(action="DESELECT")
             bpy.context.view_layer.objects.active = None
 
-            screenshot_path = os.path.join(output_path, f"{view_name}.png")
-            scene.render.filepath = screenshot_path
-            scene.render.image_settings.file_format = "PNG"
+            pixels = render_view(scene, SCREENSHOT_SIZE, SCREENSHOT_SIZE)
 
-            bpy.ops.render.opengl(write_still=True)
-            screenshot_paths.append(screenshot_path)
-
-            remove_labels()
+            if label_mode == "objects":
+                remove_labels()
+                screenshots.append(Screenshot(view_name, pixels))
+            else:
+                image = Image.fromarray(pixels, "RGBA")
+                draw_labels(image, anchors)
+                screenshots.append(Screenshot.from_image(view_name, image))
 
     finally:
         scene.render.resolution_x = original_resolution_x
@@ -366,6 +896,45 @@ def _save_screenshots_common(output_path, distance_factor=2.5):
                             space.shading.type = settings["shading_type"]
                         break
 
+    return screenshots
+
+
+def _save_screenshots_common(
+    output_path,
+    distance_factor=2.5,
+    label_mode=DEFAULT_LABEL_MODE,
+    reuse_unchanged=True,
+    atlas=False,
+    atlas_tile_size=ATLAS_TILE_SIZE,
+):
+    """
+    Common function to save screenshots from multiple angles.
+
+    Args:
+        output_path (str): The directory to save the screenshots.
+        distance_factor (float): Factor to determine camera distance from the scene center.
+        label_mode (str): "overlay" to draw the object names onto the captured images,
+            or "objects" to render them as text objects added to the scene.
+        reuse_unchanged (bool): Save the images of the previous capture instead of
+            rendering if the scene has not changed since.
+        atlas (bool): Also tile the views into one labeled image, saved to
+            get_atlas_path(output_path).
+        atlas_tile_size (int): The edge length of each atlas tile in pixels.
+
+    Returns:
+        list: A list of paths to the saved screenshots.
+    """
+    screenshots = capture_screenshots(distance_factor, label_mode, reuse_unchanged)
+    screenshot_paths = [
+        screenshot.save(get_screenshot_path(output_path, screenshot))
+        for screenshot in screenshots
+    ]
+    if atlas and screenshots:
+        create_screenshot_atlas(
+            screenshots,
+            get_atlas_path(output_path),
+            tile_size=atlas_tile_size,
+        )
     return screenshot_paths
 
 
@@ -376,8 +945,7 @@ def save_screenshots():
     Returns:
         list: A list of paths to the saved screenshots.
     """
-    output_path = r"D:\GPT_driven_modeling\resources\screenshots"
-    return _save_screenshots_common(output_path)
+    return _save_screenshots_common(SCREENSHOTS_PATH)
 
 
 def save_screenshots_to_path(output_path):
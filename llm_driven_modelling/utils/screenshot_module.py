@@ -0,0 +1,236 @@
+# screenshot_module.py
+
+"""
+This module provides in-memory screenshots and their asynchronous persistence.
+A Screenshot holds the RGBA pixels of a captured view and encodes them to PNG once, on first use,
+so the vision requests can be built without writing the image to disk and reading it back.
+Writing the images to the screenshot and log directories is left to a background writer,
+so an evaluation never waits for disk I/O.
+"""
+
+import os
+import zlib
+import struct
+import hashlib
+import logging
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# zlib level of the PNG encoder; 6 is the size/speed trade-off Pillow also uses
+PNG_COMPRESSION_LEVEL = 6
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_chunk(chunk_type, data):
+    """Build a PNG chunk: length, type, data and the CRC of type and data."""
+    return (
+        struct.pack(">I", len(data))
+        + chunk_type
+        + data
+        + struct.pack(">I", zlib.crc32(chunk_type + data))
+    )
+
+
+def encode_png(pixels, level=PNG_COMPRESSION_LEVEL):
+    """
+    Encode an RGBA image to PNG without Pillow.
+
+    Every row uses the PNG "Up" filter, the difference to the row above, which makes the
+    large flat areas of a viewport render compress well.
+
+    Args:
+        pixels (numpy.ndarray): A (height, width, 4) uint8 array, top row first.
+        level (int): The zlib compression level.
+
+    Returns:
+        bytes: The PNG file content.
+    """
+    height, width, channels = pixels.shape
+    if channels != 4:
+        raise ValueError(f"Expected RGBA pixels, got {channels} channels")
+    rows = pixels.reshape(height, width * 4)
+    filtered = np.empty((height, width * 4 + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    # uint8 arithmetic wraps modulo 256, as the filter requires
+    filtered[:, 1:] = np.diff(rows, axis=0, prepend=np.zeros((1, width * 4), np.uint8))
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (
+        PNG_SIGNATURE
+        + png_chunk(b"IHDR", header)
+        + png_chunk(b"IDAT", zlib.compress(filtered.tobytes(), level))
+        + png_chunk(b"IEND", b"")
+    )
+
+
+class Screenshot:
+    """A captured view held in memory."""
+
+    media_type = "image/png"
+
+    def __init__(self, name, pixels):
+        """
+        Initialize a screenshot.
+
+        Args:
+            name (str): The view name, e.g. "Top View".
+            pixels (numpy.ndarray): A (height, width, 4) uint8 RGBA array, top row first.
+        """
+        self.name = name
+        self.pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+        self._data = None
+        self._digest = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_image(cls, name, image):
+        """Create a screenshot from a Pillow image."""
+        return cls(name, np.asarray(image.convert("RGBA")))
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    @property
+    def data(self):
+        """The PNG encoded image, encoded on first use."""
+        with self._lock:
+            if self._data is None:
+                self._data = encode_png(self.pixels)
+            return self._data
+
+    @property
+    def digest(self):
+        """The SHA-256 of the PNG data, the same as for a file with this content."""
+        data = self.data
+        with self._lock:
+            if self._digest is None:
+                self._digest = hashlib.sha256(data).hexdigest()
+            return self._digest
+
+    def to_image(self):
+        """Get the screenshot as a Pillow image."""
+        from PIL import Image
+
+        return Image.fromarray(self.pixels, "RGBA")
+
+    def save(self, path):
+        """
+        Write the screenshot to a PNG file.
+
+        The file is written under a temporary name and then renamed, so a reader never
+        sees a partially written image.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            str: The path.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Unique per thread, as the background writer may save the same path concurrently
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.data)
+        os.replace(temp_path, path)
+        return path
+
+    def __repr__(self):
+        return f"Screenshot({self.name!r}, {self.width}x{self.height})"
+
+
+def get_screenshot_path(output_path, screenshot):
+    """Get the file path of a screenshot in a directory."""
+    return os.path.join(output_path, f"{screenshot.name}.png")
+
+
+class ScreenshotWriter:
+    """Background writer that persists screenshots to disk."""
+
+    def __init__(self, max_workers=1):
+        """
+        Initialize the writer.
+
+        Args:
+            max_workers (int): The number of writer threads.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="screenshot-writer"
+        )
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, screenshots, output_path):
+        """
+        Schedule screenshots to be written to a directory.
+
+        Args:
+            screenshots (list): The Screenshot objects.
+            output_path (str): The directory to write them to.
+
+        Returns:
+            list: The paths the screenshots will be written to.
+        """
+        paths = []
+        for screenshot in screenshots:
+            path = get_screenshot_path(output_path, screenshot)
+            future = self._executor.submit(self._write, screenshot, path)
+            with self._lock:
+                self._pending.add(future)
+            future.add_done_callback(self._done)
+            paths.append(path)
+        return paths
+
+    def wait(self, timeout=None):
+        """
+        Wait until every scheduled screenshot has been written.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if no write is pending anymore.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    @staticmethod
+    def _write(screenshot, path):
+        try:
+            screenshot.save(path)
+        except OSError as e:
+            logger.error(f"Failed to write screenshot {path}: {str(e)}")
+
+
+_screenshot_writer = None
+_screenshot_writer_lock = threading.Lock()
+
+
+def get_screenshot_writer():
+    """
+    Get the process-wide screenshot writer.
+
+    Returns:
+        ScreenshotWriter: The shared writer.
+    """
+    global _screenshot_writer
+    with _screenshot_writer_lock:
+        if _screenshot_writer is None:
+            _screenshot_writer = ScreenshotWriter()
+        return _screenshot_writer
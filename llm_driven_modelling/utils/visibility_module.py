@@ -0,0 +1,203 @@
+# visibility_module.py
+
+"""
+This module provides a visibility test for labeling objects in screenshots.
+Each mesh is read once per screenshot pass: its evaluated triangles go into a world-space
+BVH tree, and a bounded, spatially stratified set of surface points is chosen from them.
+The trees and sample points are shared by all camera angles, so testing an object costs
+a fixed number of ray casts of logarithmic cost instead of a scene ray cast per vertex.
+"""
+
+import bpy
+import numpy as np
+import mathutils
+from mathutils.bvhtree import BVHTree
+from bpy_extras.object_utils import world_to_camera_view
+from llm_driven_modelling.utils.mesh_module import get_world_mesh
+
+# Grid cells per axis used to stratify the sample points; at most GRID^3 samples per object
+SAMPLE_GRID_SIZE = 4
+# Distance along a ray within which a hit counts as the sampled point itself
+HIT_EPSILON = 1e-4
+
+
+class ObjectGeometry:
+    """World-space BVH tree and sample points of one evaluated mesh object."""
+
+    def __init__(self, obj, depsgraph):
+        """
+        Read the evaluated mesh of an object in world space.
+
+        Args:
+            obj (bpy.types.Object): The mesh object.
+            depsgraph (bpy.types.Depsgraph): The evaluated dependency graph.
+        """
+        vertices, triangles = get_world_mesh(obj, depsgraph)
+        self.bvh = BVHTree.FromPolygons(vertices.tolist(), triangles.tolist())
+        points = vertices[triangles].mean(axis=1) if len(triangles) else vertices
+        self.samples = [mathutils.Vector(point) for point in stratify(points)]
+
+
+def stratify(points, grid_size=SAMPLE_GRID_SIZE):
+    """
+    Pick at most one point per cell of a grid laid over the points' bounding box.
+
+    The point closest to its cell's center is kept, and the result is ordered by
+    distance to the bounding box center, so central points are tried first.
+
+    Args:
+        points (numpy.ndarray): An (N, 3) array of points.
+        grid_size (int): The number of cells along each axis.
+
+    Returns:
+        numpy.ndarray: The selected points, at most grid_size ** 3 of them.
+    """
+    if len(points) == 0:
+        return points
+    min_corner = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - min_corner, 1e-9)
+    cells = np.minimum(
+        ((points - min_corner) / extent * grid_size).astype(np.int64), grid_size - 1
+    )
+    cell_centers = min_corner + (cells + 0.5) * extent / grid_size
+    distances = np.linalg.norm(points - cell_centers, axis=1)
+    cell_ids = (cells[:, 0] * grid_size + cells[:, 1]) * grid_size + cells[:, 2]
+    order = np.lexsort((distances, cell_ids))
+    _, first = np.unique(cell_ids[order], return_index=True)
+    selected = points[order[first]]
+    center = min_corner + extent / 2
+    return selected[np.argsort(np.linalg.norm(selected - center, axis=1))]
+
+
+def ray_hits_box(origin, direction, max_distance, min_corner, max_corner):
+    """
+    Check whether a ray segment passes through an axis-aligned bounding box.
+
+    Args:
+        origin (mathutils.Vector): The ray origin.
+        direction (mathutils.Vector): The normalized ray direction.
+        max_distance (float): The length of the segment.
+        min_corner (tuple): The minimum corner of the box.
+        max_corner (tuple): The maximum corner of the box.
+
+    Returns:
+        bool: True if the segment intersects the box.
+    """
+    near, far = 0.0, max_distance
+    for axis in range(3):
+        if abs(direction[axis]) < 1e-12:
+            if not min_corner[axis] <= origin[axis] <= max_corner[axis]:
+                return False
+            continue
+        t1 = (min_corner[axis] - origin[axis]) / direction[axis]
+        t2 = (max_corner[axis] - origin[axis]) / direction[axis]
+        near = max(near, min(t1, t2))
+        far = min(far, max(t1, t2))
+        if near > far:
+            return False
+    return True
+
+
+class VisibilityEngine:
+    """Visibility test reusing the geometry of every mesh across camera angles."""
+
+    def __init__(self, objects=None):
+        """
+        Initialize the engine. Object geometry is read on first use.
+
+        Args:
+            objects (list, optional): The mesh objects that can hide each other.
+                Defaults to every mesh object in the scene.
+        """
+        if objects is None:
+            objects = [obj for obj in bpy.context.scene.objects if obj.type == "MESH"]
+        self.objects = list(objects)
+        self.depsgraph = bpy.context.evaluated_depsgraph_get()
+        self._geometry = {}
+        self._boxes = {}
+        for obj in self.objects:
+            corners = [obj.matrix_world @ mathutils.Vector(c) for c in obj.bound_box]
+            self._boxes[obj.name] = (
+                tuple(min(c[axis] for c in corners) for axis in range(3)),
+                tuple(max(c[axis] for c in corners) for axis in range(3)),
+            )
+
+    def get_geometry(self, obj):
+        """
+        Get the BVH tree and sample points of an object, building them on first use.
+
+        Args:
+            obj (bpy.types.Object): The mesh object.
+
+        Returns:
+            ObjectGeometry: The cached geometry.
+        """
+        geometry = self._geometry.get(obj.name)
+        if geometry is None:
+            geometry = ObjectGeometry(obj, self.depsgraph)
+            self._geometry[obj.name] = geometry
+        return geometry
+
+    def is_point_visible(self, obj, point, camera):
+        """
+        Check whether a point of an object is seen by the camera without another mesh in front.
+
+        Args:
+            obj (bpy.types.Object): The object the point belongs to.
+            point (mathutils.Vector): The point in world space.
+            camera (bpy.types.Object): The camera object.
+
+        Returns:
+            bool: True if the point is in view and not hidden by another object.
+        """
+        co_ndc = world_to_camera_view(bpy.context.scene, camera, point)
+        if not (0 <= co_ndc.x <= 1 and 0 <= co_ndc.y <= 1 and 0 < co_ndc.z):
+            return False
+
+        origin = camera.matrix_world.translation
+        direction = point - origin
+        distance = direction.length
+        if distance == 0:
+            return False
+        direction.normalize()
+
+        # The first surface of the object along the ray, which may be in front of the point
+        location, _, _, own_distance = self.get_geometry(obj).bvh.ray_cast(
+            origin, direction, distance + HIT_EPSILON
+        )
+        if location is None:
+            return False
+        limit = own_distance - HIT_EPSILON
+
+        for other in self.objects:
+            if other.name == obj.name:
+                continue
+            min_corner, max_corner = self._boxes[other.name]
+            if not ray_hits_box(origin, direction, limit, min_corner, max_corner):
+                continue
+            hit = self.get_geometry(other).bvh.ray_cast(origin, direction, limit)[0]
+            if hit is not None:
+                return False
+        return True
+
+    def find_visible_point(self, obj, camera):
+        """
+        Find a point of an object that the camera can see.
+
+        The object's origin is tried first, then the stratified surface samples,
+        closest to the center first.
+
+        Args:
+            obj (bpy.types.Object): The mesh object.
+            camera (bpy.types.Object): The camera object.
+
+        Returns:
+            tuple: A boolean (True if visible) and the visible point (or None).
+        """
+        center = obj.matrix_world.translation.copy()
+        if self.is_point_visible(obj, center, camera):
+            return True, center
+        for point in self.get_geometry(obj).samples:
+            if self.is_point_visible(obj, point, camera):
+                return True, point.copy()
+        return False, None